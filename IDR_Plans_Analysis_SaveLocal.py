@@ -2,6 +2,21 @@ import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'simulation'))
+from wealth_model.profiling import RunProfiler
+from wealth_model.core import IDRRepayment, LoanAccounting, model_params_from, simulate_net_worth
+from wealth_model.gap_surface import wealth_gap_surface, plot_gap_heatmaps
+from wealth_model.confidence import cell_summary, gap_pct_ci
+from wealth_model.reductions import mean as stable_mean, mean_std
+from wealth_model.copula import joint_sampler
+from wealth_model.macro import simulate_macro_paths
+from wealth_model.population import load_population
+from wealth_model.households import household_types, household_net_worth, plot_household_types
+from wealth_model.service import baseline_from, serve
+from wealth_model.optimizer import (PlanEvaluator, cma_es, constrained_gap, grid_search,
+                                    pareto_front, plot_pareto, results_to_csv)
 
 # =============================================================================
 # OUTPUT DIRECTORY CONFIGURATION
@@ -63,6 +78,8 @@ np.random.seed(42)
 # https://aspe.hhs.gov/topics/poverty-economic-mobility/poverty-guidelines
 fpl_single      = 15_650.0   # 2025 FPL, 1-person
 fpl_family_of_4 = 32_150.0   # 2025 FPL, 4-person
+# Other household sizes follow the HHS formula $15,650 + $5,500 per extra person
+# (see simulation/wealth_model/households.py, used in Part 5)
 
 # Inflation assumption (Federal Reserve long-run target, 2.0%)
 # Source: Variable Documentation Table v5 — Federal Reserve long-term target
@@ -160,6 +177,57 @@ income_factors   = [0.75, 1.0, 1.25]
 # CIs widen by ~sqrt(5) ≈ 2.24x relative to the 1M baseline.
 num_individuals  = int(os.environ.get('IDR_N', 200_000))
 
+# ── INCOME MODEL ──
+# 'normal' (default): income ~ N(avg_income × factor, income_se) as documented above.
+# 'empirical': income = avg_income × factor × a draw from the group's weighted
+#   CPS ASEC income distribution (unit median), alias-method sampled. Uses the
+#   IPUMS extract named by WEALTH_POPULATION_EXTRACT, or the bundled synthetic
+#   stand-in (simulation/wealth_model/population.py).
+income_model = os.environ.get('IDR_INCOME_MODEL', 'normal')
+income_shapes = {}
+if income_model == 'empirical':
+    _population = load_population()
+    income_shapes = {group: table.normalized('median')
+                     for kind in ('person', 'family') for group, table in _population[kind].items()}
+    print(f"Income model: empirical ({os.path.basename(_population['source'])})")
+elif income_model != 'normal':
+    raise ValueError(f"IDR_INCOME_MODEL must be 'normal' or 'empirical', got {income_model!r}")
+
+# ── JOINT DRAWS (income, debt, homeownership) ──
+# 'independent' (default): the three are drawn separately and home ownership is
+#   one Bernoulli at the group rate, as documented above.
+# 'gaussian' / 't': drawn jointly per individual through a copula with the rank
+#   (Spearman) correlations below; marginals and group home rates are unchanged.
+#   The t copula (IDR_JOINT_DF degrees of freedom) adds joint tail dependence.
+# Correlations are modelling assumptions: higher earners own more often, larger
+# balances go with slightly higher incomes and lower ownership. Per-group
+# overrides go in joint_rank_corr_by_group.
+joint_model = os.environ.get('IDR_JOINT_MODEL', 'independent')
+joint_df = int(os.environ.get('IDR_JOINT_DF', 4))
+joint_rank_corr = {
+    ('income', 'debt'): 0.15,
+    ('income', 'home'): 0.35,
+    ('debt', 'home'):  -0.10,
+}
+joint_rank_corr_by_group = {}
+joint_samplers = {}
+if joint_model in ('gaussian', 't'):
+    joint_samplers = {
+        group: joint_sampler(joint_rank_corr_by_group.get(group, joint_rank_corr), joint_model, joint_df)
+        for group in ('Black Men', 'Black Women', 'White Men', 'White Women', 'Latinx Men',
+                      'Latinx Women', 'Black', 'White', 'Hispanic')
+    }
+    print(f"Joint draws: {joint_model} copula, rank correlations {joint_rank_corr}")
+elif joint_model != 'independent':
+    raise ValueError(f"IDR_JOINT_MODEL must be 'independent', 'gaussian' or 't', got {joint_model!r}")
+
+# ── RUN INSTRUMENTATION ──
+# Per-part / per-cell wall time, individuals/s, RNG vs arithmetic vs plotting
+# split and peak memory. Progress bar on the terminal (set IDR_PROGRESS=0 to
+# silence); full profile is written to run_profile.json next to the summary.
+profiler = RunProfiler(num_individuals)
+rng      = profiler.timed_random(np.random)   # same global stream as np.random
+
 # ── IDR PLANS ──
 idr_plans = {
     'IBR_2014':       {'repayment_rate': 0.10, 'years': 20, 'fpl_multiplier': 1.50},
@@ -226,6 +294,9 @@ salary_growth_by_group = {
 
 # Student loan interest rate — Variable Documentation Table v5 (Federal Student Aid)
 student_loan_interest_rate = 0.0639
+# Real discount rate for the present value of federal loan receipts
+# (credit-reform style: Treasury yield; ~2% real, 10-yr TIPS 2025)
+federal_discount_rate_real = 0.02
 
 # ── COLOR SCHEME ──
 plan_colors = {
@@ -244,7 +315,8 @@ plan_colors = {
 def simulate_wealth_with_idr(avg_income, factor, idr_settings,
                               home_rate, emp_rates, fpl_base,
                               income_se=0.0, home_rate_moe=0.0,
-                              debt_mean=None, debt_se=0.0):
+                              debt_mean=None, debt_se=0.0, income_group=None,
+                              macro=None, random_source=None, accounting=None):
     """
     Simulate NET WORTH accumulation over 40-year career (age 22–62).
 
@@ -259,146 +331,67 @@ def simulate_wealth_with_idr(avg_income, factor, idr_settings,
     Returns ARRAY of net worth values (length = num_individuals) in real 2025 $.
 
     Net Worth = (Savings + Home Equity + Retirement) − (Student Loans + Mortgage + Consumer Debt)
+
+    The stage loop lives in simulation/wealth_model/core.py (shared with
+    WealthSimulation_DebtForgive); the IDR plan is plugged in as its
+    repayment strategy. Model constants are read from this module's globals
+    at call time, so the sensitivity overrides below still apply.
+
+    ``income_group`` names the CPS group whose income distribution is used
+    when IDR_INCOME_MODEL=empirical and whose copula is used when
+    IDR_JOINT_MODEL is 'gaussian' or 't' (ignored otherwise). ``macro``
+    (MacroPaths) replaces the constant rates and returns with stochastic
+    paths; ``random_source`` overrides the global ``rng`` (Part 4E uses it
+    for common random numbers across plans). ``accounting`` (LoanAccounting)
+    collects federal payments, interest and forgiven balances for the cell.
     """
     if debt_mean is None:
         debt_mean = initial_student_loan_debt
 
-    adjusted_income = float(avg_income * factor)
-
-    # ── Draw income with SE uncertainty ──
-    if income_se > 0:
-        individual_incomes = np.random.normal(adjusted_income, income_se,
-                                              num_individuals).astype(float)
-        individual_incomes = np.maximum(individual_incomes, 0.0)
-    else:
-        individual_incomes = np.full(num_individuals, adjusted_income, dtype=float)
-
-    # ── Draw home-purchase rate with MOE uncertainty ──
-    if home_rate_moe > 0:
-        # MOE is 90% CI → SE = MOE / 1.645
-        home_rate_se = home_rate_moe / 1.645
-        sampled_home_rate = float(np.clip(
-            np.random.normal(home_rate, home_rate_se), 0.0, 1.0))
-    else:
-        sampled_home_rate = home_rate
-
-    # ── Draw student-loan debt with SE uncertainty ──
-    if debt_se > 0:
-        individual_debt = np.random.normal(debt_mean, debt_se,
-                                           num_individuals).astype(float)
-        individual_debt = np.maximum(individual_debt, 0.0)
-    else:
-        individual_debt = np.full(num_individuals, float(debt_mean), dtype=float)
-
-    # ── Initialize assets (float) ──
-    liquid_assets       = individual_incomes * np.random.uniform(0.1, 0.3, num_individuals).astype(float)
-    retirement_balance  = np.zeros(num_individuals, dtype=float)
-    home_equity         = np.zeros(num_individuals, dtype=float)
-
-    # ── Initialize liabilities (float) ──
-    student_loan_balance = individual_debt.copy()
-    mortgage_balance     = np.zeros(num_individuals, dtype=float)
-    consumer_debt        = np.zeros(num_individuals, dtype=float)
-
-    # ── Housing ──
-    owns_home           = np.random.rand(num_individuals) < sampled_home_rate
-    home_purchase_price = (individual_incomes * average_home_price_multiplier).astype(float)
-    mortgage_balance[owns_home] = home_purchase_price[owns_home] * (1 - mortgage_down_payment)
-    home_value          = home_purchase_price.copy()
-
-    repayment_rate  = idr_settings['repayment_rate']
-    repayment_years = idr_settings['years']
-    fpl_threshold   = fpl_base * idr_settings['fpl_multiplier']
-
-    salary_by_stage  = [individual_incomes * x for x in salary_growth_factors]
-    cumulative_years = 0
-
-    for stage_idx, (emp_rate, salary, years_in_stage) in enumerate(
-            zip(emp_rates, salary_by_stage, stage_durations)):
-
-        # Draw employment with SE uncertainty
-        sampled_emp_rate = float(np.clip(
-            np.random.normal(emp_rate, employment_rates_se), 0.0, 1.0))
-        employed      = np.random.rand(num_individuals) < sampled_emp_rate
-        annual_income = (employed.astype(float) * salary).astype(float)
-
-        # IDR payment
-        if cumulative_years < repayment_years:
-            discretionary_income = np.maximum(annual_income - fpl_threshold, 0.0).astype(float)
-            annual_idr_payment   = (discretionary_income * repayment_rate).astype(float)
-        else:
-            annual_idr_payment = np.zeros(num_individuals, dtype=float)
-
-        # Student loan balance update
-        student_loan_interest = (student_loan_balance * student_loan_interest_rate).astype(float)
-        student_loan_balance  = np.maximum(
-            student_loan_balance + student_loan_interest - annual_idr_payment, 0.0).astype(float)
-
-        # Mortgage payment
-        if stage_idx == 0:
-            monthly_rate = mortgage_interest_rate / 12
-            n_payments   = mortgage_term_years * 12
-            monthly_payment = np.zeros(num_individuals, dtype=float)
-            monthly_payment[owns_home] = (
-                mortgage_balance[owns_home] * monthly_rate *
-                (1 + monthly_rate) ** n_payments /
-                ((1 + monthly_rate) ** n_payments - 1))
-            annual_mortgage_payment = (monthly_payment * 12).astype(float)
-        else:
-            annual_mortgage_payment = np.where(
-                owns_home & (mortgage_balance > 0),
-                mortgage_balance * 0.08, 0.0).astype(float)
-
-        # Mortgage balance
-        mortgage_interest  = (mortgage_balance * mortgage_interest_rate).astype(float)
-        mortgage_principal = np.maximum(annual_mortgage_payment - mortgage_interest, 0.0).astype(float)
-        mortgage_balance   = np.maximum(mortgage_balance - mortgage_principal, 0.0).astype(float)
-
-        # Home appreciation (real)
-        home_value[owns_home] = (
-            home_value[owns_home] * (1 + home_appreciation_rate_real) ** years_in_stage).astype(float)
-        home_equity = np.maximum(home_value - mortgage_balance, 0.0).astype(float)
-
-        # Consumer debt (non-homeowners)
-        consumer_debt[~owns_home] = (annual_income[~owns_home] * 0.05).astype(float)
-
-        # Retirement contributions (10% of income → grows at 7% real)
-        retirement_balance = (
-            (retirement_balance + annual_income * retirement_investment_rate) *
-            (1 + 0.07) ** years_in_stage).astype(float)
-
-        # Personal savings
-        living_expenses    = (annual_income * 0.60).astype(float)
-        available          = annual_income - living_expenses - annual_idr_payment - annual_mortgage_payment
-        annual_savings     = np.maximum(available * 0.5, 0.0).astype(float)
-        liquid_assets      = (
-            (liquid_assets + annual_savings * years_in_stage) *
-            (1 + personal_asset_growth_rate_real) ** years_in_stage).astype(float)
-
-        cumulative_years += years_in_stage
-
-    # Loan forgiveness at end of repayment period
-    if cumulative_years >= repayment_years:
-        student_loan_balance = np.zeros(num_individuals, dtype=float)
-
-    # Net worth
-    total_assets      = (liquid_assets + retirement_balance + home_equity).astype(float)
-    total_liabilities = (student_loan_balance + mortgage_balance + consumer_debt).astype(float)
-    net_worth         = (total_assets - total_liabilities).astype(float)
-
-    return net_worth
+    repayment = IDRRepayment.from_plan(idr_settings, fpl_base, student_loan_interest_rate)
+    return simulate_net_worth(
+        rng if random_source is None else random_source, num_individuals, avg_income, factor, home_rate, emp_rates,
+        repayment, model_params_from(globals()),
+        income_se=income_se, home_rate_moe=home_rate_moe,
+        debt_mean=debt_mean, debt_se=debt_se,
+        income_dist=income_shapes.get(income_group),
+        joint=joint_samplers.get(income_group),
+        macro=macro,
+        accounting=accounting,
+    )
 
 
 # =============================================================================
 # HELPER: compute mean + 95% CI (based on Monte Carlo distribution)
 # =============================================================================
 def summarize(arr):
-    """Return (mean, lower_95ci, upper_95ci) from simulation array."""
-    m   = np.mean(arr)
-    se  = np.std(arr) / np.sqrt(len(arr))
+    """Return (mean, lower_95ci, upper_95ci) from simulation array.
+
+    Mean and s.d. are fixed-block reductions (wealth_model/reductions.py), so
+    they do not change in the last bit if the cell is chunked or parallelized.
+    """
+    m, sd = mean_std(arr)
+    se  = sd / np.sqrt(len(arr))
     return m, m - 1.96 * se, m + 1.96 * se
 
 
+# =============================================================================
+# SCENARIO SERVICE (optional)
+# =============================================================================
+# IDR_SERVE=<port> skips every part below and serves single cells over HTTP
+# instead (simulation/wealth_model/service.py), e.g.
+#   curl 'http://127.0.0.1:8765/evaluate?group=Black%20Women&plan=PAYE&tier=Median%2050%25'
+# IDR_SERVE_WORKERS (default 2) bounds the worker pool; results are cached in
+# <output_dir>/.cache/scenarios, keyed by a hash of each cell's full inputs.
+if os.environ.get('IDR_SERVE'):
+    serve(baseline_from(globals()),
+          host=os.environ.get('IDR_SERVE_HOST', '127.0.0.1'),
+          port=int(os.environ['IDR_SERVE']),
+          workers=int(os.environ.get('IDR_SERVE_WORKERS', 2)),
+          cache_dir=os.path.join(output_dir, '.cache', 'scenarios'))
+    sys.exit(0)
+
+
 # =============================================================================
 # PART 1: Individual Scenarios
 # =============================================================================
@@ -406,23 +399,32 @@ print("Running Part 1: Individual scenarios (40-year career simulation)...")
 print("Timeline: Age 22 (graduation) → Age 62 (retirement)")
 print("Wealth reported in REAL 2025 dollars (inflation-adjusted)\n")
 print("Now incorporating MOE/SE in all stochastic parameters.\n")
+profiler.start_part('Part 1: Individual scenarios',
+                    total_cells=len(idr_plans) * len(data) * len(income_brackets))
 
 results_by_plan = {}
+federal_cost = []   # one LoanAccounting summary per Part 1 / Part 2 cell
 for plan_name, settings in idr_plans.items():
     results_by_plan[plan_name] = {}
     for category, group_data in data.items():
         results_by_plan[plan_name][category] = {}
         for bracket, factor in zip(income_brackets, income_factors):
-            results_by_plan[plan_name][category][bracket] = simulate_wealth_with_idr(
-                group_data['avg_income'], factor, settings,
-                home_purchase_rates[category],
-                employment_rates[category],
-                fpl_single,
-                income_se=group_data['income_se'],
-                home_rate_moe=home_purchase_rates_moe[category],
-                debt_mean=initial_student_loan_debt,
-                debt_se=initial_student_loan_debt_se,
-            )
+            ledger = LoanAccounting(federal_discount_rate_real)
+            with profiler.cell(f'{plan_name}/{category}/{bracket}'):
+                results_by_plan[plan_name][category][bracket] = simulate_wealth_with_idr(
+                    group_data['avg_income'], factor, settings,
+                    home_purchase_rates[category],
+                    employment_rates[category],
+                    fpl_single,
+                    income_se=group_data['income_se'],
+                    home_rate_moe=home_purchase_rates_moe[category],
+                    debt_mean=initial_student_loan_debt,
+                    debt_se=initial_student_loan_debt_se,
+                    income_group=category,
+                    accounting=ledger,
+                )
+            federal_cost.append({'part': 'individual', 'plan': plan_name, 'group': category,
+                                 'tier': bracket, **ledger.summary()})
 
 # ── Figure 1: Net Worth at Retirement — by race/gender (with 95% CI error bars) ──
 for category in data.keys():
@@ -478,6 +480,8 @@ tier_names = list(family_income_tiers.keys())
 race_colors_main = {'Black': '#E74C3C', 'White': '#3498DB', 'Hispanic': '#2ECC71'}
 
 print("\nRunning Part 2: Family of 4 scenarios...")
+profiler.start_part('Part 2: Family of 4 scenarios',
+                    total_cells=len(idr_plans) * len(races) * len(tier_names))
 family_results = {}
 for plan_name, settings in idr_plans.items():
     family_results[plan_name] = {}
@@ -485,16 +489,22 @@ for plan_name, settings in idr_plans.items():
         family_results[plan_name][race] = {}
         race_debt = initial_student_loan_debt_by_race[race]
         for tier_name, factor in family_income_tiers.items():
-            family_results[plan_name][race][tier_name] = simulate_wealth_with_idr(
-                base_income, factor, settings,
-                home_purchase_rates_by_race[race],
-                employment_rates_by_race[race],
-                fpl_family_of_4,
-                income_se=family_income_moe[race],
-                home_rate_moe=home_purchase_rates_moe_by_race[race],
-                debt_mean=race_debt['mean'],
-                debt_se=race_debt['se'],
-            )
+            ledger = LoanAccounting(federal_discount_rate_real)
+            with profiler.cell(f'{plan_name}/{race}/{tier_name}'):
+                family_results[plan_name][race][tier_name] = simulate_wealth_with_idr(
+                    base_income, factor, settings,
+                    home_purchase_rates_by_race[race],
+                    employment_rates_by_race[race],
+                    fpl_family_of_4,
+                    income_se=family_income_moe[race],
+                    home_rate_moe=home_purchase_rates_moe_by_race[race],
+                    debt_mean=race_debt['mean'],
+                    debt_se=race_debt['se'],
+                    income_group=race,
+                    accounting=ledger,
+                )
+            federal_cost.append({'part': 'family', 'plan': plan_name, 'group': race,
+                                 'tier': tier_name, **ledger.summary()})
 
 # ── Figure 2: Family net worth by race (with 95% CI error bars) ──
 for race in races:
@@ -544,6 +554,7 @@ for race in races:
 # PART 3: Cross-Racial Comparison Charts
 # =============================================================================
 print("\nGenerating Part 3: Cross-racial comparison charts (split by race)...")
+profiler.start_part('Part 3: Cross-racial comparison charts')
 plan_names_short = [p.replace('_', ' ') for p in idr_plans.keys()]
 
 # Figure 3: Annual IDR Payment Burden
@@ -712,12 +723,16 @@ for minority_race in ['Black', 'Hispanic']:
     colors_list = list(plan_colors.values())
     for ax, tier_name in zip(axes, tier_names):
         x = np.arange(len(idr_plans))
-        white_means = [np.mean(family_results[plan_name]['White'][tier_name])
-                       for plan_name in idr_plans]
-        race_means  = [np.mean(family_results[plan_name][minority_race][tier_name])
-                       for plan_name in idr_plans]
-        gap_pct     = [(r / w - 1) * 100 for r, w in zip(race_means, white_means)]
+        # Gap = ratio of means − 1, with batch-means 95% CI (wealth_model/confidence.py)
+        gap_pct, gap_lo, gap_hi = zip(*[
+            gap_pct_ci(family_results[plan_name][minority_race][tier_name],
+                       family_results[plan_name]['White'][tier_name])
+            for plan_name in idr_plans
+        ])
         bars = ax.bar(x, gap_pct, color=colors_list, edgecolor='white', linewidth=0.8)
+        ax.errorbar(x, gap_pct,
+                    yerr=[np.subtract(gap_pct, gap_lo), np.subtract(gap_hi, gap_pct)],
+                    fmt='none', color='#333333', capsize=3, linewidth=1, capthick=1)
         for i, bar in enumerate(bars):
             h = bar.get_height()
             offset = h * 1.08
@@ -732,7 +747,8 @@ for minority_race in ['Black', 'Hispanic']:
         ax.grid(axis='y', alpha=0.3)
     fig.suptitle(
         f'{minority_race} vs White — Wealth Gap by IDR Plan\n'
-        f'(Negative % = {minority_race} family accumulates less wealth than White family)',
+        f'(Negative % = {minority_race} family accumulates less wealth than White family; '
+        f'error bars = 95% CI)',
         fontsize=13, fontweight='bold', y=1.03)
     plt.tight_layout()
     save_path = os.path.join(output_dir, f'fig7_wealth_gap_{minority_race.lower()}.png')
@@ -779,24 +795,27 @@ def run_ref(income_override=None, home_override=None,
     if emp_se_override is not None:
         employment_rates_se = emp_se_override
 
-    result = simulate_wealth_with_idr(
-        income_override if income_override is not None else ref_income,
-        ref_factor, ref_plan_set,
-        home_override if home_override is not None else ref_home_rate,
-        employment_rates[ref_category],
-        fpl_single,
-        income_se=ref_income_se,
-        home_rate_moe=ref_home_moe,
-        debt_mean=debt_override if debt_override is not None else initial_student_loan_debt,
-        debt_se=initial_student_loan_debt_se,
-    )
+    with profiler.cell(f'{ref_plan}/{ref_category}/{ref_bracket} (tornado)'):
+        result = simulate_wealth_with_idr(
+            income_override if income_override is not None else ref_income,
+            ref_factor, ref_plan_set,
+            home_override if home_override is not None else ref_home_rate,
+            employment_rates[ref_category],
+            fpl_single,
+            income_se=ref_income_se,
+            home_rate_moe=ref_home_moe,
+            debt_mean=debt_override if debt_override is not None else initial_student_loan_debt,
+            debt_se=initial_student_loan_debt_se,
+            income_group=ref_category,
+        )
 
     mortgage_interest_rate     = orig_mort
     retirement_investment_rate = orig_ret
     employment_rates_se        = orig_emp
 
-    return np.mean(result)
+    return stable_mean(result)
 
+profiler.start_part('Part 4A: Tornado sensitivity', total_cells=1 + 2 * 6)   # baseline + low/high x 6 params
 baseline_nw = run_ref()
 
 # Each tuple: (label, low_value, high_value, param_name)
@@ -916,24 +935,27 @@ def run_scenario(plan_name, scenario_params):
     home_appreciation_rate_nominal = scenario_params['home_appreciation']
     home_appreciation_rate_real  = scenario_params['home_appreciation'] - inflation_rate
 
-    result = simulate_wealth_with_idr(
-        sens_income * scenario_params['income_mult'],
-        1.0, idr_plans[plan_name],
-        sens_home, sens_emp,
-        fpl_single,
-        income_se=sens_se,
-        home_rate_moe=sens_moe,
-        debt_mean=scenario_params['loan_debt'],
-        debt_se=initial_student_loan_debt_se,
-    )
+    with profiler.cell(f"{plan_name} @ mortgage {scenario_params['mortgage_rate']:.2%}"):
+        result = simulate_wealth_with_idr(
+            sens_income * scenario_params['income_mult'],
+            1.0, idr_plans[plan_name],
+            sens_home, sens_emp,
+            fpl_single,
+            income_se=sens_se,
+            home_rate_moe=sens_moe,
+            debt_mean=scenario_params['loan_debt'],
+            debt_se=initial_student_loan_debt_se,
+            income_group='White Men',
+        )
 
     mortgage_interest_rate       = orig_mort
     home_appreciation_rate_real  = orig_happ
     home_appreciation_rate_nominal = orig_happn
 
-    return np.mean(result)
+    return stable_mean(result)
 
 # Build scenario × plan grid
+profiler.start_part('Part 4B: Scenario sensitivity', total_cells=len(scenarios) * len(idr_plans))
 scenario_grid = {}
 for scen_name, scen_params in scenarios.items():
     scenario_grid[scen_name] = {}
@@ -1001,25 +1023,28 @@ def run_race_scenario(race, plan_name, scenario_params):
     home_appreciation_rate_nominal = scenario_params['home_appreciation']
     home_appreciation_rate_real    = scenario_params['home_appreciation'] - inflation_rate
 
-    result = simulate_wealth_with_idr(
-        family_income_by_race[race] * scenario_params['income_mult'],
-        1.0, idr_plans[plan_name],
-        home_purchase_rates_by_race[race],
-        employment_rates_by_race[race],
-        fpl_family_of_4,
-        income_se=family_income_moe[race],
-        home_rate_moe=home_purchase_rates_moe_by_race[race],
-        debt_mean=scenario_params['loan_debt'],
-        debt_se=initial_student_loan_debt_se,
-    )
+    with profiler.cell(f"{plan_name}/{race} @ mortgage {scenario_params['mortgage_rate']:.2%}"):
+        result = simulate_wealth_with_idr(
+            family_income_by_race[race] * scenario_params['income_mult'],
+            1.0, idr_plans[plan_name],
+            home_purchase_rates_by_race[race],
+            employment_rates_by_race[race],
+            fpl_family_of_4,
+            income_se=family_income_moe[race],
+            home_rate_moe=home_purchase_rates_moe_by_race[race],
+            debt_mean=scenario_params['loan_debt'],
+            debt_se=initial_student_loan_debt_se,
+            income_group=race,
+        )
 
     mortgage_interest_rate         = orig_mort
     home_appreciation_rate_real    = orig_happ
     home_appreciation_rate_nominal = orig_happn
-    return np.mean(result)
+    return stable_mean(result)
 
 # Pick IBR_2014 as representative plan
 rep_plan = 'IBR_2014'
+profiler.start_part('Part 4C: Racial wealth gap sensitivity', total_cells=len(scenarios) * 3)
 gap_by_scenario = {}
 for scen_name, scen_params in scenarios.items():
     white_nw = run_race_scenario('White', rep_plan, scen_params)
@@ -1064,14 +1089,270 @@ print(f"Saved: {save_path}")
 plt.close()
 
 
+# ── 4D: Racial Wealth Gap Surface — dense mortgage × appreciation × debt × plan grid ──
+# Batched kernel with common random numbers across races and grid points
+# (see simulation/wealth_model/gap_surface.py). Family of 4, median tier.
+print("  Running racial wealth gap surface (dense scenario grid)...")
+gap_surface_races = {
+    race: {
+        'income':        family_income_by_race[race],
+        'income_se':     family_income_moe[race],
+        'home_rate':     home_purchase_rates_by_race[race],
+        'home_rate_moe': home_purchase_rates_moe_by_race[race],
+        'emp_rates':     employment_rates_by_race[race],
+    }
+    for race in races
+}
+profiler.start_part('Part 4D: Racial wealth gap surface', total_cells=1)
+with profiler.cell('gap surface (all races x grid)', individuals=num_individuals * len(races)):
+    gap_surface = wealth_gap_surface(
+        gap_surface_races, idr_plans, fpl_family_of_4,
+        model_params_from(globals()), num_individuals,
+        debt_se=initial_student_loan_debt_se, wrap_random=profiler.timed_random,
+    )
+n_grid = int(np.prod(gap_surface.means['White'].shape))
+print(f"  Evaluated {n_grid:,} grid points × {len(races)} races")
+
+for minority_race in gap_surface.minority_races:
+    save_path = os.path.join(output_dir, f'fig11_wealth_gap_surface_{minority_race.lower()}.png')
+    plot_gap_heatmaps(gap_surface, minority_race, plt, save_path=save_path)
+    print(f"Saved: {save_path}")
+    plt.close()
+    gap = gap_surface.gap_pct(minority_race)
+    print(f"    {minority_race} gap range across grid: {gap.min():.1f}% to {gap.max():.1f}%")
+
+save_path = gap_surface.to_csv(os.path.join(output_dir, 'wealth_gap_surface.csv'))
+print(f"Saved: {save_path}")
+
+
+# ── 4E: Macro-Path Risk — stochastic inflation, rates, house prices and returns ──
+# Regime-switching VAR(1) paths (simulation/wealth_model/macro.py) whose long-run
+# means equal the constants above. Every plan and race faces the same paths and
+# the same individual draws (common random numbers), so plan and race
+# differences are not macro luck. Family of 4, median tier.
+# IDR_MACRO_PATHS sets the number of paths (0 skips this part).
+n_macro_paths = int(os.environ.get('IDR_MACRO_PATHS', 1_000))
+macro_seed    = int(os.environ.get('IDR_MACRO_SEED', 2025))
+macro_results = {}
+if n_macro_paths > 0:
+    print(f"  Running macro-path risk ({n_macro_paths:,} paths × {num_individuals:,} individuals)...")
+    profiler.start_part('Part 4E: Macro-path risk', total_cells=1 + len(idr_plans) * len(races))
+    with profiler.cell(f'{n_macro_paths} macro paths', individuals=0):
+        macro_paths = simulate_macro_paths(n_macro_paths, years=sum(stage_durations), seed=macro_seed,
+                                           wrap_random=profiler.timed_random)
+    macro_path_index = macro_paths.path_index(num_individuals)
+    macro_path_counts = np.bincount(macro_path_index, minlength=n_macro_paths)
+    for plan_name, settings in idr_plans.items():
+        macro_results[plan_name] = {}
+        for race in races:
+            race_debt = initial_student_loan_debt_by_race[race]
+            with profiler.cell(f'{plan_name}/{race} @ {n_macro_paths} macro paths'):
+                nw = simulate_wealth_with_idr(
+                    family_income_by_race[race], 1.0, settings,
+                    home_purchase_rates_by_race[race],
+                    employment_rates_by_race[race],
+                    fpl_family_of_4,
+                    income_se=family_income_moe[race],
+                    home_rate_moe=home_purchase_rates_moe_by_race[race],
+                    debt_mean=race_debt['mean'],
+                    debt_se=race_debt['se'],
+                    income_group=race,
+                    macro=macro_paths,
+                    random_source=profiler.timed_random(np.random.RandomState(macro_seed)),
+                )
+            macro_results[plan_name][race] = {
+                'net_worth': nw,
+                'path_mean': np.bincount(macro_path_index, weights=nw,
+                                         minlength=n_macro_paths) / macro_path_counts,
+            }
+
+    macro_rows = []
+    for plan_name in idr_plans:
+        white_paths = macro_results[plan_name]['White']['path_mean']
+        for race in races:
+            res = macro_results[plan_name][race]
+            p10, p50, p90 = np.percentile(res['net_worth'], [10, 50, 90])
+            path_p10, path_p90 = np.percentile(res['path_mean'], [10, 90])
+            row = {
+                'plan': plan_name, 'race': race,
+                'mean_net_worth': stable_mean(res['net_worth']),
+                'p10': float(p10), 'p50': float(p50), 'p90': float(p90),
+                'path_mean_p10': float(path_p10), 'path_mean_p90': float(path_p90),
+            }
+            if race != 'White':
+                gap = (res['path_mean'] / white_paths - 1) * 100
+                row.update({'gap_pct_path_median': float(np.median(gap)),
+                            'gap_pct_path_p10': float(np.percentile(gap, 10)),
+                            'gap_pct_path_p90': float(np.percentile(gap, 90))})
+            macro_rows.append(row)
+
+    # Figure 13: macro risk band per plan/race, and path-matched racial gaps
+    fig_m, (ax_band, ax_gap) = plt.subplots(1, 2, figsize=(16, 6))
+    x_m = np.arange(len(idr_plans))
+    width_m = 0.25
+    for i, race in enumerate(races):
+        rows = [r for r in macro_rows if r['race'] == race]
+        mid = np.array([r['mean_net_worth'] for r in rows]) / 1000
+        lo  = np.array([r['path_mean_p10'] for r in rows]) / 1000
+        hi  = np.array([r['path_mean_p90'] for r in rows]) / 1000
+        ax_band.errorbar(x_m + (i - 1) * width_m, mid, yerr=[mid - lo, hi - mid], fmt='o',
+                         color=race_colors_main[race], capsize=4, label=race)
+    ax_band.set_xticks(x_m)
+    ax_band.set_xticklabels([p.replace('_', ' ') for p in idr_plans], fontsize=8, rotation=20, ha='right')
+    ax_band.set_ylabel('Mean Net Worth ($K, Real 2025)', fontsize=10)
+    ax_band.set_title('Net Worth by Plan: mean and P10–P90 across macro paths', fontsize=11, fontweight='bold')
+    ax_band.legend(fontsize=9)
+    ax_band.grid(axis='y', alpha=0.3)
+    # Paths where White mean net worth is near zero give extreme ratios; bin P1–P99
+    gaps_m = {race: (macro_results[rep_plan][race]['path_mean'] /
+                     macro_results[rep_plan]['White']['path_mean'] - 1) * 100
+              for race in races if race != 'White'}
+    gap_range = np.percentile(np.concatenate(list(gaps_m.values())), [1, 99])
+    for race, gap in gaps_m.items():
+        ax_gap.hist(gap, bins=40, range=tuple(gap_range), alpha=0.6,
+                    color=race_colors_main[race], label=race)
+    ax_gap.axvline(0, color='#333333', linewidth=1.5, linestyle='--')
+    ax_gap.set_xlabel('Wealth Gap vs White Family on the Same Path (%)', fontsize=10)
+    ax_gap.set_ylabel('Macro paths', fontsize=10)
+    ax_gap.set_title(f'Racial Wealth Gap across Macro Paths — {rep_plan.replace("_", " ")}',
+                     fontsize=11, fontweight='bold')
+    ax_gap.legend(fontsize=9)
+    fig_m.suptitle('Macro-Path Risk: Family of 4, Median Income Tier\n'
+                   f'{n_macro_paths:,} regime-switching paths shared across plans and races',
+                   fontsize=12, fontweight='bold')
+    plt.tight_layout()
+    save_path = os.path.join(output_dir, 'fig13_macro_path_risk.png')
+    plt.savefig(save_path, dpi=150, bbox_inches='tight')
+    print(f"Saved: {save_path}")
+    plt.close()
+
+    save_path = os.path.join(output_dir, 'macro_path_risk.csv')
+    macro_fields = ['plan', 'race', 'mean_net_worth', 'p10', 'p50', 'p90', 'path_mean_p10',
+                    'path_mean_p90', 'gap_pct_path_median', 'gap_pct_path_p10', 'gap_pct_path_p90']
+    with open(save_path, 'w') as f:
+        f.write(','.join(macro_fields) + '\n')
+        for row in macro_rows:
+            f.write(','.join(str(row.get(k, '')) for k in macro_fields) + '\n')
+    print(f"Saved: {save_path}")
+
+
+# =============================================================================
+# PART 5: Household Types — size 1-8 × single/dual earner, one batched run
+# =============================================================================
+# Generalises Part 1 (1 person, fpl_single) and Part 2 (family of 4,
+# fpl_family_of_4): FPL scales with household size by the HHS formula and a
+# second earner adds an independent draw of per-earner income. All household
+# types, races and plans come out of one batched kernel call.
+print("\nRunning Part 5: Household types (sizes 1-8, single/dual earner)...")
+
+# Per-earner earnings by race — pooled mean of men/women (as employment_rates_by_race),
+# computed from `data`. The SE of the mean of two independent estimates is
+# sqrt(se_men² + se_women²) / 2.
+earner_income_groups = {
+    'Black':    ('Black Men', 'Black Women'),
+    'White':    ('White Men', 'White Women'),
+    'Hispanic': ('Latinx Men', 'Latinx Women'),
+}
+earner_income_by_race = {
+    race: {
+        'avg_income': (data[men]['avg_income'] + data[women]['avg_income']) / 2,
+        'income_se':  np.sqrt(data[men]['income_se'] ** 2 + data[women]['income_se'] ** 2) / 2,
+    }
+    for race, (men, women) in earner_income_groups.items()
+}
+household_groups = {
+    race: {
+        'income':        earner_income_by_race[race]['avg_income'],
+        'income_se':     earner_income_by_race[race]['income_se'],
+        'home_rate':     home_purchase_rates_by_race[race],
+        'home_rate_moe': home_purchase_rates_moe_by_race[race],
+        'emp_rates':     employment_rates_by_race[race],
+    }
+    for race in races
+}
+hh_types = household_types()
+profiler.start_part('Part 5: Household types', total_cells=1)
+with profiler.cell('household types (all races x types x plans)',
+                   individuals=num_individuals * len(races) * 2):
+    household_results = household_net_worth(
+        household_groups, idr_plans, model_params_from(globals()), num_individuals,
+        mortgage_interest_rate, home_appreciation_rate_nominal, initial_student_loan_debt,
+        types=hh_types, debt_se=initial_student_loan_debt_se, wrap_random=profiler.timed_random,
+    )
+print(f"  Evaluated {len(hh_types)} household types × {len(races)} races × {len(idr_plans)} plans")
+for race in races:
+    single = household_results.mean(race, 1, plan='SAVE_grad')
+    dual4 = household_results.mean(race, 4, dual_earner=True, plan='SAVE_grad')
+    print(f"    {race:<9} SAVE grad: 1p single ${single:>11,.0f} | 4p dual ${dual4:>11,.0f}")
+
+save_path = os.path.join(output_dir, 'fig12_household_types.png')
+plot_household_types(household_results, plt, colors=race_colors_main, save_path=save_path)
+print(f"Saved: {save_path}")
+plt.close()
+save_path = household_results.to_csv(os.path.join(output_dir, 'household_types.csv'))
+print(f"Saved: {save_path}")
+
+
+# =============================================================================
+# PART 6: Plan Optimizer — repayment rate × FPL multiplier × term (IDR_OPTIMIZE=1)
+# =============================================================================
+# Searches plan parameters for the smallest mean racial wealth gap (family of 4,
+# median tier) whose forgiven balance per borrower stays within the cost of
+# IDR_OPTIMIZE_BUDGET_PLAN. Grid search plus CMA-ES on the batched kernel with
+# common random numbers; every evaluation is cached in plan_optimizer_cache.json
+# (see simulation/wealth_model/optimizer.py).
+optimizer_summary = None
+if os.environ.get('IDR_OPTIMIZE', '0') == '1':
+    print("\nRunning Part 6: Plan optimizer...")
+    budget_plan = os.environ.get('IDR_OPTIMIZE_BUDGET_PLAN', rep_plan)
+    profiler.start_part('Part 6: Plan optimizer', total_cells=1)
+    with profiler.cell('plan optimizer (grid + CMA-ES)', individuals=num_individuals * len(races)):
+        plan_evaluator = PlanEvaluator(
+            gap_surface_races, fpl_family_of_4, model_params_from(globals()), num_individuals,
+            mortgage_interest_rate, home_appreciation_rate_nominal, initial_student_loan_debt,
+            debt_se=initial_student_loan_debt_se,
+            cache_path=os.path.join(output_dir, 'plan_optimizer_cache.json'),
+            wrap_random=profiler.timed_random,
+        )
+        current_plans = dict(zip(idr_plans, plan_evaluator.evaluate(list(idr_plans.values()))))
+        cost_budget = current_plans[budget_plan]['forgiven_per_borrower']
+        grid_search(plan_evaluator)
+        best_plan, _ = cma_es(plan_evaluator, lambda r: constrained_gap(r, budget=cost_budget))
+    evaluated = plan_evaluator.evaluations()
+    front = pareto_front(evaluated)
+    print(f"  Evaluated {len(evaluated):,} candidate plans ({plan_evaluator.n_simulated:,} simulated, "
+          f"rest cached); Pareto front: {len(front)} plans")
+    print(f"  Budget: {budget_plan} forgiven ${cost_budget:,.0f}/borrower, "
+          f"mean |gap| {current_plans[budget_plan]['mean_abs_gap_pct']:.1f}%")
+    print(f"  Best within budget: rate {best_plan['repayment_rate']:.1%}, "
+          f"{best_plan['fpl_multiplier']:.2f}× FPL, {best_plan['years']} yrs → "
+          f"mean |gap| {best_plan['mean_abs_gap_pct']:.1f}%, forgiven ${best_plan['forgiven_per_borrower']:,.0f}")
+
+    save_path = os.path.join(output_dir, 'fig14_plan_optimizer_pareto.png')
+    plot_pareto(evaluated, front, plt, baseline=current_plans, budget=cost_budget, save_path=save_path)
+    print(f"Saved: {save_path}")
+    plt.close()
+    for name, rows in (('plan_optimizer_evaluations.csv', evaluated), ('plan_optimizer_pareto.csv', front)):
+        save_path = results_to_csv(rows, os.path.join(output_dir, name))
+        print(f"Saved: {save_path}")
+    optimizer_summary = {
+        'budget_plan': budget_plan,
+        'forgiven_budget_per_borrower': cost_budget,
+        'current_plans': current_plans,
+        'best_within_budget': best_plan,
+        'pareto_front': front,
+    }
+
+
 # =============================================================================
 # SUMMARY OUTPUT
 # =============================================================================
+profiler.start_part('Summary export')
 print("\n" + "=" * 80)
 print("ALL CHARTS SAVED SUCCESSFULLY!")
 print("=" * 80)
 print(f"Location: {output_dir}")
-print("\nGenerated files (26 total):")
+print("\nGenerated files (30 figures + tables):")
 print("\nPart 1 — Individual Scenarios by Race/Gender (6 files):")
 for cat in data.keys():
     print(f"  fig1_individual_{cat.lower().replace(' ','_')}.png")
@@ -1085,10 +1366,25 @@ for fig, label in [('fig3','IDR Payment Burden'),('fig4','Disposable Income'),
         print(f"  {fig}_{label.lower().replace(' ','_').replace('&','and').replace('%','pct')}_{race.lower()}.png")
 for race in ['black','hispanic']:
     print(f"  fig7_wealth_gap_{race}.png")
-print("\nPart 4 — Sensitivity Analysis (3 files):")
+print("\nPart 4 — Sensitivity Analysis (6 files + 2 tables):")
 print("  fig8_sensitivity_tornado.png       ← One-at-a-time ±1 SE/MOE parameter perturbation")
 print("  fig9_sensitivity_scenarios.png     ← Pessimistic / Baseline / Optimistic × all plans")
 print("  fig10_wealth_gap_sensitivity.png   ← Racial wealth gap across economic scenarios")
+print("  fig11_wealth_gap_surface_black.png    ← Gap heatmaps, mortgage × appreciation per plan")
+print("  fig11_wealth_gap_surface_hispanic.png")
+print("  wealth_gap_surface.csv             ← Queryable gap table over the full scenario grid")
+print("  fig13_macro_path_risk.png          ← Net worth and racial gaps across stochastic macro paths")
+print("  macro_path_risk.csv                ← Plan × race quantiles and path-level risk bands")
+print("\nPart 5 — Household Types (1 file + table):")
+print("  fig12_household_types.png          ← Net worth by household size, single vs dual earner")
+print("  household_types.csv                ← Race × household type × plan means")
+print("\nFederal cost accounting (table):")
+print("  federal_cost_by_cell.csv           ← Payments, interest, forgiven balance, PV net cost per cell")
+if optimizer_summary is not None:
+    print("\nPart 6 — Plan Optimizer (1 file + 2 tables, IDR_OPTIMIZE=1):")
+    print("  fig14_plan_optimizer_pareto.png    ← Wealth gap vs forgiven balance, Pareto front")
+    print("  plan_optimizer_evaluations.csv     ← Every evaluated plan (cached in plan_optimizer_cache.json)")
+    print("  plan_optimizer_pareto.csv          ← Non-dominated plans on (|gap|, cost)")
 
 print("\n" + "=" * 80)
 print("UPDATED PARAMETER VALUES (vs. previous version)")
@@ -1126,8 +1422,11 @@ _summary = {
         'home_purchase_rates_by_race': home_purchase_rates_by_race,
         'initial_student_loan_debt_by_race': initial_student_loan_debt_by_race,
     },
+    # Every estimate carries a 95% CI: 'ci95_*' for the mean (normal approx.,
+    # as in the figures); medians, quantiles and gaps use batch means.
     'individual_net_worth_by_plan_category_bracket': {},
     'family_net_worth_by_plan_race_tier': {},
+    'family_wealth_gap_pct_vs_white_by_plan_race_tier': {},
 }
 for plan_name in idr_plans:
     _summary['individual_net_worth_by_plan_category_bracket'][plan_name] = {}
@@ -1138,7 +1437,7 @@ for plan_name in idr_plans:
             m, lo, hi = summarize(arr)
             _summary['individual_net_worth_by_plan_category_bracket'][plan_name][category][bracket] = {
                 'mean': float(m), 'ci95_low': float(lo), 'ci95_high': float(hi),
-                'median': float(np.median(arr)),
+                **cell_summary(arr),
             }
     _summary['family_net_worth_by_plan_race_tier'][plan_name] = {}
     for race in family_income_by_race:
@@ -1148,14 +1447,70 @@ for plan_name in idr_plans:
             m, lo, hi = summarize(arr)
             _summary['family_net_worth_by_plan_race_tier'][plan_name][race][tier_name] = {
                 'mean': float(m), 'ci95_low': float(lo), 'ci95_high': float(hi),
-                'median': float(np.median(arr)),
+                **cell_summary(arr),
+            }
+    _summary['family_wealth_gap_pct_vs_white_by_plan_race_tier'][plan_name] = {}
+    for race in family_income_by_race:
+        if race == 'White':
+            continue
+        _summary['family_wealth_gap_pct_vs_white_by_plan_race_tier'][plan_name][race] = {}
+        for tier_name in family_income_tiers:
+            gap, lo, hi = gap_pct_ci(family_results[plan_name][race][tier_name],
+                                     family_results[plan_name]['White'][tier_name])
+            _summary['family_wealth_gap_pct_vs_white_by_plan_race_tier'][plan_name][race][tier_name] = {
+                'gap_pct': float(gap), 'ci95_low': float(lo), 'ci95_high': float(hi),
             }
 
+# Federal cost per plan: pooled over the Part 1 / Part 2 cells (totals summed,
+# per-borrower means weighted by cell size); per-cell rows in the CSV
+_summary['federal_cost_by_plan'] = {}
+for plan_name in idr_plans:
+    _summary['federal_cost_by_plan'][plan_name] = {}
+    for part in ('individual', 'family'):
+        cells = [c for c in federal_cost if c['plan'] == plan_name and c['part'] == part]
+        n_total = sum(c['n'] for c in cells)
+        _summary['federal_cost_by_plan'][plan_name][part] = {
+            'borrowers': n_total,
+            'share_forgiven': sum(c['share_forgiven'] * c['n'] for c in cells) / n_total,
+            **{f'{field}_{stat}': sum(c[f'{field}_total'] for c in cells) / (n_total if stat == 'mean' else 1)
+               for field in LoanAccounting.FIELDS for stat in ('mean', 'total')},
+        }
+_summary['federal_cost_by_cell'] = federal_cost
+
+_cost_path = os.path.join(output_dir, 'federal_cost_by_cell.csv')
+_cost_fields = list(federal_cost[0].keys())
+with open(_cost_path, 'w') as _f:
+    _f.write(','.join(_cost_fields) + '\n')
+    for _row in federal_cost:
+        _f.write(','.join(str(_row[k]) for k in _cost_fields) + '\n')
+print(f"Saved federal cost table: {_cost_path}")
+print(f"  Federal cost per borrower, family of 4 (PV at {federal_discount_rate_real:.0%} real):")
+for plan_name, parts in _summary['federal_cost_by_plan'].items():
+    fam = parts['family']
+    print(f"    {plan_name:<15} paid ${fam['payments_mean']:>9,.0f}  interest ${fam['interest_mean']:>8,.0f}  "
+          f"forgiven ${fam['forgiven_mean']:>8,.0f}  net cost ${fam['net_cost_mean']:>9,.0f}")
+
+if optimizer_summary is not None:
+    _summary['plan_optimizer'] = optimizer_summary
+if macro_results:
+    _summary['macro_path_risk'] = {
+        'n_paths': n_macro_paths,
+        'paths': macro_paths.summary(),
+        'by_plan_race': {plan_name: {row['race']: {k: v for k, v in row.items() if k not in ('plan', 'race')}
+                                     for row in macro_rows if row['plan'] == plan_name}
+                         for plan_name in idr_plans},
+    }
+
 _summary_path = os.path.join(output_dir, 'simulation_summary.json')
 with open(_summary_path, 'w') as _f:
     _json.dump(_summary, _f, indent=2)
 print(f"\nSaved summary JSON: {_summary_path}")
 
+profiler.finish()
+_profile_path = profiler.save(os.path.join(output_dir, 'run_profile.json'))
+profiler.print_summary()
+print(f"Saved run profile: {_profile_path}")
+
 print("\n" + "=" * 80)
 print("MOE / SE INTEGRATION")
 print("=" * 80)
@@ -1163,7 +1518,8 @@ print("  Each simulation draw samples income from N(mean, SE) per BLS/Census rep
 print("  Home purchase rates sampled from N(rate, MOE/1.645) [90% CI conversion]")
 print("  Student loan debt sampled from N($37,500, $2,000)")
 print("  Employment rates perturbed by N(0, 0.015) each stage")
-print("  95% CI error bars shown on all wealth charts (Figures 1, 2, 6)")
+print("  95% CI error bars shown on all wealth charts (Figures 1, 2, 6) and gaps (Figure 7)")
+print("  Medians, quantiles and gaps in simulation_summary.json carry batch-means 95% CIs")
 print("=" * 80)
 print("\nCITATIONS:")
 print("  [1] BLS Usual Weekly Earnings Q4 2024: https://www.bls.gov/news.release/archives/wkyeng_02212025.pdf")
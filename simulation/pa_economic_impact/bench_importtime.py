@@ -0,0 +1,109 @@
+"""Pennsylvania Higher Education Economic Impact Analysis — Import-Time Benchmark
+
+Runs each phase under ``python -X importtime`` twice: with config.py's heavy
+imports eager (PA_ECON_EAGER_IMPORTS=1, the old behaviour) and lazy (the
+default), and reports per phase:
+
+    config ms   cumulative import time of config.py itself (startup cost)
+    total ms    import time of every module the phase loaded while it ran
+    heavy       which of numpy/pandas/matplotlib/seaborn the phase actually needed
+
+Outputs go to a temporary directory, so pa_output/ is left alone.
+
+Usage:
+    python bench_importtime.py            # All phases
+    python bench_importtime.py 17 18      # Specific phases
+    python bench_importtime.py --repeat 3 # Best of 3 runs per mode
+
+Author: Oscar J. Mayorga
+Updated: March 3, 2026
+Repository: github.com/omayorga/Simulation
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+from run_all import PHASES, SCRIPT_DIR
+
+HEAVY_MODULES = ('numpy', 'pandas', 'matplotlib', 'seaborn')
+
+
+def parse_importtime(stderr):
+    """``-X importtime`` lines -> ({top-level module: cumulative us}, set of all modules)."""
+    top, loaded = {}, set()
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        loaded.add(name.strip())
+        # Nested imports are indented by two spaces per level under the module that caused them
+        if not name[1:].startswith(' '):
+            top[name.strip()] = int(cumulative)
+    return top, loaded
+
+
+def measure(filename, eager, output_dir):
+    """Import-time profile of one run of a phase file."""
+    env = dict(os.environ, PA_ECON_OUTPUT_DIR=output_dir)
+    env.pop('PA_ECON_EAGER_IMPORTS', None)
+    if eager:
+        env['PA_ECON_EAGER_IMPORTS'] = '1'
+    proc = subprocess.run([sys.executable, '-X', 'importtime', os.path.join(SCRIPT_DIR, filename)],
+                          cwd=SCRIPT_DIR, env=env, stdout=subprocess.DEVNULL,
+                          stderr=subprocess.PIPE, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{filename} failed:\n{proc.stderr[-2000:]}")
+    top, loaded = parse_importtime(proc.stderr)
+    return {
+        'config_ms': top.get('config', 0) / 1000,
+        'total_ms': sum(top.values()) / 1000,
+        'heavy': [m for m in HEAVY_MODULES if m in loaded],
+    }
+
+
+def best_of(filename, eager, output_dir, repeat):
+    runs = [measure(filename, eager, output_dir) for _ in range(repeat)]
+    return min(runs, key=lambda r: r['total_ms'])
+
+
+def main():
+    args = sys.argv[1:]
+    repeat = 1
+    if '--repeat' in args:
+        i = args.index('--repeat')
+        try:
+            repeat = max(1, int(args[i + 1]))
+        except (IndexError, ValueError):
+            print("ERROR: --repeat needs a number of runs")
+            sys.exit(1)
+        del args[i:i + 2]
+    try:
+        phases = [int(x) for x in args] or sorted(PHASES)
+    except ValueError:
+        print("Usage: python bench_importtime.py [--repeat N] [phase_numbers...]")
+        sys.exit(1)
+
+    print(f"{'Phase':<7}{'config ms':>20}{'total import ms':>24}  {'reduction':>9}  heavy modules (lazy)")
+    print(f"{'':<7}{'eager':>10}{'lazy':>10}{'eager':>12}{'lazy':>12}")
+    print("-" * 100)
+    sums = {'eager': 0.0, 'lazy': 0.0}
+    with tempfile.TemporaryDirectory(prefix='pa_importtime_') as output_dir:
+        for phase_num in phases:
+            filename = PHASES[phase_num][0]
+            eager = best_of(filename, True, output_dir, repeat)
+            lazy = best_of(filename, False, output_dir, repeat)
+            sums['eager'] += eager['total_ms']
+            sums['lazy'] += lazy['total_ms']
+            reduction = 1 - lazy['total_ms'] / eager['total_ms'] if eager['total_ms'] else 0
+            print(f"{phase_num:<7}{eager['config_ms']:>10.1f}{lazy['config_ms']:>10.1f}"
+                  f"{eager['total_ms']:>12.1f}{lazy['total_ms']:>12.1f}  {reduction:>9.0%}  "
+                  f"{', '.join(lazy['heavy']) or '-'}")
+    print("-" * 100)
+    total_reduction = 1 - sums['lazy'] / sums['eager'] if sums['eager'] else 0
+    print(f"{'All':<27}{sums['eager']:>12.1f}{sums['lazy']:>12.1f}  {total_reduction:>9.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+"""Make-style build cache for run_all.py: skip phases whose outputs are up to date.
+
+A phase is rebuilt when anything that can change its outputs has changed
+since its last successful run:
+
+    source      the phase file, and the definitions it reaches in local
+                modules (context.py, projection.py, ...), by content hash
+    config      the value of every config.py symbol the phase or that code
+                mentions by name (functions by their source), taken from
+                the run's ModelConfig when one is given
+    inputs      the contents of declared input files in OUTPUT_DIR
+    env         the environment switches in PHASE_ENV that the phase file
+                names (PA_ECON_JOINT_DRAWS for Phase 2, PA_ECON_LEGACY_LOOP
+                for Phase 8)
+    outputs     every declared output file must still exist with the
+                contents recorded when the phase last wrote it
+
+Fingerprints are kept in ``OUTPUT_DIR/.build_manifest.json``. ``explain``
+lists what changed, so ``run_all.py --explain`` shows why each phase did or
+did not rerun; ``--force`` ignores the manifest and rebuilds everything.
+"""
+
+import ast
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import types
+
+MANIFEST_NAME = '.build_manifest.json'
+MANIFEST_VERSION = 1
+# Environment variables that change what a phase computes; a phase depends on
+# the ones its file mentions. (PA_ECON_OUTPUT_DIR picks the manifest itself and
+# PA_ECON_OVERRIDES reaches the fingerprint as config values.)
+PHASE_ENV = ('PA_ECON_LEGACY_LOOP', 'PA_ECON_JOINT_DRAWS')
+
+
+def is_artifact(name):
+    """Declared inputs/outputs with a file extension are files in OUTPUT_DIR;
+    bare names are context.py intermediates (covered by the source hashes)."""
+    return '.' in name
+
+
+def _digest(data):
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def file_digest(path):
+    with open(path, 'rb') as f:
+        return _digest(f.read())
+
+
+def value_digest(value):
+    """Content hash of a config value; None for modules (nothing to compare)."""
+    if isinstance(value, types.ModuleType):
+        return None
+    if isinstance(value, (types.FunctionType, type)):
+        try:
+            return _digest(inspect.getsource(value).encode())
+        except (OSError, TypeError):
+            return _digest(repr(value).encode())
+    try:
+        return _digest(pickle.dumps(value, protocol=4))
+    except Exception:
+        return _digest(repr(value).encode())
+
+
+def _names_in(nodes):
+    """Names and attribute names referenced anywhere in ``nodes``."""
+    names, attrs = set(), set()
+    for node in nodes:
+        for sub in ast.walk(node):
+            if isinstance(sub, ast.Name):
+                names.add(sub.id)
+            elif isinstance(sub, ast.Attribute):
+                attrs.add(sub.attr)
+    return names, attrs
+
+
+class ModuleIndex:
+    """Top-level definitions of a local module, for symbol-level dependencies.
+
+    A phase that does ``from context import shared`` and calls
+    ``shared.monte_carlo()`` depends on ``shared``, the ``PhaseContext``
+    class body and ``__init__``, and the ``monte_carlo`` method with what it
+    calls, but not on ``free_college_results`` or projection.py.
+    """
+
+    def __init__(self, path):
+        with open(path) as f:
+            self.source = f.read()
+        tree = ast.parse(self.source, filename=path)
+        self.symbols = {}      # name -> [top-level nodes defining it]
+        self.methods = {}      # method name -> [FunctionDef nodes]
+        self.class_body = {}   # class name -> [non-method nodes + __init__]
+        self.imports = {}      # local name -> (module, name) for ``from x import y``
+        for node in tree.body:
+            if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
+                self.symbols.setdefault(node.name, []).append(node)
+                if isinstance(node, ast.ClassDef):
+                    body = []
+                    for item in node.body:
+                        if isinstance(item, ast.FunctionDef) and item.name != '__init__':
+                            self.methods.setdefault(item.name, []).append(item)
+                        else:
+                            body.append(item)
+                    self.class_body[node.name] = body
+            elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+                for a in node.names:
+                    self.imports[a.asname or a.name] = (node.module, a.name)
+            elif isinstance(node, (ast.Assign, ast.AnnAssign, ast.AugAssign)):
+                targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+                for t in targets:
+                    for sub in ast.walk(t):
+                        if isinstance(sub, ast.Name):
+                            self.symbols.setdefault(sub.id, []).append(node)
+
+    def segment(self, node):
+        return ast.get_source_segment(self.source, node) or ''
+
+    def reach(self, roots, attrs):
+        """Follow ``roots`` (names) and ``attrs`` (attribute names used on them).
+
+        Returns (source text of every reached definition, names used there that
+        this module does not define, {module: names imported from it and used}).
+        """
+        seen, segments, external, imported = set(), [], set(), {}
+        names, attrs = set(roots), set(attrs)
+        while True:
+            todo = [('sym', n) for n in names if n in self.symbols]
+            todo += [('cls', n) for n in names if n in self.class_body]
+            todo += [('meth', a) for a in attrs if a in self.methods]
+            todo = [t for t in todo if t not in seen]
+            if not todo:
+                break
+            for kind, name in todo:
+                seen.add((kind, name))
+                nodes = (self.symbols.get(name, []) if kind == 'sym' else
+                         self.class_body[name] if kind == 'cls' else self.methods[name])
+                if kind == 'sym':
+                    # a class is entered through its body; methods come in by attribute
+                    nodes = [n for n in nodes if not isinstance(n, ast.ClassDef)]
+                segments.extend(self.segment(n) for n in nodes)
+                new_names, new_attrs = _names_in(nodes)
+                names |= new_names
+                attrs |= new_attrs
+        for n in names:
+            if n in self.imports:
+                module, original = self.imports[n]
+                imported.setdefault(module, set()).add(original)
+            elif n not in self.symbols:
+                external.add(n)
+        return segments, external, imported, attrs
+
+
+class BuildCache:
+    """Phase fingerprints for one OUTPUT_DIR, with up-to-date checks."""
+
+    def __init__(self, output_dir, script_dir, config, cfg=None):
+        self.output_dir = str(output_dir)
+        self.script_dir = script_dir
+        self.path = os.path.join(self.output_dir, MANIFEST_NAME)
+        self.manifest = self._load()
+        self._indexes = {}
+        # Hash config up front, before any in-process phase can touch its objects
+        # (``__all__`` includes the derived aggregates config resolves on first access)
+        names = getattr(config, '__all__', None) or [n for n in vars(config) if not n.startswith('_')]
+        self._config_digests = {n: value_digest(getattr(config, n)) for n in names}
+        if cfg is not None:
+            # Model values come from the run's ModelConfig (run_all.py --set), thawed
+            # so an unchanged value hashes as it does in config.py
+            from model_config import thaw
+            self._config_digests.update((n, value_digest(thaw(getattr(cfg, n)))) for n in dir(cfg))
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if manifest.get('version') != MANIFEST_VERSION:
+            return {}
+        return manifest.get('phases', {})
+
+    def save(self):
+        tmp = f'{self.path}.{os.getpid()}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump({'version': MANIFEST_VERSION, 'phases': self.manifest}, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+
+    def _sources(self, filename):
+        """Hashes of the phase file and of the code it reaches in local modules,
+        every name that code mentions (candidates for config symbols), and
+        the PHASE_ENV variables the phase file names.
+
+        Attribute names count too: engines read ModelConfig values as
+        ``cfg.inflation_rate``.
+        """
+        path = os.path.join(self.script_dir, filename)
+        with open(path) as f:
+            tree = ast.parse(f.read(), filename=path)
+        sources = {filename: file_digest(path)}
+        names, attrs = _names_in([tree])
+        env = {node.value for node in ast.walk(tree)
+               if isinstance(node, ast.Constant) and node.value in PHASE_ENV}
+        wanted = {}
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+                names.update(a.name for a in node.names if a.name != '*')
+                wanted.setdefault(node.module, set()).update(a.name for a in node.names)
+        visited = {}
+        while wanted:
+            module, roots = wanted.popitem()
+            mod_path = os.path.join(self.script_dir, f'{module}.py')
+            if module == 'config' or not os.path.exists(mod_path):
+                continue
+            roots = roots - visited.get(module, set())
+            if not roots:
+                continue
+            visited.setdefault(module, set()).update(roots)
+            if module not in self._indexes:
+                self._indexes[module] = ModuleIndex(mod_path)
+            index = self._indexes[module]
+            segments, external, imported, reached_attrs = index.reach(visited[module], attrs)
+            sources[f'{module}.py'] = _digest('\n'.join(sorted(set(segments))).encode())
+            names |= external | imported.get('config', set())
+            attrs |= reached_attrs
+            for other, other_roots in imported.items():
+                wanted.setdefault(other, set()).update(other_roots)
+        return sources, names | attrs, env
+
+    def fingerprint(self, filename, inputs):
+        """Everything the phase's outputs depend on, as {'source', 'config', 'inputs', 'env'}.
+
+        ``env`` holds only the switches that are set, so a phase built before
+        the entry existed is still up to date with them unset.
+        """
+        sources, names, env_names = self._sources(filename)
+        config = {n: self._config_digests[n] for n in sorted(names & set(self._config_digests))
+                  if self._config_digests[n] is not None}
+        artifacts = {}
+        for name in inputs:
+            if is_artifact(name):
+                path = os.path.join(self.output_dir, name)
+                artifacts[name] = file_digest(path) if os.path.exists(path) else None
+        env = {n: os.environ[n] for n in sorted(env_names) if os.environ.get(n)}
+        return {'source': sources, 'config': config, 'inputs': artifacts, 'env': env}
+
+    def explain(self, phase_num, fingerprint, outputs):
+        """Reasons the phase must rerun; an empty list means it is up to date."""
+        entry = self.manifest.get(str(phase_num))
+        if entry is None:
+            return ['never built (no record in the build manifest)']
+        reasons = []
+        for kind, label in (('source', 'source changed'), ('config', 'config changed'),
+                            ('inputs', 'input changed'), ('env', 'environment changed')):
+            old, new = entry['fingerprint'].get(kind, {}), fingerprint.get(kind, {})
+            changed = sorted(k for k in set(old) | set(new) if old.get(k) != new.get(k))
+            if changed:
+                shown = ', '.join(changed[:6]) + (f' (+{len(changed) - 6} more)' if len(changed) > 6 else '')
+                reasons.append(f'{label}: {shown}')
+        for name in outputs:
+            if not is_artifact(name):
+                continue
+            path = os.path.join(self.output_dir, name)
+            if not os.path.exists(path):
+                reasons.append(f'output missing: {name}')
+            elif entry['outputs'].get(name) != file_digest(path):
+                reasons.append(f'output modified since last build: {name}')
+        return reasons
+
+    def record(self, phase_num, fingerprint, outputs):
+        """Store the fingerprint and output hashes after a successful run."""
+        hashes = {}
+        for name in outputs:
+            path = os.path.join(self.output_dir, name)
+            if is_artifact(name) and os.path.exists(path):
+                hashes[name] = file_digest(path)
+        self.manifest[str(phase_num)] = {'fingerprint': fingerprint, 'outputs': hashes}
+        self.save()
+
+    def forget(self, phase_num):
+        if self.manifest.pop(str(phase_num), None) is not None:
+            self.save()
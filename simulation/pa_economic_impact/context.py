@@ -0,0 +1,190 @@
+"""Shared computed state for phases run in one interpreter.
+
+Several phases rebuild the same intermediates so each file can run on its
+own: Phase 6's free-college ``results`` (Phases 8, 14, 16, 17), the Phase 2
+Monte Carlo draws (Phases 5, 8), Phase 3's ``df_historical`` and Phase 4's
+county table (Phase 5). A phase gets them from ``shared``:
+
+    from context import shared
+    results = shared.free_college_results()
+
+Run as a script, a phase has a fresh ``PhaseContext`` and computes the value
+on first use, exactly as before. Under ``run_all.py`` (in-process mode) all
+phases share one interpreter and therefore one ``shared``: the first phase to
+ask computes the value and the rest reuse it. Every call hands out a deep copy,
+so one phase modifying its DataFrame cannot leak into the next.
+
+Each value is computed from a ``ModelConfig`` (model_config.py):
+``shared.config`` unless a call passes ``cfg=``. The memo is keyed by
+``cfg.digest``, so one context can hold results for many configs, e.g.
+``shared.free_college_results(cfg=shared.config.replace(inflation_rate=0.03))``.
+Phases read their model inputs as ``cfg = shared.config``. ``shared`` starts
+from ``model_config.environ_config()``: config.py's values plus the
+``$PA_ECON_OVERRIDES`` that ``run_all.py --set`` passes down.
+"""
+
+import copy
+import time
+
+from config import OUTPUT_DIR, np, pd, validate_data_lengths
+from model_config import default_config, environ_config
+from projection import free_college_results
+
+
+class PhaseContext:
+    """Memoized intermediates plus a record of the phases run in this process.
+
+    Attributes
+    ----------
+    output_dir : pathlib.Path
+        Where phases write figures and tables (``config.OUTPUT_DIR``).
+    config : ModelConfig
+        The configuration intermediates are computed from by default.
+    phases : dict
+        Phase number -> {'status': 'OK' | 'FAILED', 'elapsed': seconds,
+        'namespace': the phase's module globals after it ran}.
+    hits, misses : int
+        Memo lookups served from the cache / computed on first request.
+    """
+
+    def __init__(self, output_dir=OUTPUT_DIR, config=None):
+        self.output_dir = output_dir
+        self.config = default_config() if config is None else config
+        self.phases = {}
+        self.hits = 0
+        self.misses = 0
+        self._memo = {}
+        self._compute_s = {}
+        self._hits_by_key = {}
+
+    def memoize(self, key, compute):
+        """Return a copy of ``compute()``, computing it only on first request.
+
+        ``key`` should include the digest of the config the value depends on.
+        """
+        if key in self._memo:
+            self.hits += 1
+            self._hits_by_key[key] = self._hits_by_key.get(key, 0) + 1
+        else:
+            self.misses += 1
+            start = time.perf_counter()
+            self._memo[key] = compute()
+            self._compute_s[key] = time.perf_counter() - start
+        return copy.deepcopy(self._memo[key])
+
+    def saved_seconds(self):
+        """Compute time avoided by cache hits (each hit would have recomputed)."""
+        return sum(self._compute_s[k] * n for k, n in self._hits_by_key.items())
+
+    def record_phase(self, phase_num, ok, elapsed, namespace=None):
+        self.phases[phase_num] = {'status': 'OK' if ok else 'FAILED', 'elapsed': elapsed,
+                                  'namespace': namespace or {}}
+
+    # ── Shared intermediates ─────────────────────────────────────────────────
+
+    def _config_memo(self, name, compute, cfg):
+        cfg = self.config if cfg is None else cfg
+        return self.memoize((name, cfg.digest), lambda: compute(cfg))
+
+    def free_college_results(self, cfg=None):
+        """Phase 6 ``results``: {horizon: cumulative cost, graduates, ROI, annual_data}."""
+        return self._config_memo('free_college_results', lambda c: free_college_results(cfg=c), cfg)
+
+    def monte_carlo(self, cfg=None):
+        """Phase 2 draws: (simulation_results by parameter, impact_distribution).
+
+        Seeds the global RNG with ``RANDOM_SEED`` when the draws are computed;
+        callers that draw further random numbers must seed for themselves.
+        """
+        return self._config_memo('monte_carlo', _monte_carlo, cfg)
+
+    def historical_frame(self, cfg=None):
+        """Phase 3 ``df_historical``: appropriations, enrollment and tuition, 2010-2026."""
+        return self._config_memo('historical_frame', _historical_frame, cfg)
+
+    def county_impact(self, cfg=None):
+        """Phase 4 (county_impact dict, df_county sorted by total impact)."""
+        return self._config_memo('county_impact', _county_impact, cfg)
+
+
+def _monte_carlo(cfg):
+    np.random.seed(cfg.RANDOM_SEED)
+    simulation_results = {}
+    for param, (mean, std) in cfg.param_distributions.items():
+        simulation_results[param] = np.random.normal(mean, std, cfg.MONTE_CARLO_SIMULATIONS)
+    impact_distribution = cfg.base_direct_spending * simulation_results['output_multiplier']
+    return simulation_results, impact_distribution
+
+
+def _historical_frame(cfg):
+    assert validate_data_lengths(cfg.historical_data, 17), "Historical data length mismatch!"
+    df_historical = pd.DataFrame({k: list(v) for k, v in cfg.historical_data.items()})
+    # Inflation-adjusted appropriations
+    df_historical['state_appropriation_real'] = (
+        df_historical['state_appropriation_nominal'] / df_historical['cpi_adjustment']
+    )
+    # Per-FTE funding
+    df_historical['total_enrollment'] = (
+        df_historical['passhe_enrollment'] + df_historical['state_related_enrollment']
+    )
+    df_historical['appropriation_per_fte'] = (
+        df_historical['state_appropriation_real'] * 1e6 / df_historical['total_enrollment']
+    )
+    # Real wage-adjusted calculations
+    df_historical['cumulative_wage_factor'] = (1 + df_historical['real_wage_growth']).cumprod()
+    df_historical['appropriation_wage_adjusted'] = (
+        df_historical['state_appropriation_real'] / df_historical['cumulative_wage_factor']
+    )
+    df_historical['per_fte_wage_adjusted'] = (
+        df_historical['appropriation_wage_adjusted'] * 1e6 / df_historical['total_enrollment']
+    )
+    # Real tuition adjusted
+    df_historical['tuition_real'] = (
+        df_historical['tuition_avg_public'] / df_historical['cpi_adjustment']
+    )
+    return df_historical
+
+
+def _county_impact(cfg):
+    county_impact = {}
+
+    def add(name, data, spending):
+        county = data['county']
+        if county not in county_impact:
+            county_impact[county] = {'enrollment': 0, 'employees': 0, 'institutions': [], 'spending': 0}
+        county_impact[county]['enrollment'] += data['enrollment']
+        county_impact[county]['employees'] += data['employees']
+        county_impact[county]['institutions'].append(name)
+        county_impact[county]['spending'] += spending
+
+    for name, data in cfg.state_related_universities.items():
+        add(name, data, data['operating_budget'])
+    for name, data in cfg.passhe_universities.items():
+        add(name, data, data['enrollment'] * 15000)  # Est. per-student spending
+    for name, data in cfg.community_colleges.items():
+        add(name, data, data['enrollment'] * 10000)  # Est. per-student spending
+
+    for county, data in county_impact.items():
+        data['direct_impact'] = data['spending']
+        data['total_impact'] = data['spending'] * cfg.rims_ii_multipliers['output_multiplier']
+        data['jobs_supported'] = int(data['employees'] * 1.8)  # Direct + indirect
+        data['student_spending'] = data['enrollment'] * cfg.avg_student_spending * 0.65
+
+    df_county = pd.DataFrame([
+        {
+            'County': county,
+            'Enrollment': data['enrollment'],
+            'Employees': data['employees'],
+            'Institutions': len(data['institutions']),
+            'Direct_Impact_M': data['direct_impact'] / 1e6,
+            'Total_Impact_M': data['total_impact'] / 1e6,
+            'Jobs_Supported': data['jobs_supported'],
+            'Student_Spending_M': data['student_spending'] / 1e6
+        }
+        for county, data in county_impact.items()
+    ]).sort_values('Total_Impact_M', ascending=False)
+    return county_impact, df_county
+
+
+# The context for this interpreter; run_all.py's in-process mode shares it across phases
+shared = PhaseContext(config=environ_config())
@@ -0,0 +1,253 @@
+"""Immutable model configuration with explicit overrides.
+
+Phases read config.py's module globals (``from config import *``), so a
+variant such as a higher ``inflation_rate`` meant editing config.py or
+re-importing it with patched globals, one variant per process. A
+``ModelConfig`` is a value instead: the config_data.py data plus any
+overrides, frozen, with its derived totals computed from its own data.
+
+    from model_config import default_config
+    cfg = default_config()
+    high = cfg.replace(inflation_rate=0.03, **{'enrollment_boost.PASSHE': 0.20})
+    high.inflation_rate, high.total_pa_residents
+
+The engines take it as ``cfg`` (``project_free_college(cfg=high)``,
+``simulate_free_college(..., cfg=high)``, ``PhaseContext(config=high)``), so
+any number of configs can be evaluated side by side in one process, and
+``cfg.digest`` keys caches of their results. Derived totals are the
+``_name()`` functions of config_data.py evaluated against the config's own
+values, so there is one definition of each.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import pickle
+import threading
+import types
+
+import config_data
+
+
+class FrozenDict(dict):
+    """A dict that refuses modification (config values are shared between configs)."""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("ModelConfig values are read-only; use cfg.replace(...)")
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = _readonly
+    __ior__ = _readonly
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+def freeze(value):
+    """Read-only copy: dicts -> FrozenDict, lists -> tuples, sets -> frozensets, recursively."""
+    if isinstance(value, dict):
+        return FrozenDict((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+def _is_data(value):
+    return not callable(value) and not isinstance(value, (logging.Logger, types.ModuleType))
+
+
+class ModelConfig:
+    """config_data.py values plus overrides, immutable, with lazily derived totals.
+
+    Attributes are the config names (``cfg.inflation_rate``,
+    ``cfg.total_economic_impact``). Dicts come back as read-only
+    ``FrozenDict`` and lists as tuples. Two configs with the same values
+    have the same ``digest`` and compare equal, however they were overridden.
+    """
+
+    __slots__ = ('_values', '_overrides', '_derived', '_digest', '_lock')
+
+    def __init__(self, values, overrides=()):
+        object.__setattr__(self, '_values', values)
+        object.__setattr__(self, '_overrides', tuple(overrides))
+        object.__setattr__(self, '_derived', {})
+        object.__setattr__(self, '_digest', None)
+        object.__setattr__(self, '_lock', threading.RLock())
+
+    @classmethod
+    def from_module(cls, module=config_data):
+        """The configuration defined by ``module`` (config_data.py) with no overrides."""
+        values = {n: freeze(getattr(module, n)) for n in module.__all__
+                  if n not in module.DERIVED and _is_data(getattr(module, n))}
+        return cls(values)
+
+    # ── Attribute access ──────────────────────────────────────────────────────
+
+    def __getattr__(self, name):
+        values = object.__getattribute__(self, '_values')
+        if name in values:
+            return values[name]
+        if name in config_data.DERIVED:
+            return self._derive(name)
+        raise AttributeError(f"ModelConfig has no value {name!r}")
+
+    def _derive(self, name):
+        derived = self._derived
+        if name not in derived:
+            # Reentrant: a derived total may read other derived totals via _value()
+            with self._lock:
+                if name not in derived:
+                    namespace = dict(self._values)
+                    namespace['_value'] = self._derive
+                    fn = config_data.DERIVED[name]
+                    rebound = types.FunctionType(fn.__code__, namespace, fn.__name__)
+                    derived[name] = freeze(rebound())
+        return derived[name]
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ModelConfig is immutable; use cfg.replace(...)")
+
+    def __delattr__(self, name):
+        raise AttributeError("ModelConfig is immutable; use cfg.replace(...)")
+
+    def __dir__(self):
+        return sorted(set(self._values) | set(config_data.DERIVED))
+
+    # ── Overrides ─────────────────────────────────────────────────────────────
+
+    def replace(self, **overrides):
+        """A new config with ``overrides`` applied; this one is unchanged.
+
+        A key is a config name or a dotted path into one of its dicts
+        (``'enrollment_boost.PASSHE'``, passed with ``**{...}``). Derived
+        totals cannot be set; they follow from the data they are computed from.
+        """
+        values = dict(self._values)
+        merged = dict(self._overrides)
+        for path, value in overrides.items():
+            name, *keys = path.split('.')
+            if name in config_data.DERIVED:
+                raise ValueError(f"{name} is derived from other config values; override those instead")
+            if name not in values:
+                raise ValueError(f"unknown config symbol {name!r}")
+            if keys:
+                root = copy.deepcopy(thaw(values[name]))
+                target = root
+                for key in keys:
+                    if not isinstance(target, dict) or key not in target:
+                        raise ValueError(f"{path}: {key!r} not found in {name}")
+                    parent, target = target, target[key]
+                parent[keys[-1]] = value
+                values[name] = freeze(root)
+            else:
+                values[name] = freeze(value)
+            merged[path] = value
+        return ModelConfig(values, sorted(merged.items()))
+
+    @property
+    def overrides(self):
+        """{path: value} applied on top of config_data.py, in path order."""
+        return dict(self._overrides)
+
+    # ── Identity ──────────────────────────────────────────────────────────────
+
+    @property
+    def digest(self):
+        """Content hash of the effective values (a no-op override keeps the digest)."""
+        if self._digest is None:
+            values = self._values
+            payload = pickle.dumps([(n, thaw(values[n])) for n in sorted(values)], protocol=4)
+            object.__setattr__(self, '_digest', hashlib.sha256(payload).hexdigest()[:16])
+        return self._digest
+
+    def __eq__(self, other):
+        return isinstance(other, ModelConfig) and self.digest == other.digest
+
+    def __hash__(self):
+        return hash(self.digest)
+
+    def __repr__(self):
+        shown = ', '.join(f'{k}={v!r}' for k, v in self._overrides)
+        return f"ModelConfig({shown})"
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        # Rebuilt from the receiving process's config_data.py plus the overrides
+        return (_from_overrides, (self._overrides,))
+
+
+def thaw(value):
+    """Plain copy of a frozen value: FrozenDict -> dict, tuples -> lists, recursively."""
+    if isinstance(value, dict):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(v) for v in value]
+    return value
+
+
+def derived_inputs(name):
+    """Data names the derived total ``name`` is computed from, through any other totals it reads."""
+    data, seen, todo = set(), set(), [name]
+    while todo:
+        current = todo.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        codes = [config_data.DERIVED[current].__code__]
+        while codes:
+            code = codes.pop()
+            for const in code.co_consts:
+                if isinstance(const, types.CodeType):
+                    codes.append(const)
+                elif isinstance(const, str) and const in config_data.DERIVED:
+                    todo.append(const)        # _value('other_total')
+            data.update(n for n in code.co_names if n not in config_data.DERIVED)
+    return data & set(default_config()._values)
+
+
+def _from_overrides(overrides):
+    cfg = default_config()
+    return cfg.replace(**dict(overrides)) if overrides else cfg
+
+
+_default = None
+# JSON {path: value} overrides for the phases' config (set by run_all.py --set)
+OVERRIDES_ENV = 'PA_ECON_OVERRIDES'
+
+
+def default_config():
+    """The shared no-override ``ModelConfig`` for this process."""
+    global _default
+    if _default is None:
+        _default = ModelConfig.from_module()
+    return _default
+
+
+def environ_config(environ=None):
+    """``default_config()`` plus the overrides in ``$PA_ECON_OVERRIDES``, if set.
+
+    ``context.shared`` starts from this config, so a phase run by
+    ``run_all.py --set ...`` (in process, on a --jobs worker or as an
+    --isolated subprocess) or directly with the variable set reads the variant.
+    """
+    raw = (os.environ if environ is None else environ).get(OVERRIDES_ENV, '')
+    if not raw.strip():
+        return default_config()
+    try:
+        overrides = json.loads(raw)
+    except ValueError as e:
+        raise ValueError(f"${OVERRIDES_ENV} is not valid JSON: {e}") from None
+    if not isinstance(overrides, dict):
+        raise ValueError(f"${OVERRIDES_ENV} must be a JSON object of {{path: value}}")
+    return default_config().replace(**overrides)
@@ -0,0 +1,229 @@
+"""Monte Carlo samplers shared by the phase files.
+
+Joint impact engine (Phase 2)
+-----------------------------
+``param_distributions`` gives a normal (mean, sd) for five parameters.
+``propagate_impacts`` pushes every draw of all five through the Phase 2/3
+impact formulas at once. Each parameter scales the quantities it governs
+relative to its point value:
+
+    enrollment      total_enrollment_all x (1 + elasticity x baseline tuition change)
+                    x retention_rate / mean retention
+    student spend   enrollment x student_spending x 0.65
+    multiplier      output_multiplier / RIMS II output multiplier, applied to the
+                    payroll, student, research and construction multipliers
+    jobs            direct + (indirect + induced) x employment_multiplier / RIMS II
+    impact, taxes   the economic_impact_components sum, x 0.04 for taxes, / appropriation for ROI
+
+With every draw at its mean this gives the config.py point estimates, apart
+from the small enrollment effect of the elasticity. ``joint_monte_carlo``
+draws the parameters batch by batch from a seeded ``np.random.Generator``, so
+millions of draws run in bounded memory; Phase 2 uses it for
+``PA_ECON_JOINT_DRAWS=N`` instead of the shared ``MONTE_CARLO_SIMULATIONS``
+draws.
+
+Correlated sampler (Phase 8.4)
+------------------------------
+Phase 8.4's correlated Monte Carlo draws an economic state (Expansion,
+Normal, Recession) for every simulation and shifts the output multiplier,
+student spending and enrollment with it. The original implementation was a
+Python loop: per simulation, a walk over ``economic_states`` to pick the
+state and four scalar ``np.random`` calls. Here it is one pass over arrays:
+
+    state[k]        searchsorted(cumulative probabilities, u[k])
+    multiplier[k]   N(output_multiplier x (1 + multiplier_shift[state[k]]), 0.10)
+    spending[k]     N(avg_student_spending x (1 + spending_shift[state[k]]), 1000)
+    enrollment[k]   1 + N(enrollment_shift[state[k]], 0.01)
+    impact[k]       base_direct_spending x enrollment[k] x max(multiplier[k], 0.5)
+
+The vectorized sampler uses its own ``np.random.Generator``, so its draws
+differ from the loop's even with the same seed; the distribution is the same.
+``legacy=True`` runs the original loop on the global RNG to reproduce the
+numbers published before the rewrite.
+
+Usage from a phase file:
+
+    from montecarlo import correlated_monte_carlo
+    draws = correlated_monte_carlo(MONTE_CARLO_SIMULATIONS, seed=RANDOM_SEED + 1)
+    correlated_impacts = draws['impact']
+"""
+
+import numpy as np
+
+from model_config import default_config
+
+MULTIPLIER_SD = 0.10        # output multiplier
+SPENDING_SD = 1000          # per-student spending ($)
+ENROLLMENT_SD = 0.01        # enrollment factor
+MULTIPLIER_FLOOR = 0.5
+BATCH_SIZE = 1_000_000      # joint_monte_carlo draws per batch
+
+# headline outputs of propagate_impacts, in reporting order, with display units
+IMPACT_OUTPUTS = (
+    ('direct_impact', 'Direct x output multiplier ($B)', 1e9),
+    ('payroll_impact', 'Payroll impact ($B)', 1e9),
+    ('student_spending_impact', 'Student spending impact ($B)', 1e9),
+    ('research_impact', 'Research impact ($B)', 1e9),
+    ('total_economic_impact', 'Total economic impact ($B)', 1e9),
+    ('jobs_supported', 'Jobs supported (thousands)', 1e3),
+    ('tax_revenue', 'State & local tax revenue ($B)', 1e9),
+    ('roi_ratio', 'ROI ($ per $1 appropriated)', 1),
+)
+
+
+def propagate_impacts(draws, cfg=None):
+    """Headline Phase 2/3 outputs for every draw: {output name: array}.
+
+    ``draws`` maps the ``param_distributions`` names to equal-length arrays,
+    e.g. a batch of ``joint_monte_carlo`` or the ``simulation_results`` of
+    ``context.shared.monte_carlo()``. Point values come from ``cfg``
+    (a ``ModelConfig``, default: config.py's values).
+    """
+    cfg = default_config() if cfg is None else cfg
+    output_scale = draws['output_multiplier'] / cfg.rims_ii_multipliers['output_multiplier']
+    employment_scale = draws['employment_multiplier'] / cfg.rims_ii_multipliers['employment_multiplier']
+    tuition_change = cfg.policy_scenarios['Baseline']['tuition_change']
+    enrollment = (cfg.total_enrollment_all * (1 + draws['enrollment_elasticity'] * tuition_change)
+                  * draws['retention_rate'] / cfg.param_distributions['retention_rate'][0])
+
+    payroll_impact = cfg.total_payroll * cfg.spending_multipliers['payroll'] * output_scale
+    student_spending_impact = (enrollment * draws['student_spending'] * 0.65
+                               * cfg.spending_multipliers['student'] * output_scale)
+    research_impact = cfg.total_research * cfg.spending_multipliers['research'] * output_scale
+    construction_impact = cfg.economic_impact_components['construction_impact'] * output_scale
+    total_impact = (cfg.economic_impact_components['institutional_spending'] + payroll_impact
+                    + student_spending_impact + research_impact + construction_impact)
+    return {
+        'direct_impact': cfg.base_direct_spending * draws['output_multiplier'],
+        'enrollment': enrollment,
+        'payroll_impact': payroll_impact,
+        'student_spending_impact': student_spending_impact,
+        'research_impact': research_impact,
+        'construction_impact': construction_impact,
+        'total_economic_impact': total_impact,
+        'jobs_supported': cfg.total_direct_employment + (cfg.indirect_employment + cfg.induced_employment) * employment_scale,
+        'tax_revenue': total_impact * 0.04,
+        'roi_ratio': total_impact / cfg.total_state_appropriation,
+    }
+
+
+def joint_monte_carlo(n_sims, seed, batch_size=BATCH_SIZE, distributions=None, cfg=None):
+    """Draw all parameters jointly and propagate them, ``batch_size`` draws at a time.
+
+    Returns ``(draws, outputs)``, dicts of length-``n_sims`` arrays. All
+    batches come from one random stream, so a given ``seed`` and
+    ``batch_size`` always reproduce the same draws.
+    """
+    cfg = default_config() if cfg is None else cfg
+    distributions = cfg.param_distributions if distributions is None else distributions
+    rng = np.random.default_rng(seed)
+    draws = {param: np.empty(n_sims) for param in distributions}
+    outputs = None
+    for start in range(0, n_sims, batch_size):
+        stop = min(start + batch_size, n_sims)
+        batch = {param: rng.normal(mean, sd, stop - start)
+                 for param, (mean, sd) in distributions.items()}
+        batch_outputs = propagate_impacts(batch, cfg)
+        if outputs is None:
+            outputs = {name: np.empty(n_sims) for name in batch_outputs}
+        for param, values in batch.items():
+            draws[param][start:stop] = values
+        for name, values in batch_outputs.items():
+            outputs[name][start:stop] = values
+    return draws, outputs
+
+
+def summarize(outputs, names=None):
+    """Rows of mean, sd and percentiles (2.5, 5, 50, 95, 97.5) for each output."""
+    rows = []
+    for name in (names or list(outputs)):
+        values = outputs[name]
+        p = np.percentile(values, [2.5, 5, 50, 95, 97.5])
+        rows.append({'output': name, 'mean': float(np.mean(values)), 'std': float(np.std(values)),
+                     'p2_5': float(p[0]), 'p5': float(p[1]), 'p50': float(p[2]),
+                     'p95': float(p[3]), 'p97_5': float(p[4])})
+    return rows
+
+
+def correlated_monte_carlo(n_sims, seed, states=None, legacy=False, cfg=None):
+    """Draw ``n_sims`` recession-aware simulations.
+
+    Returns a dict of arrays: ``state`` (index into ``state_names``),
+    ``multiplier``, ``spending``, ``enrollment_factor`` and ``impact``, plus
+    ``state_names``. ``states`` defaults to ``economic_states``; a state is
+    picked with its ``probability`` and any shortfall from 1 goes to 'Normal'.
+    """
+    cfg = default_config() if cfg is None else cfg
+    states = cfg.economic_states if states is None else states
+    if legacy:
+        return _correlated_loop(n_sims, seed, states, cfg)
+
+    names = list(states)
+    cumulative = np.cumsum([states[s]['probability'] for s in names])
+    multiplier_mean = np.array([cfg.rims_ii_multipliers['output_multiplier'] * (1 + states[s]['multiplier_shift'])
+                                for s in names])
+    spending_mean = np.array([cfg.avg_student_spending * (1 + states[s]['spending_shift']) for s in names])
+    enrollment_mean = np.array([states[s]['enrollment_shift'] for s in names])
+
+    rng = np.random.default_rng(seed)
+    state = np.searchsorted(cumulative, rng.random(n_sims), side='right')
+    state[state == len(names)] = names.index('Normal')       # probabilities summing to < 1
+
+    multiplier = multiplier_mean[state]
+    multiplier += MULTIPLIER_SD * rng.standard_normal(n_sims)
+    spending = spending_mean[state]
+    spending += SPENDING_SD * rng.standard_normal(n_sims)
+    enrollment_factor = enrollment_mean[state]
+    enrollment_factor += ENROLLMENT_SD * rng.standard_normal(n_sims)
+    enrollment_factor += 1
+
+    impact = cfg.base_direct_spending * enrollment_factor
+    impact *= np.maximum(multiplier, MULTIPLIER_FLOOR)
+    return {'state_names': names, 'state': state, 'multiplier': multiplier, 'spending': spending,
+            'enrollment_factor': enrollment_factor, 'impact': impact}
+
+
+def _correlated_loop(n_sims, seed, states, cfg):
+    """The original Phase 8.4 loop (global RNG), kept for reproducing old results."""
+    np.random.seed(seed)
+    names = list(states)
+    state_index = np.zeros(n_sims, dtype=np.int64)
+    multiplier = np.zeros(n_sims)
+    spending = np.zeros(n_sims)
+    enrollment_factor = np.zeros(n_sims)
+    correlated_impacts = np.zeros(n_sims)
+
+    for i in range(n_sims):
+        r = np.random.random()
+        cumulative_prob = 0
+        state = 'Normal'
+        for state_name, params in states.items():
+            cumulative_prob += params['probability']
+            if r < cumulative_prob:
+                state = state_name
+                break
+
+        state_params = states[state]
+
+        sim_multiplier = np.random.normal(
+            cfg.rims_ii_multipliers['output_multiplier'] * (1 + state_params['multiplier_shift']),
+            MULTIPLIER_SD
+        )
+        sim_spending = np.random.normal(
+            cfg.avg_student_spending * (1 + state_params['spending_shift']),
+            SPENDING_SD
+        )
+        sim_enrollment_factor = 1 + np.random.normal(
+            state_params['enrollment_shift'],
+            ENROLLMENT_SD
+        )
+
+        sim_direct = cfg.base_direct_spending * sim_enrollment_factor
+        correlated_impacts[i] = sim_direct * max(sim_multiplier, MULTIPLIER_FLOOR)
+        state_index[i] = names.index(state)
+        multiplier[i] = sim_multiplier
+        spending[i] = sim_spending
+        enrollment_factor[i] = sim_enrollment_factor
+
+    return {'state_names': names, 'state': state_index, 'multiplier': multiplier, 'spending': spending,
+            'enrollment_factor': enrollment_factor, 'impact': correlated_impacts}
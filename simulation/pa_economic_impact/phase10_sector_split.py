@@ -1,5 +1,9 @@
 import sys, os; sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from config import *
+from context import shared
+
+# Model inputs come from the run's config; the star import is kept for display helpers
+cfg = shared.config
 
 # =============================================================================
 # PHASE 10: SECTOR-SPLIT OUTPUT — CC vs FOUR-YEAR INSTITUTIONS
@@ -12,7 +16,7 @@ print("=" * 80)
 sector_results = {}
 
 for sector_label in ['two_year', 'four_year']:
-    sector_insts = [inst for inst, st in sector_type.items() if st == sector_label]
+    sector_insts = [inst for inst, st in cfg.sector_type.items() if st == sector_label]
 
     cum_state_cost = 0
     cum_new_grads = 0
@@ -21,17 +25,17 @@ for sector_label in ['two_year', 'four_year']:
     annual_data_sector = []
 
     for i in range(40):
-        year = start_year + i
-        cpi_factor = (1 + inflation_rate) ** (year - INFLATION_BASE_YEAR)
-        tuition_factor = (1 + tuition_growth_rate) ** (year - start_year)
-        wage_factor = (1 + wage_growth_real) ** (year - start_year)
+        year = cfg.start_year + i
+        cpi_factor = (1 + cfg.inflation_rate) ** (year - cfg.INFLATION_BASE_YEAR)
+        tuition_factor = (1 + cfg.tuition_growth_rate) ** (year - cfg.start_year)
+        wage_factor = (1 + cfg.wage_growth_real) ** (year - cfg.start_year)
 
         annual_cost = 0
         annual_new_enrollment = 0
         for inst in sector_insts:
-            data = pa_resident_enrollment[inst]
+            data = cfg.pa_resident_enrollment[inst]
             pa_students = int(data['total'] * data['in_state_pct'])
-            boost = enrollment_boost.get(inst, 0.10)
+            boost = cfg.enrollment_boost.get(inst, 0.10)
             ramp = min(1.0, 0.5 + 0.25 * i) if i < 2 else 1.0
             new_students = int(pa_students * boost * ramp)
             total_students = pa_students + new_students
@@ -48,14 +52,14 @@ for sector_label in ['two_year', 'four_year']:
 
         if i >= grad_lag:
             for inst in sector_insts:
-                data = pa_resident_enrollment[inst]
-                boost_students = int(data['total'] * data['in_state_pct'] * enrollment_boost.get(inst, 0.10))
-                new_grads += int(boost_students * completion_rates[completion_key])
+                data = cfg.pa_resident_enrollment[inst]
+                boost_students = int(data['total'] * data['in_state_pct'] * cfg.enrollment_boost.get(inst, 0.10))
+                new_grads += int(boost_students * cfg.completion_rates[completion_key])
 
         cum_new_grads += new_grads
-        annual_earnings = new_grads * (lifetime_earnings_premium[earnings_key] / 40) * wage_factor
+        annual_earnings = new_grads * (cfg.lifetime_earnings_premium[earnings_key] / 40) * wage_factor
         cum_earnings += annual_earnings
-        cum_tax += annual_earnings * pa_state_income_tax
+        cum_tax += annual_earnings * cfg.pa_state_income_tax
 
         annual_data_sector.append({
             'year': year, 'state_cost_real': annual_cost / cpi_factor,
@@ -125,7 +129,7 @@ try:
                                   ('four_year', '#F18F01', 'Four-Year')]:
         years_s = [d['year'] for d in sector_results[sector]['annual_data']]
         cum_cost_s = np.cumsum([d['state_cost_real'] for d in sector_results[sector]['annual_data']])
-        cum_tax_s = np.cumsum([d['earnings_gain'] * pa_state_income_tax for d in sector_results[sector]['annual_data']])
+        cum_tax_s = np.cumsum([d['earnings_gain'] * cfg.pa_state_income_tax for d in sector_results[sector]['annual_data']])
         roi_traj = cum_tax_s / np.maximum(cum_cost_s, 1)
         ax2.plot(years_s, roi_traj, linewidth=2, color=color, label=label)
 
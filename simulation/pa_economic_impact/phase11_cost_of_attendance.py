@@ -1,5 +1,9 @@
 import sys, os; sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from config import *
+from context import shared
+
+# Model inputs come from the run's config; the star import is kept for display helpers
+cfg = shared.config
 
 # =============================================================================
 # PHASE 11: FULL COST OF ATTENDANCE (COA) MODELING
@@ -11,10 +15,10 @@ print("Non-tuition costs: housing, food, transportation, books")
 print("=" * 80)
 
 print(f"\nNon-Tuition Cost of Attendance:")
-print(f"  Four-Year: ${non_tuition_coa['four_year']['total']:,}/year")
-print(f"  Two-Year:  ${non_tuition_coa['two_year']['total']:,}/year")
-print(f"  Pell-Eligible Share: {pell_share*100:.0f}%")
-print(f"  Stipend Coverage Rate: {coa_stipend_coverage*100:.0f}%")
+print(f"  Four-Year: ${cfg.non_tuition_coa['four_year']['total']:,}/year")
+print(f"  Two-Year:  ${cfg.non_tuition_coa['two_year']['total']:,}/year")
+print(f"  Pell-Eligible Share: {cfg.pell_share*100:.0f}%")
+print(f"  Stipend Coverage Rate: {cfg.coa_stipend_coverage*100:.0f}%")
 
 # 11.2 Run COA-adjusted simulation (40-year)
 cum_tuition_only_cost = 0
@@ -22,17 +26,17 @@ cum_coa_stipend_cost = 0
 cum_total_coa_cost = 0
 
 for i in range(40):
-    year = start_year + i
-    cpi_factor = (1 + inflation_rate) ** (year - INFLATION_BASE_YEAR)
-    tuition_factor = (1 + tuition_growth_rate) ** (year - start_year)
+    year = cfg.start_year + i
+    cpi_factor = (1 + cfg.inflation_rate) ** (year - cfg.INFLATION_BASE_YEAR)
+    tuition_factor = (1 + cfg.tuition_growth_rate) ** (year - cfg.start_year)
 
     annual_tuition_cost = 0
     annual_coa_stipend = 0
     annual_emergency_cost = 0
 
-    for inst, data in pa_resident_enrollment.items():
+    for inst, data in cfg.pa_resident_enrollment.items():
         pa_students = int(data['total'] * data['in_state_pct'])
-        boost = enrollment_boost.get(inst, 0.10)
+        boost = cfg.enrollment_boost.get(inst, 0.10)
         ramp = min(1.0, 0.5 + 0.25 * i) if i < 2 else 1.0
         new_students = int(pa_students * boost * ramp)
         total_students = pa_students + new_students
@@ -42,14 +46,14 @@ for i in range(40):
         annual_tuition_cost += total_students * tuition_adjusted
 
         # COA stipend for Pell students
-        sector = sector_type[inst]
-        coa_amount = non_tuition_coa[sector]['total'] * cpi_factor
-        pell_students = int(total_students * pell_share)
-        annual_coa_stipend += pell_students * coa_amount * coa_stipend_coverage
+        sector = cfg.sector_type[inst]
+        coa_amount = cfg.non_tuition_coa[sector]['total'] * cpi_factor
+        pell_students = int(total_students * cfg.pell_share)
+        annual_coa_stipend += pell_students * coa_amount * cfg.coa_stipend_coverage
 
         # Emergency grants
-        emergency_students = int(pell_students * emergency_grant_eligibility)
-        annual_emergency_cost += emergency_students * emergency_grant_per_student * cpi_factor
+        emergency_students = int(pell_students * cfg.emergency_grant_eligibility)
+        annual_emergency_cost += emergency_students * cfg.emergency_grant_per_student * cpi_factor
 
     cum_tuition_only_cost += annual_tuition_cost / cpi_factor
     cum_coa_stipend_cost += annual_coa_stipend / cpi_factor
@@ -57,9 +61,9 @@ for i in range(40):
 
 # Additional graduates from emergency grants
 emergency_additional_grads_40yr = int(
-    total_pa_residents * pell_share * emergency_grant_eligibility * completion_boost_emergency * 40
+    cfg.total_pa_residents * cfg.pell_share * cfg.emergency_grant_eligibility * cfg.completion_boost_emergency * 40
 )
-emergency_additional_earnings = emergency_additional_grads_40yr * lifetime_earnings_premium['bachelor'] / 2
+emergency_additional_earnings = emergency_additional_grads_40yr * cfg.lifetime_earnings_premium['bachelor'] / 2
 emergency_total_cost_40yr = cum_total_coa_cost - cum_tuition_only_cost - cum_coa_stipend_cost
 
 print(f"\n--- 40-YEAR COST COMPARISON ---")
@@ -1,5 +1,9 @@
 import sys, os; sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from config import *
+from context import shared
+
+# Model inputs come from the run's config; the star import is kept for display helpers
+cfg = shared.config
 
 # =============================================================================
 # PHASE 13: COUNTER-CYCLICAL FEDERAL MATCHING (up to 9:1 during recessions)
@@ -9,25 +13,25 @@ print("PHASE 13: COUNTER-CYCLICAL FEDERAL MATCHING")
 print("Dynamic 9:1 match during recessions, base ratio otherwise")
 print("=" * 80)
 
-print(f"\nProjected recession years: {sorted(recession_year_set)}")
-print(f"Recession ratio: {recession_ratio}:1")
+print(f"\nProjected recession years: {sorted(cfg.recession_year_set)}")
+print(f"Recession ratio: {cfg.recession_ratio}:1")
 
 dynamic_match_results = {}
 
-for base_ratio in base_ratios:
+for base_ratio in cfg.base_ratios:
     cum_state_cost_dm = 0
     cum_federal_static = 0
     cum_federal_dynamic = 0
 
     for i in range(40):
-        year = start_year + i
-        cpi_factor = (1 + inflation_rate) ** (year - INFLATION_BASE_YEAR)
-        tuition_factor = (1 + tuition_growth_rate) ** (year - start_year)
+        year = cfg.start_year + i
+        cpi_factor = (1 + cfg.inflation_rate) ** (year - cfg.INFLATION_BASE_YEAR)
+        tuition_factor = (1 + cfg.tuition_growth_rate) ** (year - cfg.start_year)
 
         annual_state_cost = 0
-        for inst, data in pa_resident_enrollment.items():
+        for inst, data in cfg.pa_resident_enrollment.items():
             pa_students = int(data['total'] * data['in_state_pct'])
-            boost = enrollment_boost.get(inst, 0.10)
+            boost = cfg.enrollment_boost.get(inst, 0.10)
             ramp = min(1.0, 0.5 + 0.25 * i) if i < 2 else 1.0
             new_students = int(pa_students * boost * ramp)
             total_students = pa_students + new_students
@@ -41,7 +45,7 @@ for base_ratio in base_ratios:
         cum_federal_static += annual_real * base_ratio
 
         # Dynamic match (9:1 during recessions)
-        current_ratio = recession_ratio if year in recession_year_set else base_ratio
+        current_ratio = cfg.recession_ratio if year in cfg.recession_year_set else base_ratio
         cum_federal_dynamic += annual_real * current_ratio
 
     dynamic_match_results[base_ratio] = {
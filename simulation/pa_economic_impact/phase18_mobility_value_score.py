@@ -1,5 +1,9 @@
 import sys, os; sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from config import *
+from context import shared
+
+# Model inputs come from the run's config; the star import is kept for display helpers
+cfg = shared.config
 
 # =============================================================================
 # PHASE 18: MOBILITY VALUE SCORE (MVS) & COMPLETION GAP METRICS
@@ -13,12 +17,12 @@ print(f"\n{'Institution':<30} {'Pell%':>6} {'Comp%':>6} {'MVS':>6} {'Comp Gap':>
 print("-" * 78)
 
 mvs_rows = []
-for inst, data in institution_mvs_data.items():
+for inst, data in cfg.institution_mvs_data.items():
     # MVS = Pell share x completion rate x earnings premium factor (scaled 0-100)
     mvs = data['pell_share'] * data['completion_rate'] * data['earnings_premium_factor'] * 100
 
     # Expected completion rate given Pell share
-    expected_completion = national_avg_completion * (1 - data['pell_share'] * pell_completion_penalty)
+    expected_completion = cfg.national_avg_completion * (1 - data['pell_share'] * cfg.pell_completion_penalty)
     completion_gap = data['completion_rate'] - expected_completion  # Positive = outperforming
 
     # Mobility bonus eligibility
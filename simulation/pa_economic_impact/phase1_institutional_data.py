@@ -9,6 +9,10 @@ Sources:
 
 import sys, os; sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from config import *
+from context import shared
+
+# Model inputs come from the run's config; the star import is kept for display helpers
+cfg = shared.config
 
 # ============================================================================
 # PHASE 1: ACTUAL INSTITUTIONAL DATA
@@ -23,7 +27,7 @@ print("=" * 80)
 # -----------------------------------------------------------------------------
 
 # Validate state-related data
-for name, data in state_related_universities.items():
+for name, data in cfg.state_related_universities.items():
     validate_positive(data['enrollment'], f"{name} enrollment")
     validate_positive(data['state_appropriation'], f"{name} appropriation")
     if data['research_expenditures'] > data['operating_budget']:
@@ -34,8 +38,8 @@ for name, data in state_related_universities.items():
 # Source: passhe.edu enrollment reports
 # -----------------------------------------------------------------------------
 
-print(f"\nPASSHE System Total Enrollment (Fall 2025): {passhe_total_enrollment:,}")
-print(f"PASSHE System Total Employees: {passhe_total_employees:,}")
+print(f"\nPASSHE System Total Enrollment (Fall 2025): {cfg.passhe_total_enrollment:,}")
+print(f"PASSHE System Total Employees: {cfg.passhe_total_employees:,}")
 print(f"PASSHE Retention Rate: 81% (record high, above national average)")
 print(f"PASSHE In-State Students: 89%")
 
@@ -44,8 +48,8 @@ print(f"PASSHE In-State Students: 89%")
 # Source: collegetuitioncompare.com, pacommunitycolleges.org
 # -----------------------------------------------------------------------------
 
-print(f"\nCommunity College Total Enrollment: {cc_total_enrollment:,}")
-print(f"Community College Total Employees: {cc_total_employees:,}")
+print(f"\nCommunity College Total Enrollment: {cfg.cc_total_enrollment:,}")
+print(f"Community College Total Employees: {cfg.cc_total_employees:,}")
 
 # -----------------------------------------------------------------------------
 # 1.4 RESEARCH EXPENDITURES DETAIL
@@ -54,6 +58,6 @@ print("\n" + "-" * 60)
 print("RESEARCH EXPENDITURES (FY 2024-25)")
 print("-" * 60)
 
-print(f"Total PA State-Related Research: ${total_research/1e9:.2f}B")
-for name, data in research_data.items():
+print(f"Total PA State-Related Research: ${cfg.total_research/1e9:.2f}B")
+for name, data in cfg.research_data.items():
     print(f"  {name}: ${data['total']/1e9:.2f}B")
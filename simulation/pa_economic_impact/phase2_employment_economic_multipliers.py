@@ -5,10 +5,20 @@ Sources:
 - BEA RIMS II Multipliers (bea.gov)
 - BLS Employment Data (bls.gov)
 - Havranek et al. (2018) tuition elasticity meta-analysis
+
+Usage:
+    python phase2_employment_economic_multipliers.py
+    PA_ECON_JOINT_DRAWS=10000000 python phase2_employment_economic_multipliers.py
+        # joint uncertainty from 10M fresh draws instead of the shared ones
 """
 
 import sys, os; sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from config import *
+from context import shared
+from montecarlo import IMPACT_OUTPUTS, joint_monte_carlo, propagate_impacts, summarize
+
+# Model inputs come from the run's config; the star import is kept for display helpers
+cfg = shared.config
 
 # ============================================================================
 # PHASE 2: EMPLOYMENT, OFF-CAMPUS SPENDING & ECONOMIC MULTIPLIERS
@@ -19,24 +29,24 @@ print("=" * 80)
 
 # BEA RIMS II Multipliers display
 print(f"\nRIMS II Multipliers (PA-specific):")
-print(f"  Output: {rims_ii_multipliers['output_multiplier']}x")
-print(f"  Employment: {rims_ii_multipliers['employment_multiplier']} jobs per $1M")
-print(f"  Earnings: {rims_ii_multipliers['earnings_multiplier']}x")
+print(f"  Output: {cfg.rims_ii_multipliers['output_multiplier']}x")
+print(f"  Employment: {cfg.rims_ii_multipliers['employment_multiplier']} jobs per $1M")
+print(f"  Earnings: {cfg.rims_ii_multipliers['earnings_multiplier']}x")
 
 # Employment by Sector
 print(f"\nEmployment by Sector:")
-print(f"  Total Direct Employment: {total_direct_employment:,}")
-print(f"  Total Annual Payroll: ${total_payroll/1e9:.2f}B")
+print(f"  Total Direct Employment: {cfg.total_direct_employment:,}")
+print(f"  Total Annual Payroll: ${cfg.total_payroll/1e9:.2f}B")
 
 # Indirect/induced employment
 print(f"\nTotal Jobs Supported:")
-print(f"  Direct: {total_direct_employment:,}")
-print(f"  Indirect: {indirect_employment:,}")
-print(f"  Induced: {induced_employment:,}")
-print(f"  TOTAL: {total_jobs_supported:,}")
+print(f"  Direct: {cfg.total_direct_employment:,}")
+print(f"  Indirect: {cfg.indirect_employment:,}")
+print(f"  Induced: {cfg.induced_employment:,}")
+print(f"  TOTAL: {cfg.total_jobs_supported:,}")
 
 # Student Off-Campus Spending
-print(f"\nTotal Student Off-Campus Spending: ${total_student_spending/1e9:.2f}B")
+print(f"\nTotal Student Off-Campus Spending: ${cfg.total_student_spending/1e9:.2f}B")
 
 # -----------------------------------------------------------------------------
 # 2.4 SENSITIVITY ANALYSIS (Monte Carlo Framework)
@@ -45,19 +55,36 @@ print("\n" + "-" * 60)
 print("SENSITIVITY ANALYSIS")
 print("-" * 60)
 
-np.random.seed(RANDOM_SEED)
-
-simulation_results = {}
-for param, (mean, std) in param_distributions.items():
-    simulation_results[param] = np.random.normal(mean, std, MONTE_CARLO_SIMULATIONS)
-
-impact_distribution = base_direct_spending * simulation_results['output_multiplier']
+# Draws seeded with RANDOM_SEED (shared with Phases 5 and 8 via context.py)
+simulation_results, impact_distribution = shared.monte_carlo()
 
-print(f"Economic Impact Uncertainty (n={MONTE_CARLO_SIMULATIONS:,} simulations):")
+print(f"Economic Impact Uncertainty (n={cfg.MONTE_CARLO_SIMULATIONS:,} simulations):")
 print(f"  Mean: ${np.mean(impact_distribution)/1e9:.2f}B")
 print(f"  Std Dev: ${np.std(impact_distribution)/1e9:.2f}B")
 print(f"  95% CI: ${np.percentile(impact_distribution, 2.5)/1e9:.2f}B - ${np.percentile(impact_distribution, 97.5)/1e9:.2f}B")
 
+# Joint propagation: the same draws of all five parameters through the impact formulas,
+# or PA_ECON_JOINT_DRAWS fresh draws of them (batched, for runs beyond memory)
+joint_draws = int(os.environ.get('PA_ECON_JOINT_DRAWS', '') or 0)
+if joint_draws > 0:
+    _, joint_outputs = joint_monte_carlo(joint_draws, seed=cfg.RANDOM_SEED, cfg=cfg)
+else:
+    joint_draws = cfg.MONTE_CARLO_SIMULATIONS
+    joint_outputs = propagate_impacts(simulation_results, cfg=cfg)
+joint_summary = summarize(joint_outputs, [name for name, _, _ in IMPACT_OUTPUTS])
+
+print(f"\nJoint Uncertainty, all {len(cfg.param_distributions)} parameters (n={joint_draws:,}):")
+print(f"  {'Output':<34} {'Mean':>9} {'Std Dev':>9} {'2.5%':>9} {'97.5%':>9}")
+print("  " + "-" * 74)
+for (name, label, unit), row in zip(IMPACT_OUTPUTS, joint_summary):
+    print(f"  {label:<34} {row['mean']/unit:>9.2f} {row['std']/unit:>9.2f} "
+          f"{row['p2_5']/unit:>9.2f} {row['p97_5']/unit:>9.2f}")
+
+df_joint = pd.DataFrame(joint_summary)
+df_joint.insert(1, 'label', [label for _, label, _ in IMPACT_OUTPUTS])
+df_joint.to_csv(OUTPUT_DIR / 'monte_carlo_joint_summary.csv', index=False)
+print("\nSaved: monte_carlo_joint_summary.csv")
+
 print(f"\nTuition Elasticity Estimates (Havranek et al. 2018):")
 print(f"  Overall Mean: -0.037 (near-zero effect)")
 print(f"  Public Universities: +0.003 (essentially zero)")
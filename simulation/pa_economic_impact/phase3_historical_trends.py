@@ -9,6 +9,10 @@ Sources:
 
 import sys, os; sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from config import *
+from context import shared
+
+# Model inputs come from the run's config; the star import is kept for display helpers
+cfg = shared.config
 
 # ============================================================================
 # PHASE 3: HISTORICAL TRENDS WITH REAL WAGE GROWTH
@@ -17,37 +21,8 @@ print("\n" + "=" * 80)
 print("PHASE 3: HISTORICAL ANALYSIS WITH REAL WAGE GROWTH")
 print("=" * 80)
 
-# Validate historical data
-assert validate_data_lengths(historical_data, 17), "Historical data length mismatch!"
-
-df_historical = pd.DataFrame(historical_data)
-
-# Inflation-adjusted appropriations
-df_historical['state_appropriation_real'] = (
-    df_historical['state_appropriation_nominal'] / df_historical['cpi_adjustment']
-)
-
-# Per-FTE funding
-df_historical['total_enrollment'] = (
-    df_historical['passhe_enrollment'] + df_historical['state_related_enrollment']
-)
-df_historical['appropriation_per_fte'] = (
-    df_historical['state_appropriation_real'] * 1e6 / df_historical['total_enrollment']
-)
-
-# Real wage-adjusted calculations
-df_historical['cumulative_wage_factor'] = (1 + df_historical['real_wage_growth']).cumprod()
-df_historical['appropriation_wage_adjusted'] = (
-    df_historical['state_appropriation_real'] / df_historical['cumulative_wage_factor']
-)
-df_historical['per_fte_wage_adjusted'] = (
-    df_historical['appropriation_wage_adjusted'] * 1e6 / df_historical['total_enrollment']
-)
-
-# Real tuition adjusted
-df_historical['tuition_real'] = (
-    df_historical['tuition_avg_public'] / df_historical['cpi_adjustment']
-)
+# Real (CPI- and wage-adjusted) appropriations, per-FTE funding and tuition
+df_historical = shared.historical_frame()
 
 print("\nHistorical State Appropriations (Real 2024 $):")
 print(f"  2010: ${df_historical.loc[0, 'state_appropriation_real']:.0f}M")
@@ -80,14 +55,14 @@ print("-" * 60)
 
 grad_earnings_premium = 32000
 lifetime_premium = grad_earnings_premium * 40
-graduates_leaving_annually = int(total_enrollment_all * 0.25 * brain_drain_data['leave_pa'])
-lost_tax_revenue_annually = graduates_leaving_annually * grad_earnings_premium * state_tax_rate
-lost_tax_revenue_lifetime = graduates_leaving_annually * lifetime_premium * state_tax_rate
+graduates_leaving_annually = int(cfg.total_enrollment_all * 0.25 * cfg.brain_drain_data['leave_pa'])
+lost_tax_revenue_annually = graduates_leaving_annually * grad_earnings_premium * cfg.state_tax_rate
+lost_tax_revenue_lifetime = graduates_leaving_annually * lifetime_premium * cfg.state_tax_rate
 
 print(f"Graduate Retention Rates:")
-print(f"  Stay in PA: {brain_drain_data['stay_in_pa']*100:.0f}%")
-print(f"  Leave PA: {brain_drain_data['leave_pa']*100:.0f}%")
-print(f"  PA National Rank: #{brain_drain_data['pa_rank_retention']} out of 50 states")
+print(f"  Stay in PA: {cfg.brain_drain_data['stay_in_pa']*100:.0f}%")
+print(f"  Leave PA: {cfg.brain_drain_data['leave_pa']*100:.0f}%")
+print(f"  PA National Rank: #{cfg.brain_drain_data['pa_rank_retention']} out of 50 states")
 print(f"\nEconomic Cost of Brain Drain:")
 print(f"  Graduates leaving PA annually: {graduates_leaving_annually:,}")
 print(f"  Lost annual tax revenue: ${lost_tax_revenue_annually/1e6:.1f}M")
@@ -102,13 +77,13 @@ print("-" * 60)
 
 print(f"\n{'Scenario':<25} {'Econ Impact':<15} {'Change':<10} {'Description'}")
 print("-" * 80)
-for scenario, params in policy_scenarios.items():
+for scenario, params in cfg.policy_scenarios.items():
     impact_change = (
         params['appropriation_change'] * 0.3 +
         params['enrollment_change'] * 0.5 +
         params['tuition_change'] * -0.1
     )
-    projected_impact = base_economic_impact * (1 + impact_change)
+    projected_impact = cfg.base_economic_impact * (1 + impact_change)
     print(f"{scenario:<25} ${projected_impact/1e9:.1f}B{' '*5} {impact_change*100:+.1f}%{' '*4} {params['description']}")
 
 # -----------------------------------------------------------------------------
@@ -119,14 +94,14 @@ print("ROI ANALYSIS")
 print("-" * 60)
 
 print(f"\nEconomic Impact Components:")
-for component, value in economic_impact_components.items():
+for component, value in cfg.economic_impact_components.items():
     print(f"  {component.replace('_', ' ').title()}: ${value/1e9:.2f}B")
-print(f"\nTotal Economic Impact: ${total_economic_impact/1e9:.1f}B")
-print(f"Total State Appropriation: ${total_state_appropriation/1e6:.0f}M")
-print(f"ROI: ${roi_ratio:.2f} for every $1 of state investment")
+print(f"\nTotal Economic Impact: ${cfg.total_economic_impact/1e9:.1f}B")
+print(f"Total State Appropriation: ${cfg.total_state_appropriation/1e6:.0f}M")
+print(f"ROI: ${cfg.roi_ratio:.2f} for every $1 of state investment")
 
-print(f"\nTax Revenue Generated: ${tax_revenue_generated/1e9:.2f}B")
-print(f"Net Return to State: ${(tax_revenue_generated - total_state_appropriation)/1e9:.2f}B")
+print(f"\nTax Revenue Generated: ${cfg.tax_revenue_generated/1e9:.2f}B")
+print(f"Net Return to State: ${(cfg.tax_revenue_generated - cfg.total_state_appropriation)/1e9:.2f}B")
 
 # Save historical data CSV
 df_historical.to_csv(OUTPUT_DIR / 'historical_trends_2010_2026.csv', index=False)
@@ -2,95 +2,29 @@
 Pennsylvania Higher Education Economic Impact Analysis
 
 Generates all 8 charts (fig1 through fig8) from Phases 1-4 data.
-All data is recomputed here so this file runs independently.
+Intermediate data comes from context.py, which computes it here when this
+file runs on its own and reuses it from Phases 2-4 under run_all.py.
 """
 
 import sys, os; sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from config import *
+from context import shared
+
+# Model inputs come from the run's config; the star import is kept for display helpers
+cfg = shared.config
 
 # ============================================================================
-# RECOMPUTE INTERMEDIATE DATA NEEDED FOR VISUALIZATIONS
+# INTERMEDIATE DATA NEEDED FOR VISUALIZATIONS (shared via context.py)
 # ============================================================================
 
 # --- Phase 3 data: df_historical ---
-assert validate_data_lengths(historical_data, 17), "Historical data length mismatch!"
-df_historical = pd.DataFrame(historical_data)
-df_historical['state_appropriation_real'] = (
-    df_historical['state_appropriation_nominal'] / df_historical['cpi_adjustment']
-)
-df_historical['total_enrollment'] = (
-    df_historical['passhe_enrollment'] + df_historical['state_related_enrollment']
-)
-df_historical['appropriation_per_fte'] = (
-    df_historical['state_appropriation_real'] * 1e6 / df_historical['total_enrollment']
-)
-df_historical['cumulative_wage_factor'] = (1 + df_historical['real_wage_growth']).cumprod()
-df_historical['appropriation_wage_adjusted'] = (
-    df_historical['state_appropriation_real'] / df_historical['cumulative_wage_factor']
-)
-df_historical['per_fte_wage_adjusted'] = (
-    df_historical['appropriation_wage_adjusted'] * 1e6 / df_historical['total_enrollment']
-)
-df_historical['tuition_real'] = (
-    df_historical['tuition_avg_public'] / df_historical['cpi_adjustment']
-)
+df_historical = shared.historical_frame()
 
 # --- Phase 2 data: Monte Carlo ---
-np.random.seed(RANDOM_SEED)
-simulation_results = {}
-for param, (mean, std) in param_distributions.items():
-    simulation_results[param] = np.random.normal(mean, std, MONTE_CARLO_SIMULATIONS)
-impact_distribution = base_direct_spending * simulation_results['output_multiplier']
+simulation_results, impact_distribution = shared.monte_carlo()
 
 # --- Phase 4 data: county ---
-county_impact = {}
-
-for name, data in state_related_universities.items():
-    county = data['county']
-    if county not in county_impact:
-        county_impact[county] = {'enrollment': 0, 'employees': 0, 'institutions': [], 'spending': 0}
-    county_impact[county]['enrollment'] += data['enrollment']
-    county_impact[county]['employees'] += data['employees']
-    county_impact[county]['institutions'].append(name)
-    county_impact[county]['spending'] += data['operating_budget']
-
-for name, data in passhe_universities.items():
-    county = data['county']
-    if county not in county_impact:
-        county_impact[county] = {'enrollment': 0, 'employees': 0, 'institutions': [], 'spending': 0}
-    county_impact[county]['enrollment'] += data['enrollment']
-    county_impact[county]['employees'] += data['employees']
-    county_impact[county]['institutions'].append(name)
-    county_impact[county]['spending'] += data['enrollment'] * 15000
-
-for name, data in community_colleges.items():
-    county = data['county']
-    if county not in county_impact:
-        county_impact[county] = {'enrollment': 0, 'employees': 0, 'institutions': [], 'spending': 0}
-    county_impact[county]['enrollment'] += data['enrollment']
-    county_impact[county]['employees'] += data['employees']
-    county_impact[county]['institutions'].append(name)
-    county_impact[county]['spending'] += data['enrollment'] * 10000
-
-for county, data in county_impact.items():
-    data['direct_impact'] = data['spending']
-    data['total_impact'] = data['spending'] * rims_ii_multipliers['output_multiplier']
-    data['jobs_supported'] = int(data['employees'] * 1.8)
-    data['student_spending'] = data['enrollment'] * avg_student_spending * 0.65
-
-df_county = pd.DataFrame([
-    {
-        'County': county,
-        'Enrollment': data['enrollment'],
-        'Employees': data['employees'],
-        'Institutions': len(data['institutions']),
-        'Direct_Impact_M': data['direct_impact'] / 1e6,
-        'Total_Impact_M': data['total_impact'] / 1e6,
-        'Jobs_Supported': data['jobs_supported'],
-        'Student_Spending_M': data['student_spending'] / 1e6
-    }
-    for county, data in county_impact.items()
-]).sort_values('Total_Impact_M', ascending=False)
+county_impact, df_county = shared.county_impact()
 
 df_county_no_bigflagships = df_county[~df_county['County'].isin(['Centre', 'Allegheny'])]
 
@@ -154,8 +88,8 @@ try:
 
     # CHART 2: Employment by Sector
     fig, ax = plt.subplots(figsize=(12, 8))
-    sector_names = list(employment_sectors.keys())
-    sector_counts = [s['count'] for s in employment_sectors.values()]
+    sector_names = list(cfg.employment_sectors.keys())
+    sector_counts = [s['count'] for s in cfg.employment_sectors.values()]
     colors = plt.cm.Set3(range(len(sector_names)))
     ax.barh(sector_names, sector_counts, color=colors, edgecolor='black', alpha=0.8)
     ax.set_xlabel('Number of Employees', fontsize=12, fontweight='bold')
@@ -170,8 +104,8 @@ try:
 
     # CHART 3: Research Expenditures
     fig, ax = plt.subplots(figsize=(10, 7))
-    research_institutions = list(research_data.keys())
-    research_totals = [r['total']/1e9 for r in research_data.values()]
+    research_institutions = list(cfg.research_data.keys())
+    research_totals = [r['total']/1e9 for r in cfg.research_data.values()]
     ax.bar(research_institutions, research_totals, color=['#1F77B4', '#FF7F0E', '#2CA02C'],
            edgecolor='black', alpha=0.85)
     ax.set_ylabel('Research Expenditures ($ Billion)', fontsize=12, fontweight='bold')
@@ -186,14 +120,14 @@ try:
 
     # CHART 4: Policy Scenario Comparison
     fig, ax = plt.subplots(figsize=(12, 7))
-    scenario_names = list(policy_scenarios.keys())
+    scenario_names = list(cfg.policy_scenarios.keys())
     scenario_impacts = []
-    for params in policy_scenarios.values():
+    for params in cfg.policy_scenarios.values():
         ic = params['appropriation_change'] * 0.3 + params['enrollment_change'] * 0.5 + params['tuition_change'] * -0.1
-        scenario_impacts.append(base_economic_impact * (1 + ic) / 1e9)
+        scenario_impacts.append(cfg.base_economic_impact * (1 + ic) / 1e9)
     colors_policy = ['gray', 'green', 'blue', 'purple', 'red']
     ax.barh(scenario_names, scenario_impacts, color=colors_policy, edgecolor='black', alpha=0.8)
-    ax.axvline(x=base_economic_impact/1e9, color='black', linestyle='--', linewidth=2, label='Baseline')
+    ax.axvline(x=cfg.base_economic_impact/1e9, color='black', linestyle='--', linewidth=2, label='Baseline')
     ax.set_xlabel('Total Economic Impact ($ Billion)', fontsize=12, fontweight='bold')
     ax.set_title('Policy Scenario Economic Impact Projections', fontsize=14, fontweight='bold')
     ax.grid(axis='x', alpha=0.3)
@@ -207,13 +141,13 @@ try:
 
     # CHART 5: Economic Impact Pie
     fig, ax = plt.subplots(figsize=(10, 10))
-    labels = [c.replace('_', ' ').title() for c in economic_impact_components.keys()]
-    sizes = list(economic_impact_components.values())
+    labels = [c.replace('_', ' ').title() for c in cfg.economic_impact_components.keys()]
+    sizes = list(cfg.economic_impact_components.values())
     colors_pie = plt.cm.Set2(range(len(labels)))
     explode = (0.05, 0, 0, 0.05, 0)
     ax.pie(sizes, explode=explode, labels=labels, autopct='%1.1f%%',
            startangle=90, colors=colors_pie, textprops={'fontsize': 11, 'fontweight': 'bold'})
-    ax.set_title(f'Total Economic Impact: ${total_economic_impact/1e9:.1f}B',
+    ax.set_title(f'Total Economic Impact: ${cfg.total_economic_impact/1e9:.1f}B',
                  fontsize=14, fontweight='bold', pad=20)
     plt.tight_layout()
     plt.savefig(OUTPUT_DIR / 'fig5_economic_impact_breakdown.png', dpi=SAVE_DPI, bbox_inches='tight')
@@ -223,16 +157,16 @@ try:
     # CHART 6: ROI & Tax Revenue
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
     ax1.bar(['State\nInvestment', 'Economic\nReturn'],
-            [total_state_appropriation/1e9, total_economic_impact/1e9],
+            [cfg.total_state_appropriation/1e9, cfg.total_economic_impact/1e9],
             color=['#E63946', '#06D6A0'], edgecolor='black', alpha=0.85)
     ax1.set_ylabel('$ Billion', fontsize=12, fontweight='bold')
-    ax1.set_title(f'ROI: ${roi_ratio:.2f} per $1 Invested', fontsize=13, fontweight='bold')
+    ax1.set_title(f'ROI: ${cfg.roi_ratio:.2f} per $1 Invested', fontsize=13, fontweight='bold')
     ax1.grid(axis='y', alpha=0.3)
-    for i, val in enumerate([total_state_appropriation/1e9, total_economic_impact/1e9]):
+    for i, val in enumerate([cfg.total_state_appropriation/1e9, cfg.total_economic_impact/1e9]):
         ax1.text(i, val + 0.5, f'${val:.1f}B', ha='center', fontsize=11, fontweight='bold')
     ax2.bar(['State\nAppropriation', 'Tax Revenue\nGenerated', 'Net Return\nto State'],
-            [total_state_appropriation/1e9, tax_revenue_generated/1e9,
-             (tax_revenue_generated - total_state_appropriation)/1e9],
+            [cfg.total_state_appropriation/1e9, cfg.tax_revenue_generated/1e9,
+             (cfg.tax_revenue_generated - cfg.total_state_appropriation)/1e9],
             color=['#E63946', '#118AB2', '#06D6A0'], edgecolor='black', alpha=0.85)
     ax2.set_ylabel('$ Billion', fontsize=12, fontweight='bold')
     ax2.set_title('Tax Revenue Generation & Net Return', fontsize=13, fontweight='bold')
@@ -271,7 +205,7 @@ try:
     ax.axvline(x=ci_high, color='orange', linestyle='--', linewidth=1.5, label=f'95% CI: ${ci_high:.1f}B')
     ax.set_xlabel('Economic Impact ($ Billion)', fontsize=12, fontweight='bold')
     ax.set_ylabel('Frequency', fontsize=12, fontweight='bold')
-    ax.set_title(f'Monte Carlo: Economic Impact Uncertainty (n={MONTE_CARLO_SIMULATIONS:,})',
+    ax.set_title(f'Monte Carlo: Economic Impact Uncertainty (n={cfg.MONTE_CARLO_SIMULATIONS:,})',
                  fontsize=14, fontweight='bold')
     ax.legend(fontsize=11)
     ax.grid(True, alpha=0.3)
@@ -7,6 +7,10 @@ National avg per-FTE in 1980: $10,296 (2024$). PA was above average in 1980.
 
 import sys, os; sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from config import *
+from context import shared
+
+# Model inputs come from the run's config; the star import is kept for display helpers
+cfg = shared.config
 
 # =============================================================================
 # PHASE 7: COUNTERFACTUAL - WHAT IF PA INVESTED CONSISTENTLY SINCE 1980
@@ -27,9 +31,9 @@ print("=" * 80)
 # Sources: SHEEO SHEF historical data, PA budget documents
 # (counterfactual_data is imported from config)
 
-assert validate_data_lengths(counterfactual_data, 45), "Counterfactual data length mismatch!"
+assert validate_data_lengths(cfg.counterfactual_data, 45), "Counterfactual data length mismatch!"
 
-df_cf = pd.DataFrame(counterfactual_data)
+df_cf = pd.DataFrame(cfg.counterfactual_data)
 
 # Convert to real 2024 dollars
 df_cf['pa_actual_real'] = df_cf['pa_actual_nominal'] * df_cf['cpi_to_2024']
@@ -55,7 +59,7 @@ df_cf['cumulative_gap'] = df_cf['funding_gap_real'].cumsum()
 # Research: 10% funding increase -> 3-5% enrollment increase (elasticity ~0.35)
 # (funding_enrollment_elasticity is imported from config)
 df_cf['funding_change_pct'] = (df_cf['cf_total_real'] / df_cf['pa_actual_real']) - 1
-df_cf['cf_enrollment'] = df_cf['pa_enrollment_total'] * (1 + df_cf['funding_change_pct'] * funding_enrollment_elasticity)
+df_cf['cf_enrollment'] = df_cf['pa_enrollment_total'] * (1 + df_cf['funding_change_pct'] * cfg.funding_enrollment_elasticity)
 df_cf['cf_enrollment'] = df_cf['cf_enrollment'].clip(lower=df_cf['pa_enrollment_total'])  # Can't be below actual
 df_cf['enrollment_gain'] = df_cf['cf_enrollment'] - df_cf['pa_enrollment_total']
 
@@ -67,9 +71,9 @@ print("-" * 60)
 total_cumulative_gap = df_cf['cumulative_gap'].iloc[-1]
 total_enrollment_lost = df_cf['enrollment_gain'].sum()
 additional_graduates_lost = int(total_enrollment_lost * 0.30)  # ~30% graduation rate avg
-lost_lifetime_earnings = additional_graduates_lost * lifetime_earnings_premium['bachelor']
-lost_tax_revenue_cf = lost_lifetime_earnings * pa_state_income_tax
-lost_gdp_impact = total_cumulative_gap * 1e6 * rims_ii_multipliers['output_multiplier']
+lost_lifetime_earnings = additional_graduates_lost * cfg.lifetime_earnings_premium['bachelor']
+lost_tax_revenue_cf = lost_lifetime_earnings * cfg.pa_state_income_tax
+lost_gdp_impact = total_cumulative_gap * 1e6 * cfg.rims_ii_multipliers['output_multiplier']
 
 print(f"\nPA 1980 Per-FTE Funding (real 2024$): ${pa_1980_per_fte_real:,.0f}")
 print(f"PA 2024 Per-FTE Funding (actual, real 2024$): ${df_cf['pa_per_fte_actual'].iloc[-1]:,.0f}")
@@ -7,6 +7,10 @@ Sources: IPEDS, NCES Digest of Education Statistics, Pell Grant data
 
 import sys, os; sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from config import *
+from context import shared
+
+# Model inputs come from the run's config; the star import is kept for display helpers
+cfg = shared.config
 
 # =============================================================================
 # PHASE 9: DEMOGRAPHIC-SEGMENTED ANALYSIS
@@ -25,26 +29,26 @@ print("=" * 80)
 # Recompute total_pa_residents for this phase (same calculation as Phase 6)
 total_pa_residents = sum(
     int(data['total'] * data['in_state_pct'])
-    for data in pa_resident_enrollment.values()
+    for data in cfg.pa_resident_enrollment.values()
 )
 
 # 9.3 Run demographic-segmented simulation (40-year horizon)
 demographic_results = {}
 horizon_demo = 40
 
-for dimension, groups in demographic_shares.items():
+for dimension, groups in cfg.demographic_shares.items():
     demographic_results[dimension] = {}
     for group, share in groups.items():
         group_pa_residents = int(total_pa_residents * share)
 
         # Completion rates for this group
-        cc_mult = completion_rate_multipliers[dimension][group]['cc']
-        four_yr_mult = completion_rate_multipliers[dimension][group]['four_yr']
+        cc_mult = cfg.completion_rate_multipliers[dimension][group]['cc']
+        four_yr_mult = cfg.completion_rate_multipliers[dimension][group]['four_yr']
 
-        cc_rate_current = completion_rates['community_college_current'] * cc_mult
-        cc_rate_free = min(cc_rate_current + free_college_boost_by_group[dimension][group], 0.65)
-        four_yr_rate_current = completion_rates['four_year_current'] * four_yr_mult
-        four_yr_rate_free = min(four_yr_rate_current + free_college_boost_by_group[dimension][group], 0.90)
+        cc_rate_current = cfg.completion_rates['community_college_current'] * cc_mult
+        cc_rate_free = min(cc_rate_current + cfg.free_college_boost_by_group[dimension][group], 0.65)
+        four_yr_rate_current = cfg.completion_rates['four_year_current'] * four_yr_mult
+        four_yr_rate_free = min(four_yr_rate_current + cfg.free_college_boost_by_group[dimension][group], 0.90)
 
         # Simplified 40-year projection for this group
         cum_state_cost = 0
@@ -52,16 +56,16 @@ for dimension, groups in demographic_shares.items():
         cum_earnings = 0
 
         for i in range(horizon_demo):
-            year = start_year + i
-            cpi_factor = (1 + inflation_rate) ** (year - INFLATION_BASE_YEAR)
-            tuition_factor = (1 + tuition_growth_rate) ** (year - start_year)
-            wage_factor = (1 + wage_growth_real) ** (year - start_year)
+            year = cfg.start_year + i
+            cpi_factor = (1 + cfg.inflation_rate) ** (year - cfg.INFLATION_BASE_YEAR)
+            tuition_factor = (1 + cfg.tuition_growth_rate) ** (year - cfg.start_year)
+            wage_factor = (1 + cfg.wage_growth_real) ** (year - cfg.start_year)
 
             # State cost for this group
             annual_cost = 0
-            for inst, data in pa_resident_enrollment.items():
+            for inst, data in cfg.pa_resident_enrollment.items():
                 pa_students_group = int(data['total'] * data['in_state_pct'] * share)
-                boost = enrollment_boost.get(inst, 0.10)
+                boost = cfg.enrollment_boost.get(inst, 0.10)
                 ramp = min(1.0, 0.5 + 0.25 * i) if i < 2 else 1.0
                 new_students = int(pa_students_group * boost * ramp)
                 total_students = pa_students_group + new_students
@@ -74,26 +78,26 @@ for dimension, groups in demographic_shares.items():
             new_cc_grads = 0
             new_4yr_grads = 0
             if i >= 2:
-                cc_group = int(pa_resident_enrollment['Community Colleges']['total'] *
-                              pa_resident_enrollment['Community Colleges']['in_state_pct'] *
-                              share * enrollment_boost['Community Colleges'])
+                cc_group = int(cfg.pa_resident_enrollment['Community Colleges']['total'] *
+                              cfg.pa_resident_enrollment['Community Colleges']['in_state_pct'] *
+                              share * cfg.enrollment_boost['Community Colleges'])
                 new_cc_grads = int(cc_group * cc_rate_free)
             if i >= 4:
                 four_yr_group = sum(
-                    int(pa_resident_enrollment[inst]['total'] *
-                        pa_resident_enrollment[inst]['in_state_pct'] *
-                        share * enrollment_boost.get(inst, 0.10))
+                    int(cfg.pa_resident_enrollment[inst]['total'] *
+                        cfg.pa_resident_enrollment[inst]['in_state_pct'] *
+                        share * cfg.enrollment_boost.get(inst, 0.10))
                     for inst in ['PASSHE', 'Penn State', 'Pitt', 'Temple', 'Lincoln']
                 )
                 new_4yr_grads = int(four_yr_group * four_yr_rate_free)
 
             cum_new_grads += new_cc_grads + new_4yr_grads
 
-            annual_earnings_cc = new_cc_grads * (lifetime_earnings_premium['associate'] / 40) * wage_factor
-            annual_earnings_4yr = new_4yr_grads * (lifetime_earnings_premium['bachelor'] / 40) * wage_factor
+            annual_earnings_cc = new_cc_grads * (cfg.lifetime_earnings_premium['associate'] / 40) * wage_factor
+            annual_earnings_4yr = new_4yr_grads * (cfg.lifetime_earnings_premium['bachelor'] / 40) * wage_factor
             cum_earnings += annual_earnings_cc + annual_earnings_4yr
 
-        cum_tax = cum_earnings * pa_state_income_tax
+        cum_tax = cum_earnings * cfg.pa_state_income_tax
 
         demographic_results[dimension][group] = {
             'share': share,
@@ -0,0 +1,325 @@
+"""Free-college projection engine shared by Phases 6, 8, 14, 16 and 17.
+
+Phase 6 projects the free-college policy year by year: a nested loop over
+institutions inside a loop over years, repeated for each of the 5/10/20/40
+year horizons. Phases 8, 14, 16 and 17 carried copies of that loop to
+rebuild ``results`` for themselves. Here the projection is one broadcast
+over (institution x year) arrays:
+
+    new_students[i, t]   int(pa_students[i] x boost[i] x ramp[t])
+    state_cost[i, t]     (pa_students + new_students) x tuition x tuition growth
+
+plus per-year graduates, earnings, taxes, brain-drain savings and GDP
+impact. Nothing in a year depends on the horizon, so the 40-year run is
+computed once and every horizon is a prefix sum (``np.cumsum`` adds in the
+same order as the loop did, so the results are unchanged to the bit).
+
+Usage from a phase file:
+
+    from projection import free_college_results
+    results = free_college_results()          # {horizon: {...}} as in Phase 6
+
+``project_free_college`` returns the underlying ``FreeCollegeProjection``
+(arrays by institution and year) for phases that need more than the
+horizon summaries, e.g. the no-flagship rerun of Phase 14.
+
+``simulate_free_college`` is the stochastic version: the same model with
+enrollment boosts, completion rates, real wage growth, tuition growth and the
+free-college brain-drain rate drawn from ``free_college_uncertainty``, as
+(draw x institution x year) arrays. It returns a ``FreeCollegeEnsemble`` with
+per-draw annual cost and benefits, from which Phase 6 reads distributions of
+state cost, ROI and cumulative net benefit and the percentile bands for its
+fan chart.
+"""
+
+import numpy as np
+
+from model_config import default_config
+
+PROJECTION_YEARS_MAX = 40
+CC_LAG, FOUR_YEAR_LAG = 2, 4          # years until new students graduate
+DEFAULT_BOOST = 0.10                  # enrollment boost for institutions not listed
+
+
+class FreeCollegeProjection:
+    """Year-by-year free-college projection as (institution x year) and (year,) arrays."""
+
+    # per-year series exported to ``annual_data`` (Phase 6 CSV layout)
+    ANNUAL_FIELDS = ('year', 'state_cost_real', 'new_enrollment', 'new_graduates',
+                     'earnings_gain', 'tax_gain', 'brain_drain_savings', 'gdp_impact')
+
+    def __init__(self, institutions, years, arrays, total_pa_residents, cfg):
+        self.institutions = institutions
+        self.years = years
+        self.total_pa_residents = total_pa_residents
+        self.cfg = cfg
+        for name, value in arrays.items():
+            setattr(self, name, value)
+
+    @property
+    def n_years(self):
+        return len(self.years)
+
+    def cumulative(self, name):
+        """Running total of a per-year series (entry h - 1 is the h-year horizon)."""
+        return np.cumsum(getattr(self, name))
+
+    def annual_data(self, horizon=None):
+        """Per-year rows (dicts of Python scalars) for the first ``horizon`` years."""
+        h = self.n_years if horizon is None else horizon
+        columns = [getattr(self, f)[:h].tolist() for f in self.ANNUAL_FIELDS]
+        return [dict(zip(self.ANNUAL_FIELDS, row)) for row in zip(*columns)]
+
+    def horizon_results(self, horizons=None):
+        """``{horizon: summary}`` with the keys Phase 6 has always produced."""
+        horizons = self.cfg.simulation_horizons if horizons is None else horizons
+        cum = {name: self.cumulative(name) for name in (
+            'state_cost_real', 'new_graduates', 'earnings_gain', 'tax_gain',
+            'brain_drain_savings', 'gdp_impact', 'state_tax_real')}
+        out = {}
+        for h in horizons:
+            if h > self.n_years:
+                raise ValueError(f"projection covers {self.n_years} years, horizon {h} requested")
+            k = h - 1
+            state_cost = float(cum['state_cost_real'][k])
+            tax = float(cum['tax_gain'][k])
+            brain = float(cum['brain_drain_savings'][k])
+            gdp = float(cum['gdp_impact'][k])
+            total_benefits = tax + brain + gdp * 0.04
+            out[h] = {
+                'cumulative_state_cost': state_cost,
+                'cumulative_new_graduates': int(cum['new_graduates'][k]),
+                'cumulative_earnings_gain': float(cum['earnings_gain'][k]),
+                'cumulative_tax_revenue': tax,
+                'cumulative_brain_drain_savings': brain,
+                'cumulative_gdp_impact': gdp,
+                'state_roi': total_benefits / state_cost if state_cost > 0 else 0,
+                'individual_roi_bachelor': self.individual_roi_bachelor,
+                'individual_roi_associate': self.individual_roi_associate,
+                'annual_data': self.annual_data(h),
+                'cumulative_state_tax_only': float(cum['state_tax_real'][k]),
+            }
+        return out
+
+
+def project_free_college(enrollment=None, n_years=PROJECTION_YEARS_MAX, boost=None,
+                         total_pa_residents=None, cfg=None):
+    """Run the free-college projection for ``n_years`` from ``start_year``.
+
+    ``enrollment`` defaults to ``pa_resident_enrollment`` (a subset drops
+    institutions, as in Phase 14); ``boost`` to ``enrollment_boost``.
+    Brain-drain savings scale with ``total_pa_residents``, which defaults
+    to the statewide total whatever subset is projected. Every other input
+    comes from ``cfg`` (a ``ModelConfig``, default: config.py's values).
+    """
+    cfg = default_config() if cfg is None else cfg
+    enrollment = cfg.pa_resident_enrollment if enrollment is None else enrollment
+    boost_map = cfg.enrollment_boost if boost is None else boost
+    institutions = list(enrollment)
+    if total_pa_residents is None:
+        total_pa_residents = cfg.total_pa_residents
+
+    years = np.arange(cfg.start_year, cfg.start_year + n_years)
+    t = np.arange(n_years)
+    # Growth factors use Python's float power (numpy's vector pow can differ in the last bit)
+    cpi_factor = np.array([(1 + cfg.inflation_rate) ** (y - cfg.INFLATION_BASE_YEAR) for y in years.tolist()])
+    tuition_factor = np.array([(1 + cfg.tuition_growth_rate) ** k for k in t.tolist()])
+    wage_factor = np.array([(1 + cfg.wage_growth_real) ** k for k in t.tolist()])
+    # Enrollment ramps up: 50% of the boost in year 1, 75% in year 2, 100% after
+    ramp = np.where(t < 2, np.minimum(1.0, 0.5 + 0.25 * t), 1.0)
+
+    # ── State cost: tuition for every PA resident, (institution x year) ──
+    pa_students = np.array([int(enrollment[i]['total'] * enrollment[i]['in_state_pct'])
+                            for i in institutions], dtype=np.int64)
+    boost = np.array([boost_map.get(i, DEFAULT_BOOST) for i in institutions])
+    tuition = np.array([enrollment[i]['tuition'] for i in institutions], dtype=float)
+    new_students = (pa_students[:, None] * boost[:, None] * ramp[None, :]).astype(np.int64)
+    total_students = pa_students[:, None] + new_students
+    state_cost_nominal = total_students * (tuition[:, None] * tuition_factor[None, :])
+    annual_state_cost_nominal = state_cost_nominal.sum(axis=0)
+    state_cost_real = annual_state_cost_nominal / cpi_factor
+    new_enrollment = new_students.sum(axis=0)
+
+    # ── New graduates from the boosted cohorts, after 2 (CC) / 4 (four-year) years ──
+    boost_students = np.array([int(enrollment[i]['total'] * enrollment[i]['in_state_pct']
+                                   * boost_map.get(i, DEFAULT_BOOST)) for i in institutions],
+                              dtype=np.int64)
+    cc = [k for k, i in enumerate(institutions) if cfg.sector_type.get(i) == 'two_year']
+    four = [k for k, i in enumerate(institutions) if cfg.sector_type.get(i) == 'four_year']
+    cc_grads = int(int(boost_students[cc].sum()) * cfg.completion_rates['community_college_free'])
+    four_grads = int(int(boost_students[four].sum()) * cfg.completion_rates['four_year_free'])
+    new_cc_grads = np.where(t >= CC_LAG, cc_grads, 0)
+    new_4yr_grads = np.where(t >= FOUR_YEAR_LAG, four_grads, 0)
+    new_graduates = new_cc_grads + new_4yr_grads
+
+    # ── Earnings (real 2024$), taxes, brain drain and GDP ──
+    earnings_cc = new_cc_grads * (cfg.lifetime_earnings_premium['associate'] / 40) * wage_factor
+    earnings_4yr = new_4yr_grads * (cfg.lifetime_earnings_premium['bachelor'] / 40) * wage_factor
+    earnings_gain = earnings_cc + earnings_4yr
+    state_tax = earnings_gain * cfg.pa_state_income_tax
+    tax_gain = state_tax + earnings_gain * cfg.pa_local_tax_avg + earnings_gain * 0.70 * cfg.sales_tax_rate
+
+    total_annual_grads = int(total_pa_residents * 0.25)          # ~25% graduate each year
+    grads_retained = int(total_annual_grads * (cfg.brain_drain_baseline - cfg.brain_drain_free_college))
+    brain_drain_savings = grads_retained * cfg.grad_earnings_premium * wage_factor * cfg.pa_state_income_tax
+
+    gdp_nominal = (new_enrollment * cfg.avg_student_spending * 0.65 * cfg.spending_multipliers['student']
+                   + annual_state_cost_nominal * 0.60 * cfg.spending_multipliers['institutional']
+                   + earnings_gain * cfg.spending_multipliers['payroll'])
+
+    projection = FreeCollegeProjection(institutions, years, {
+        'cpi_factor': cpi_factor, 'tuition_factor': tuition_factor, 'wage_factor': wage_factor,
+        'pa_students': pa_students, 'boost_students': boost_students,
+        'new_students': new_students, 'total_students': total_students,
+        'state_cost_nominal': state_cost_nominal,
+        'year': years, 'state_cost_real': state_cost_real, 'new_enrollment': new_enrollment,
+        'new_cc_graduates': new_cc_grads, 'new_4yr_graduates': new_4yr_grads,
+        'new_graduates': new_graduates, 'earnings_gain': earnings_gain, 'tax_gain': tax_gain,
+        'state_tax_real': state_tax / cpi_factor, 'brain_drain_savings': brain_drain_savings,
+        'gdp_impact': gdp_nominal / cpi_factor,
+    }, total_pa_residents, cfg)
+
+    # Individual ROI (tuition saved vs lifetime premium) does not depend on the year
+    avg_tuition_saved_4yr = sum(d['tuition'] for inst, d in cfg.pa_resident_enrollment.items()
+                                if inst != 'Community Colleges') * 4 / 5
+    avg_tuition_saved_cc = cfg.pa_resident_enrollment['Community Colleges']['tuition'] * 2
+    projection.individual_roi_bachelor = cfg.lifetime_earnings_premium['bachelor'] / avg_tuition_saved_4yr
+    projection.individual_roi_associate = cfg.lifetime_earnings_premium['associate'] / avg_tuition_saved_cc
+    return projection
+
+
+def free_college_results(horizons=None, cfg=None, **kwargs):
+    """Phase 6 ``results`` dict: one 40-year projection, summarized per horizon."""
+    cfg = default_config() if cfg is None else cfg
+    horizons = cfg.simulation_horizons if horizons is None else horizons
+    n_years = max(max(horizons), PROJECTION_YEARS_MAX)
+    return project_free_college(n_years=n_years, cfg=cfg, **kwargs).horizon_results(horizons)
+
+
+class FreeCollegeEnsemble:
+    """Monte Carlo projection: (draw x year) arrays of annual cost and benefits (2024$)."""
+
+    def __init__(self, years, params, arrays, cfg):
+        self.years = years
+        self.params = params
+        self.cfg = cfg
+        for name, value in arrays.items():
+            setattr(self, name, value)
+
+    @property
+    def n_draws(self):
+        return self.state_cost_real.shape[0]
+
+    def cumulative(self, name):
+        """Running total over years of a (draw x year) series."""
+        return np.cumsum(getattr(self, name), axis=1)
+
+    def state_roi(self):
+        """(draw x year) ROI of the first h years: cumulative benefits / cumulative cost."""
+        return self.cumulative('benefits') / self.cumulative('state_cost_real')
+
+    def fan(self, series, percentiles=(5, 25, 50, 75, 95)):
+        """{percentile: (year,) array} across draws, for fan charts."""
+        values = series if isinstance(series, np.ndarray) else getattr(self, series)
+        bands = np.percentile(values, percentiles, axis=0)
+        return dict(zip(percentiles, bands))
+
+    def horizon_summary(self, horizons=None, percentiles=(5, 50, 95)):
+        """Rows of mean and percentiles of cost, ROI and net benefit at each horizon."""
+        horizons = self.cfg.simulation_horizons if horizons is None else horizons
+        metrics = {
+            'cumulative_state_cost': self.cumulative('state_cost_real'),
+            'state_roi': self.state_roi(),
+            'cumulative_net_benefit': self.cumulative('net_benefit'),
+        }
+        rows = []
+        for h in horizons:
+            for metric, values in metrics.items():
+                column = values[:, h - 1]
+                row = {'horizon': h, 'metric': metric, 'mean': float(column.mean())}
+                row.update({f'p{p}': float(v) for p, v in zip(percentiles, np.percentile(column, percentiles))})
+                rows.append(row)
+        return rows
+
+
+def draw_free_college_parameters(n_draws, seed, institutions, uncertainty=None, cfg=None):
+    """Draws of the uncertain Phase 6 inputs: {name: (draw,) or (draw x institution) array}.
+
+    Draws are clipped to their valid range: boost scales at 0, completion
+    rates to [0, 1], the free-college brain-drain rate to [0, brain_drain_baseline].
+    """
+    cfg = default_config() if cfg is None else cfg
+    uncertainty = cfg.free_college_uncertainty if uncertainty is None else uncertainty
+    rng = np.random.default_rng(seed)
+    params = {}
+    for name, (mean, sd) in uncertainty.items():
+        shape = (n_draws, len(institutions)) if name == 'enrollment_boost_scale' else n_draws
+        params[name] = rng.normal(mean, sd, shape)
+    params['enrollment_boost_scale'] = np.maximum(params['enrollment_boost_scale'], 0.0)
+    for name in ('community_college_free', 'four_year_free'):
+        params[name] = np.clip(params[name], 0.0, 1.0)
+    params['brain_drain_free_college'] = np.clip(params['brain_drain_free_college'], 0.0, cfg.brain_drain_baseline)
+    return params
+
+
+def simulate_free_college(n_draws, seed, enrollment=None, n_years=PROJECTION_YEARS_MAX, boost=None,
+                          uncertainty=None, cfg=None):
+    """Run ``project_free_college``'s model for ``n_draws`` parameter draws at once.
+
+    Every step of the deterministic projection gains a leading draw axis:
+    enrollment is (draw x institution x year), the growth factors and
+    graduate counts (draw x year). With zero standard deviations each draw
+    equals the deterministic projection (to rounding of the growth factors).
+    """
+    cfg = default_config() if cfg is None else cfg
+    enrollment = cfg.pa_resident_enrollment if enrollment is None else enrollment
+    boost_map = cfg.enrollment_boost if boost is None else boost
+    institutions = list(enrollment)
+    params = draw_free_college_parameters(n_draws, seed, institutions, uncertainty, cfg)
+
+    years = np.arange(cfg.start_year, cfg.start_year + n_years)
+    t = np.arange(n_years)
+    cpi_factor = (1 + cfg.inflation_rate) ** (years - cfg.INFLATION_BASE_YEAR).astype(float)
+    tuition_factor = (1 + params['tuition_growth_rate'][:, None]) ** t
+    wage_factor = (1 + params['wage_growth_real'][:, None]) ** t
+    ramp = np.where(t < 2, np.minimum(1.0, 0.5 + 0.25 * t), 1.0)
+
+    # ── State cost, (draw x institution x year) ──
+    pa_students = np.array([int(enrollment[i]['total'] * enrollment[i]['in_state_pct'])
+                            for i in institutions], dtype=np.int64)
+    residents = np.array([enrollment[i]['total'] * enrollment[i]['in_state_pct'] for i in institutions])
+    tuition = np.array([enrollment[i]['tuition'] for i in institutions], dtype=float)
+    boost = np.array([boost_map.get(i, DEFAULT_BOOST) for i in institutions]) * params['enrollment_boost_scale']
+    new_students = (pa_students[None, :, None] * boost[:, :, None] * ramp).astype(np.int64)
+    annual_state_cost_nominal = ((pa_students[None, :, None] + new_students) * tuition[None, :, None]).sum(axis=1)
+    annual_state_cost_nominal *= tuition_factor
+    state_cost_real = annual_state_cost_nominal / cpi_factor
+    new_enrollment = new_students.sum(axis=1)
+
+    # ── New graduates, (draw x year) ──
+    boost_students = np.floor(residents * boost).astype(np.int64)
+    cc = [k for k, i in enumerate(institutions) if cfg.sector_type.get(i) == 'two_year']
+    four = [k for k, i in enumerate(institutions) if cfg.sector_type.get(i) == 'four_year']
+    cc_grads = np.floor(boost_students[:, cc].sum(axis=1) * params['community_college_free'])
+    four_grads = np.floor(boost_students[:, four].sum(axis=1) * params['four_year_free'])
+    new_cc_grads = np.where(t >= CC_LAG, cc_grads[:, None], 0.0)
+    new_4yr_grads = np.where(t >= FOUR_YEAR_LAG, four_grads[:, None], 0.0)
+
+    # ── Earnings, taxes, brain drain and GDP ──
+    earnings_gain = (new_cc_grads * (cfg.lifetime_earnings_premium['associate'] / 40)
+                     + new_4yr_grads * (cfg.lifetime_earnings_premium['bachelor'] / 40)) * wage_factor
+    tax_gain = earnings_gain * (cfg.pa_state_income_tax + cfg.pa_local_tax_avg + 0.70 * cfg.sales_tax_rate)
+    total_annual_grads = int(cfg.total_pa_residents * 0.25)
+    grads_retained = np.floor(total_annual_grads * (cfg.brain_drain_baseline - params['brain_drain_free_college']))
+    brain_drain_savings = grads_retained[:, None] * cfg.grad_earnings_premium * wage_factor * cfg.pa_state_income_tax
+    gdp_impact = (new_enrollment * cfg.avg_student_spending * 0.65 * cfg.spending_multipliers['student']
+                  + annual_state_cost_nominal * 0.60 * cfg.spending_multipliers['institutional']
+                  + earnings_gain * cfg.spending_multipliers['payroll']) / cpi_factor
+
+    benefits = tax_gain + brain_drain_savings + gdp_impact * 0.04
+    return FreeCollegeEnsemble(years, params, {
+        'state_cost_real': state_cost_real, 'new_enrollment': new_enrollment,
+        'new_graduates': new_cc_grads + new_4yr_grads, 'earnings_gain': earnings_gain,
+        'tax_gain': tax_gain, 'brain_drain_savings': brain_drain_savings, 'gdp_impact': gdp_impact,
+        'benefits': benefits, 'net_benefit': benefits - state_cost_real,
+    }, cfg)
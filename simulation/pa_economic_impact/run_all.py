@@ -2,9 +2,47 @@
 
 Executes all 18 phases in order. Each phase can also be run independently.
 
+By default the phases run in this interpreter: config.py is imported once and
+intermediates several phases need (Phase 6 results, the Phase 2 Monte Carlo,
+df_historical, the county table) are computed once in context.shared and
+reused. --isolated runs each phase in its own Python process instead, exactly
+as ``python phaseN_*.py`` would.
+
+With --jobs N the phases run on a pool of N worker processes. Each PHASES
+entry declares what the phase reads and writes; a phase waits only for the
+earlier phases that write a file it reads or also writes, so the many
+phases that read nothing but config.py run side by side. Context
+intermediates add no edges: each worker has its own ``context.shared`` and
+computes them itself. Every
+line a phase prints is prefixed with its number ([P06]) on the console and
+kept unprefixed in OUTPUT_DIR/logs/phaseNN.log.
+
+Phases whose outputs are up to date are skipped (see build_cache.py): a
+phase reruns only when its source, a local module it imports, a config.py
+value it uses, an input file or one of its output files has changed.
+--explain prints the reason for every phase; --force reruns everything.
+
+--set PATH=VALUE (repeatable) runs the phases under a variant config,
+``default_config().replace(PATH=VALUE, ...)`` (model_config.py), without
+editing config.py. PATH is a config name or a dotted path into one of its
+dicts; VALUE is read as JSON, else taken as a string. The overrides reach
+every phase through ``$PA_ECON_OVERRIDES`` (in process, on --jobs workers
+and in --isolated subprocesses), and the build cache compares the variant's
+values, so phases that read an overridden value rerun.
+
+--legacy-loop sets ``PA_ECON_LEGACY_LOOP=1`` so Phase 8.4 reruns the original
+per-simulation loop; like the overrides it reaches the phase in every mode
+and is part of Phase 8's build fingerprint.
+
 Usage:
     python run_all.py                     # Run all phases
     python run_all.py 1 6 8              # Run specific phases (1, 6, 8)
+    python run_all.py --jobs 4           # Run independent phases in parallel
+    python run_all.py --isolated         # One subprocess per phase
+    python run_all.py --force            # Rerun phases even if up to date
+    python run_all.py --explain          # Show why each phase does or does not rerun
+    python run_all.py --set inflation_rate=0.03 --set enrollment_boost.PASSHE=0.2
+    python run_all.py --legacy-loop 8    # Phase 8.4 with the original loop
     python run_all.py --list             # List all phases
 
 Author: Oscar J. Mayorga
@@ -14,38 +52,76 @@ Repository: github.com/omayorga/Simulation
 
 import sys
 import os
+import json
+import runpy
 import subprocess
 import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 
 # Ensure we're in the right directory
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 os.chdir(SCRIPT_DIR)
 
-# Phase definitions
+# Phase definitions: number -> (file, description, inputs, outputs).
+# Inputs and outputs are what a phase shares with others beyond config.py:
+# context.py intermediates by name (listed as an output of the phase that
+# owns them) and files the phase writes to OUTPUT_DIR.
 PHASES = {
-    1: ('phase1_institutional_data.py', 'Institutional Data (Penn State, Pitt, Temple, PASSHE, CCs)'),
-    2: ('phase2_employment_economic_multipliers.py', 'Employment & Economic Multipliers'),
-    3: ('phase3_historical_trends.py', 'Historical Trends, Brain Drain, Policy Scenarios, ROI'),
-    4: ('phase4_county_level.py', 'County-Level Economic Impact'),
-    5: ('phase5_visualizations.py', 'Visualizations (Charts 1-8)'),
-    6: ('phase6_free_college.py', 'Free College for PA Residents - Policy Simulation'),
-    7: ('phase7_counterfactual.py', 'Counterfactual - What if PA Invested Since 1980'),
-    8: ('phase8_limitations.py', 'Addressing Model Limitations'),
-    9: ('phase9_demographics.py', 'Demographic-Segmented Analysis'),
-    10: ('phase10_sector_split.py', 'Sector-Split CC vs Four-Year'),
-    11: ('phase11_cost_of_attendance.py', 'Full Cost of Attendance Modeling'),
-    12: ('phase12_tuition_cap.py', 'Tuition Cap Scenario'),
-    13: ('phase13_federal_matching.py', 'Counter-Cyclical Federal Matching'),
-    14: ('phase14_exclude_flagships.py', 'Exclude Flagships (Penn State & Pitt)'),
-    15: ('phase15_mobility_bonus.py', 'Mobility Bonus Premium'),
-    16: ('phase16_equity_match.py', 'Equity Match by State Wealth'),
-    17: ('phase17_revenue_mechanisms.py', 'Federal Revenue Mechanisms'),
-    18: ('phase18_mobility_value_score.py', 'Mobility Value Score & Completion Gap'),
+    1: ('phase1_institutional_data.py', 'Institutional Data (Penn State, Pitt, Temple, PASSHE, CCs)',
+        (), ()),
+    2: ('phase2_employment_economic_multipliers.py', 'Employment & Economic Multipliers',
+        (), ('monte_carlo', 'monte_carlo_joint_summary.csv')),
+    3: ('phase3_historical_trends.py', 'Historical Trends, Brain Drain, Policy Scenarios, ROI',
+        (), ('historical_frame', 'historical_trends_2010_2026.csv')),
+    4: ('phase4_county_level.py', 'County-Level Economic Impact',
+        (), ('county_impact', 'county_economic_impact.csv', 'county_economic_impact_no_flagships.csv')),
+    5: ('phase5_visualizations.py', 'Visualizations (Charts 1-8)',
+        ('historical_frame', 'monte_carlo', 'county_impact'),
+        ('historical_trends_2010_2026.csv', 'fig1_historical_trends.png', 'fig2_employment_by_sector.png',
+         'fig3_research_expenditures.png', 'fig4_policy_scenarios.png',
+         'fig5_economic_impact_breakdown.png', 'fig6_roi_and_tax_revenue.png',
+         'fig7_county_impact.png', 'fig8_monte_carlo_distribution.png')),
+    6: ('phase6_free_college.py', 'Free College for PA Residents - Policy Simulation',
+        (), ('free_college_results', 'fig9_free_college_roi.png', 'fig10_free_college_40yr_timeline.png',
+             'fig11_free_college_individual_roi.png', 'free_college_simulation_results.csv',
+             'free_college_40yr_annual.csv', 'free_college_monte_carlo.csv',
+             'fig18_free_college_fan_chart.png')),
+    7: ('phase7_counterfactual.py', 'Counterfactual - What if PA Invested Since 1980',
+        (), ('counterfactual_1980_2024.csv', 'fig12_counterfactual_1980.png')),
+    8: ('phase8_limitations.py', 'Addressing Model Limitations',
+        ('free_college_results', 'monte_carlo'), ('fig13_limitations_addressed.png',)),
+    9: ('phase9_demographics.py', 'Demographic-Segmented Analysis',
+        (), ('demographic_segmented_analysis.csv', 'fig13_demographic_segmentation.png',
+             'fig14_completion_rate_gaps.png')),
+    10: ('phase10_sector_split.py', 'Sector-Split CC vs Four-Year',
+         (), ('sector_split_cc_vs_fouryear.csv', 'fig15_sector_split_roi.png')),
+    11: ('phase11_cost_of_attendance.py', 'Full Cost of Attendance Modeling',
+         (), ('coa_modeling_comparison.csv', 'fig16_coa_modeling.png')),
+    12: ('phase12_tuition_cap.py', 'Tuition Cap Scenario',
+         (), ('tuition_cap_scenario.csv',)),
+    13: ('phase13_federal_matching.py', 'Counter-Cyclical Federal Matching',
+         (), ('counter_cyclical_matching.csv',)),
+    14: ('phase14_exclude_flagships.py', 'Exclude Flagships (Penn State & Pitt)',
+         ('free_college_results',), ('exclude_flagships_comparison.csv',)),
+    15: ('phase15_mobility_bonus.py', 'Mobility Bonus Premium',
+         (), ()),
+    16: ('phase16_equity_match.py', 'Equity Match by State Wealth',
+         ('free_college_results',), ()),
+    17: ('phase17_revenue_mechanisms.py', 'Federal Revenue Mechanisms',
+         ('free_college_results',), ('federal_revenue_mechanisms.csv',)),
+    18: ('phase18_mobility_value_score.py', 'Mobility Value Score & Completion Gap',
+         (), ('mobility_value_scores.csv', 'fig17_mvs_completion_gap.png')),
 }
 
 
-def run_phase(phase_num, filename, description):
-    """Run a single phase file and report status."""
+def run_phase(phase_num, filename, description, capture=False):
+    """Run a single phase file and report status.
+
+    With ``capture`` the child's output is read line by line and written to
+    ``sys.stdout`` (the prefixed stream in a --jobs worker) instead of going
+    straight to the terminal.
+    """
     filepath = os.path.join(SCRIPT_DIR, filename)
     if not os.path.exists(filepath):
         print(f"  ERROR: {filename} not found!")
@@ -57,31 +133,268 @@ def run_phase(phase_num, filename, description):
     print(f"{'=' * 80}")
 
     start = time.time()
-    result = subprocess.run(
-        [sys.executable, filepath],
-        cwd=SCRIPT_DIR,
-        capture_output=False
-    )
+    if capture:
+        sys.stdout.flush()
+        proc = subprocess.Popen([sys.executable, filepath], cwd=SCRIPT_DIR, text=True,
+                                stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        for line in proc.stdout:
+            sys.stdout.write(line)
+        returncode = proc.wait()
+    else:
+        returncode = subprocess.run(
+            [sys.executable, filepath],
+            cwd=SCRIPT_DIR,
+            capture_output=False
+        ).returncode
     elapsed = time.time() - start
 
-    if result.returncode == 0:
+    if returncode == 0:
         print(f"\n  Phase {phase_num} completed successfully ({elapsed:.1f}s)")
         return True
     else:
-        print(f"\n  ERROR: Phase {phase_num} failed with return code {result.returncode} ({elapsed:.1f}s)")
+        print(f"\n  ERROR: Phase {phase_num} failed with return code {returncode} ({elapsed:.1f}s)")
+        return False
+
+
+def run_phase_inprocess(phase_num, filename, description, context):
+    """Run a single phase file in this interpreter, sharing ``context``."""
+    filepath = os.path.join(SCRIPT_DIR, filename)
+    if not os.path.exists(filepath):
+        print(f"  ERROR: {filename} not found!")
+        return False
+
+    print(f"\n{'=' * 80}")
+    print(f"RUNNING PHASE {phase_num}: {description}")
+    print(f"File: {filename}")
+    print(f"{'=' * 80}")
+
+    start = time.time()
+    namespace = None
+    try:
+        namespace = runpy.run_path(filepath, run_name='__main__')
+        returncode = 0
+    except SystemExit as e:
+        returncode = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except Exception:
+        traceback.print_exc()
+        returncode = 1
+    finally:
+        sys.stdout.flush()
+        if 'matplotlib.pyplot' in sys.modules:
+            sys.modules['matplotlib.pyplot'].close('all')  # figures a failed phase left open
+    elapsed = time.time() - start
+    context.record_phase(phase_num, returncode == 0, elapsed, namespace)
+
+    if returncode == 0:
+        print(f"\n  Phase {phase_num} completed successfully ({elapsed:.1f}s)")
+        return True
+    else:
+        print(f"\n  ERROR: Phase {phase_num} failed with return code {returncode} ({elapsed:.1f}s)")
+        return False
+
+
+# =============================================================================
+# DEPENDENCY-AWARE PARALLEL SCHEDULER (--jobs N)
+# =============================================================================
+
+def phase_dependencies(phases_to_run):
+    """Phase number -> set of earlier selected phases it has to wait for.
+
+    Phase b waits for an earlier phase a when b reads a file a writes, or
+    when both write the same file (the later phase's copy must win, as in a
+    sequential run). Only files count: a context intermediate is not shared
+    between pool workers, so waiting for its owner would only serialize the
+    run. Phases outside the selection are ignored: every phase can compute
+    its inputs on its own.
+    """
+    from build_cache import is_artifact
+    deps = {}
+    for b in phases_to_run:
+        _, _, inputs_b, outputs_b = PHASES[b]
+        files_b = {name for name in (*inputs_b, *outputs_b) if is_artifact(name)}
+        deps[b] = {a for a in phases_to_run if a < b and set(PHASES[a][3]) & files_b}
+    return deps
+
+
+class PrefixedStream:
+    """Line-buffered stdout for a worker: '[P06] ' on fd 1, plain text in the phase log.
+
+    Each complete line goes to the terminal in a single ``os.write``, so lines
+    from concurrent phases interleave but never mix.
+    """
+
+    encoding = 'utf-8'
+
+    def __init__(self, fd=1):
+        self.fd = fd
+        self.prefix = ''
+        self.log = None
+        self._partial = ''
+
+    def start(self, phase_num, log_path):
+        self.prefix = f"[P{phase_num:02d}] "
+        self.log = open(log_path, 'w')
+
+    def finish(self):
+        if self._partial:
+            self.write('\n')
+        if self.log is not None:
+            self.log.close()
+            self.log = None
+
+    def write(self, text):
+        lines = (self._partial + text).split('\n')
+        self._partial = lines.pop()
+        if lines:
+            os.write(self.fd, ''.join(f"{self.prefix}{line}\n" for line in lines).encode(self.encoding))
+            if self.log is not None:
+                self.log.write(''.join(f"{line}\n" for line in lines))
+        return len(text)
+
+    def flush(self):
+        if self.log is not None:
+            self.log.flush()
+
+    def isatty(self):
         return False
 
 
+_worker_stream = None
+
+
+def _init_worker(script_dir):
+    """Route a pool worker's stdout, stderr and logging through a PrefixedStream."""
+    import logging
+    global _worker_stream
+    sys.path.insert(0, script_dir)
+    os.chdir(script_dir)
+    _worker_stream = PrefixedStream()
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, logging.StreamHandler) and handler.stream in (sys.stdout, sys.__stdout__):
+            handler.setStream(_worker_stream)
+    sys.stdout = sys.stderr = _worker_stream
+
+
+def _run_phase_task(phase_num, isolated, log_dir):
+    """Pool task: run one phase with prefixed output; return its outcome for the summary."""
+    filename, description, _, _ = PHASES[phase_num]
+    _worker_stream.start(phase_num, os.path.join(log_dir, f"phase{phase_num:02d}.log"))
+    start = time.time()
+    try:
+        if isolated:
+            success = run_phase(phase_num, filename, description, capture=True)
+            stats = (0, 0, 0.0)
+        else:
+            from context import shared
+            before = (shared.hits, shared.misses, shared.saved_seconds())
+            success = run_phase_inprocess(phase_num, filename, description, shared)
+            stats = (shared.hits - before[0], shared.misses - before[1],
+                     shared.saved_seconds() - before[2])
+    finally:
+        _worker_stream.finish()
+    return success, time.time() - start, stats
+
+
+# =============================================================================
+# INCREMENTAL BUILD (skip up-to-date phases)
+# =============================================================================
+
+def plan_phase(cache, phase_num, force=False, explain=False):
+    """(fingerprint, rerun?) for a phase about to be dispatched."""
+    filename, _, inputs, outputs = PHASES[phase_num]
+    fingerprint = cache.fingerprint(filename, inputs)
+    reasons = ['--force'] if force else cache.explain(phase_num, fingerprint, outputs)
+    if explain:
+        verdict = f"rerun ({'; '.join(reasons)})" if reasons else "up to date, skipped"
+        print(f"[explain] Phase {phase_num:>2}: {verdict}", flush=True)
+    return fingerprint, bool(reasons)
+
+
+def finish_phase(cache, phase_num, fingerprint, success):
+    """Record a successful build; forget a failed one so it reruns next time."""
+    if success:
+        cache.record(phase_num, fingerprint, PHASES[phase_num][3])
+    else:
+        cache.forget(phase_num)
+
+
+def run_parallel(phases_to_run, jobs, isolated, cache, force=False, explain=False):
+    """Run the selected phases on ``jobs`` worker processes in dependency order.
+
+    Up-to-date phases count as finished as soon as they are reached. Returns
+    ({phase: success}, {phase: elapsed}, skipped phases, (reused, computed, saved_s)).
+    """
+    from config import OUTPUT_DIR
+    log_dir = os.path.join(str(OUTPUT_DIR), 'logs')
+    os.makedirs(log_dir, exist_ok=True)
+
+    deps = phase_dependencies(phases_to_run)
+    pending = list(phases_to_run)
+    running = {}
+    results, elapsed, totals = {}, {}, [0, 0, 0.0]
+    fingerprints, skipped = {}, set()
+
+    sys.stdout.flush()
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(SCRIPT_DIR,)) as pool:
+        while pending or running:
+            ready = [p for p in pending if deps[p] <= set(results)]
+            for phase_num in ready:
+                pending.remove(phase_num)
+                fingerprints[phase_num], rerun = plan_phase(cache, phase_num, force, explain)
+                if not rerun:
+                    results[phase_num], elapsed[phase_num] = True, 0.0
+                    skipped.add(phase_num)
+                    print(f"[run_all] phase {phase_num} up to date", flush=True)
+                    continue
+                running[pool.submit(_run_phase_task, phase_num, isolated, log_dir)] = phase_num
+                print(f"[run_all] started phase {phase_num}", flush=True)
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                phase_num = running.pop(future)
+                try:
+                    success, seconds, stats = future.result()
+                except Exception as e:  # worker died (e.g. killed or out of memory)
+                    print(f"[run_all] phase {phase_num} worker failed: {e!r}", flush=True)
+                    success, seconds, stats = False, 0.0, (0, 0, 0.0)
+                results[phase_num], elapsed[phase_num] = success, seconds
+                finish_phase(cache, phase_num, fingerprints[phase_num], success)
+                totals = [t + s for t, s in zip(totals, stats)]
+                status = "OK" if success else "FAILED"
+                print(f"[run_all] phase {phase_num} {status} ({seconds:.1f}s)", flush=True)
+    return results, elapsed, skipped, tuple(totals)
+
+
 def list_phases():
     """Print all available phases."""
     print("\nAvailable Phases:")
     print("-" * 70)
-    for num, (filename, desc) in sorted(PHASES.items()):
+    for num, (filename, desc, inputs, _) in sorted(PHASES.items()):
         print(f"  Phase {num:>2}: {desc}")
         print(f"           -> {filename}")
+        if inputs:
+            print(f"           uses: {', '.join(inputs)}")
     print()
 
 
+def parse_overrides(args):
+    """Remove ``--set PATH=VALUE`` pairs from ``args``; return {path: value}."""
+    overrides = {}
+    while '--set' in args:
+        i = args.index('--set')
+        if i + 1 >= len(args) or '=' not in args[i + 1]:
+            raise ValueError("--set needs PATH=VALUE")
+        path, raw = args[i + 1].split('=', 1)
+        try:
+            overrides[path.strip()] = json.loads(raw)
+        except ValueError:
+            overrides[path.strip()] = raw
+        del args[i:i + 2]
+    return overrides
+
+
 def main():
     print("=" * 80)
     print("PENNSYLVANIA HIGHER EDUCATION ECONOMIC IMPACT ANALYSIS")
@@ -94,12 +407,45 @@ def main():
         list_phases()
         return
 
-    if len(sys.argv) > 1 and sys.argv[1] != '--list':
+    flags = {'--isolated', '--force', '--explain', '--legacy-loop'}
+    isolated = '--isolated' in sys.argv
+    force = '--force' in sys.argv
+    explain = '--explain' in sys.argv
+    if '--legacy-loop' in sys.argv:
+        os.environ['PA_ECON_LEGACY_LOOP'] = '1'
+    args = [a for a in sys.argv[1:] if a not in flags]
+    jobs = 1
+    if '--jobs' in args:
+        i = args.index('--jobs')
+        try:
+            jobs = int(args[i + 1])
+        except (IndexError, ValueError):
+            jobs = 0
+        if jobs < 1:
+            print("ERROR: --jobs needs a positive number of workers")
+            sys.exit(1)
+        del args[i:i + 2]
+
+    sys.path.insert(0, SCRIPT_DIR)
+    from model_config import OVERRIDES_ENV, environ_config
+    try:
+        overrides = parse_overrides(args)
+        if overrides:
+            os.environ[OVERRIDES_ENV] = json.dumps({**environ_config().overrides, **overrides})
+        cfg = environ_config()
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    if cfg.overrides:
+        print("Config overrides: " + ', '.join(f'{k}={v!r}' for k, v in cfg.overrides.items()))
+
+    if args:
         # Run specific phases
         try:
-            phases_to_run = [int(x) for x in sys.argv[1:]]
+            phases_to_run = [int(x) for x in args]
         except ValueError:
-            print("Usage: python run_all.py [phase_numbers...]")
+            print("Usage: python run_all.py [--isolated] [--jobs N] [--force] [--explain] "
+                  "[--set PATH=VALUE ...] [--legacy-loop] [phase_numbers...]")
             print("       python run_all.py --list")
             sys.exit(1)
     else:
@@ -116,11 +462,37 @@ def main():
     # Run phases
     total_start = time.time()
     results = {}
+    elapsed = {}
+    skipped = set()
+    context = None
+    import config
+    from build_cache import BuildCache
+    cache = BuildCache(config.OUTPUT_DIR, SCRIPT_DIR, config, cfg)
+    if not isolated:
+        from context import shared as context   # imported before forking, so workers start warm
 
-    for phase_num in phases_to_run:
-        filename, description = PHASES[phase_num]
-        success = run_phase(phase_num, filename, description)
-        results[phase_num] = success
+    if jobs > 1:
+        results, elapsed, skipped, (reused, computed, saved) = run_parallel(
+            phases_to_run, jobs, isolated, cache, force, explain)
+    else:
+        for phase_num in phases_to_run:
+            filename, description, _, _ = PHASES[phase_num]
+            fingerprint, rerun = plan_phase(cache, phase_num, force, explain)
+            if not rerun:
+                print(f"\n  Phase {phase_num} up to date, skipped ({filename})")
+                results[phase_num], elapsed[phase_num] = True, 0.0
+                skipped.add(phase_num)
+                continue
+            start = time.time()
+            if isolated:
+                success = run_phase(phase_num, filename, description)
+            else:
+                success = run_phase_inprocess(phase_num, filename, description, context)
+            finish_phase(cache, phase_num, fingerprint, success)
+            results[phase_num] = success
+            elapsed[phase_num] = time.time() - start
+        if context is not None:
+            reused, computed, saved = context.hits, context.misses, context.saved_seconds()
 
     # Summary
     total_elapsed = time.time() - total_start
@@ -128,16 +500,25 @@ def main():
     print("EXECUTION SUMMARY")
     print("=" * 80)
 
-    succeeded = sum(1 for v in results.values() if v)
+    succeeded = sum(1 for p, v in results.items() if v and p not in skipped)
     failed = sum(1 for v in results.values() if not v)
 
     for phase_num, success in sorted(results.items()):
-        status = "OK" if success else "FAILED"
-        _, desc = PHASES[phase_num]
+        status = "UP-TO-DATE" if phase_num in skipped else ("OK" if success else "FAILED")
+        desc = PHASES[phase_num][1]
         print(f"  Phase {phase_num:>2}: [{status}] {desc}")
 
-    print(f"\nTotal: {succeeded} succeeded, {failed} failed")
+    print(f"\nTotal: {succeeded} succeeded, {failed} failed" +
+          (f", {len(skipped)} up to date" if skipped else ""))
     print(f"Total time: {total_elapsed:.1f}s")
+    if jobs > 1:
+        busy = sum(elapsed.values())
+        print(f"Sum of phase times: {busy:.1f}s on {jobs} workers")
+    if isolated:
+        print("Mode: isolated (one process per phase)")
+    else:
+        print(f"Mode: in-process (shared intermediates: {computed} computed, "
+              f"{reused} reused, ~{saved:.2f}s saved)")
     print("=" * 80)
 
     if failed > 0:
@@ -0,0 +1,281 @@
+"""Pennsylvania Higher Education Economic Impact Analysis — Scenario Matrix
+
+Runs the free-college projection (projection.py) for every combination of
+config.py parameter overrides declared in a TOML or YAML file, and writes one
+long-format table: a row per scenario, horizon and metric.
+
+    [scenario]
+    name = "tuition_vs_inflation"
+    mode = "grid"                 # Cartesian product of the values below
+    horizons = [5, 10, 20, 40]
+
+    [parameters]
+    inflation_rate = [0.02, 0.025, 0.03]
+    tuition_growth_rate = [0.0, 0.03, 0.05]
+    "enrollment_boost.PASSHE" = [0.10, 0.15, 0.20]   # dotted keys reach into dicts
+
+With ``mode = "sample"`` the matrix is ``samples`` random combinations
+(seeded by ``seed``). A parameter is then a list to choose from, or a
+distribution: ``{ dist = "uniform", low = 0.02, high = 0.04 }`` or
+``{ dist = "normal", mean = 0.012, sd = 0.005 }``.
+
+Any data symbol the projection reads can be overridden, including entries
+of its dicts; a path into anything else (``coa_stipend_coverage``, the
+Monte Carlo settings, ...) is rejected, since every scenario would report
+the same results. Each combination is a ``ModelConfig`` (``default_config().replace(...)``)
+passed to the engine, so derived totals (``total_pa_residents``,
+``param_distributions``, ...) follow the overridden data; they cannot be set
+directly.
+
+Results are cached per scenario in ``OUTPUT_DIR/.scenario_cache``, keyed by
+the config digest, the horizons and the source of config_data.py and
+projection.py, so rerunning a matrix only evaluates combinations it has not
+seen. ``--jobs N`` evaluates scenarios on N worker processes.
+
+Usage:
+    python scenarios.py scenarios/tuition_inflation.toml
+    python scenarios.py scenarios/tuition_inflation.toml --jobs 4
+    python scenarios.py scenarios/tuition_inflation.toml --no-cache
+
+Author: Oscar J. Mayorga
+Updated: March 3, 2026
+Repository: github.com/omayorga/Simulation
+"""
+
+import hashlib
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+
+import config_data
+from build_cache import file_digest
+from model_config import default_config, derived_inputs
+
+CACHE_DIR_NAME = '.scenario_cache'
+# horizon_results keys reported per horizon (annual_data is left out of the long table)
+SCENARIO_METRICS = (
+    'cumulative_state_cost', 'cumulative_new_graduates', 'cumulative_earnings_gain',
+    'cumulative_tax_revenue', 'cumulative_state_tax_only', 'cumulative_brain_drain_savings',
+    'cumulative_gdp_impact', 'state_roi', 'individual_roi_bachelor', 'individual_roi_associate',
+)
+
+
+# =============================================================================
+# SCENARIO FILES
+# =============================================================================
+
+def load_spec(path):
+    """Read a scenario file (.toml, or .yaml/.yml when PyYAML is installed)."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.toml':
+        import tomllib
+        with open(path, 'rb') as f:
+            return tomllib.load(f)
+    if ext in ('.yaml', '.yml'):
+        try:
+            import yaml
+        except ImportError:
+            raise ImportError("YAML scenario files need PyYAML (pip install pyyaml); "
+                              "TOML files work without it") from None
+        with open(path) as f:
+            return yaml.safe_load(f)
+    raise ValueError(f"Unsupported scenario file type {ext!r} (use .toml, .yaml or .yml)")
+
+
+class ScenarioMatrix:
+    """Parameter overrides and how to combine them, as declared in a scenario file."""
+
+    def __init__(self, spec, default_name='scenarios'):
+        base = default_config()
+        settings = spec.get('scenario', {})
+        self.name = settings.get('name', default_name)
+        self.mode = settings.get('mode', 'grid')
+        self.samples = int(settings.get('samples', 100))
+        self.seed = int(settings.get('seed', base.RANDOM_SEED))
+        self.horizons = [int(h) for h in settings.get('horizons', base.simulation_horizons)]
+        self.parameters = spec.get('parameters', {})
+        if self.mode not in ('grid', 'sample'):
+            raise ValueError(f"scenario mode must be 'grid' or 'sample', not {self.mode!r}")
+        if not self.parameters:
+            raise ValueError("scenario file declares no [parameters]")
+        for path, values in self.parameters.items():
+            if self.mode == 'grid' and not isinstance(values, list):
+                raise ValueError(f"{path}: grid mode needs a list of values")
+        # Check every path against config before evaluating anything
+        example = self.combinations()[0] if self.mode == 'grid' else {p: None for p in self.parameters}
+        base.replace(**example)
+        inputs = engine_inputs(self.horizons)
+        unread = [p for p in self.parameters if p.split('.')[0] not in inputs]
+        if unread:
+            raise ValueError(f"not read by the free-college projection, so they would not change "
+                             f"any result: {', '.join(unread)} (it reads {', '.join(sorted(inputs))})")
+
+    def combinations(self):
+        """List of {parameter path: value} dicts, one per scenario."""
+        paths = list(self.parameters)
+        if self.mode == 'grid':
+            return [dict(zip(paths, values))
+                    for values in itertools.product(*(self.parameters[p] for p in paths))]
+        import numpy as np
+        rng = np.random.default_rng(self.seed)
+        columns = {p: _sample(rng, p, self.parameters[p], self.samples) for p in paths}
+        return [{p: columns[p][k] for p in paths} for k in range(self.samples)]
+
+
+def _sample(rng, path, values, n):
+    if isinstance(values, list):
+        return [values[i] for i in rng.integers(len(values), size=n)]
+    dist = values.get('dist')
+    if dist == 'uniform':
+        return rng.uniform(values['low'], values['high'], n).tolist()
+    if dist == 'normal':
+        return rng.normal(values['mean'], values['sd'], n).tolist()
+    raise ValueError(f"{path}: expected a list or a uniform/normal distribution, got {values!r}")
+
+
+# =============================================================================
+# EVALUATION
+# =============================================================================
+
+def evaluate_scenario(overrides, horizons):
+    """Free-college horizon results with ``overrides`` applied: [(horizon, metric, value)]."""
+    from projection import free_college_results
+    cfg = default_config().replace(**overrides)
+    results = free_college_results(horizons, cfg=cfg)
+    return [(h, metric, float(results[h][metric])) for h in horizons for metric in SCENARIO_METRICS]
+
+
+class _ReadRecorder:
+    """Passes attribute reads through to a config and records the names read."""
+
+    def __init__(self, cfg):
+        self.cfg, self.names = cfg, set()
+
+    def __getattr__(self, name):
+        value = getattr(self.cfg, name)
+        self.names.add(name)
+        return value
+
+
+def engine_inputs(horizons):
+    """Config data names ``evaluate_scenario`` reads, directly or through derived totals."""
+    from projection import free_college_results
+    recorder = _ReadRecorder(default_config())
+    free_college_results(horizons, cfg=recorder)
+    inputs = set()
+    for name in recorder.names:
+        inputs.update(derived_inputs(name) if name in config_data.DERIVED else {name})
+    return inputs
+
+
+def _evaluate_task(args):
+    overrides, horizons = args
+    return evaluate_scenario(overrides, horizons)
+
+
+def scenario_key(overrides, horizons, sources):
+    cfg = default_config().replace(**overrides)
+    payload = json.dumps({'config': cfg.digest, 'horizons': horizons, 'sources': sources},
+                         sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def run_matrix(matrix, output_dir, jobs=1, use_cache=True):
+    """Evaluate every combination; return (long-format DataFrame, number served from cache)."""
+    import pandas as pd
+    combos = matrix.combinations()
+    sources = {m: file_digest(os.path.join(SCRIPT_DIR, f'{m}.py')) for m in ('config_data', 'model_config', 'projection')}
+    cache_dir = os.path.join(str(output_dir), CACHE_DIR_NAME)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    keys = [scenario_key(c, matrix.horizons, sources) for c in combos]
+    rows_by_key = {}
+    if use_cache:
+        for key in set(keys):
+            path = os.path.join(cache_dir, f'{key}.json')
+            if os.path.exists(path):
+                with open(path) as f:
+                    rows_by_key[key] = [tuple(r) for r in json.load(f)]
+    cached = sum(1 for k in keys if k in rows_by_key)
+
+    todo = {}
+    for key, combo in zip(keys, combos):
+        if key not in rows_by_key:
+            todo.setdefault(key, combo)
+    tasks = [(todo[k], matrix.horizons) for k in todo]
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            evaluated = list(pool.map(_evaluate_task, tasks, chunksize=max(1, len(tasks) // (4 * jobs))))
+    else:
+        evaluated = [_evaluate_task(t) for t in tasks]
+    for key, rows in zip(todo, evaluated):
+        rows_by_key[key] = rows
+        tmp = os.path.join(cache_dir, f'{key}.{os.getpid()}.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(rows, f)
+        os.replace(tmp, os.path.join(cache_dir, f'{key}.json'))
+
+    records = []
+    for scenario_id, (key, combo) in enumerate(zip(keys, combos)):
+        for horizon, metric, value in rows_by_key[key]:
+            records.append({'scenario': scenario_id, **combo,
+                            'horizon': horizon, 'metric': metric, 'value': value})
+    return pd.DataFrame(records), cached
+
+
+def main():
+    args = sys.argv[1:]
+    jobs = 1
+    if '--jobs' in args:
+        i = args.index('--jobs')
+        try:
+            jobs = int(args[i + 1])
+        except (IndexError, ValueError):
+            jobs = 0
+        if jobs < 1:
+            print("ERROR: --jobs needs a positive number of workers")
+            sys.exit(1)
+        del args[i:i + 2]
+    use_cache = '--no-cache' not in args
+    args = [a for a in args if a != '--no-cache']
+    if len(args) != 1:
+        print("Usage: python scenarios.py SCENARIO_FILE [--jobs N] [--no-cache]")
+        sys.exit(1)
+
+    from config import OUTPUT_DIR
+    spec_path = args[0]
+    try:
+        matrix = ScenarioMatrix(load_spec(spec_path),
+                                default_name=os.path.splitext(os.path.basename(spec_path))[0])
+    except (OSError, ValueError, ImportError) as e:
+        print(f"ERROR: {spec_path}: {e}")
+        sys.exit(1)
+
+    print("=" * 80)
+    print(f"SCENARIO MATRIX: {matrix.name} ({matrix.mode})")
+    print("=" * 80)
+    for path, values in matrix.parameters.items():
+        print(f"  {path}: {values}")
+
+    start = time.time()
+    df, cached = run_matrix(matrix, OUTPUT_DIR, jobs=jobs, use_cache=use_cache)
+    n_scenarios = df['scenario'].nunique()
+    output_path = OUTPUT_DIR / f'scenario_{matrix.name}.csv'
+    df.to_csv(output_path, index=False)
+
+    longest = max(matrix.horizons)
+    roi = df[(df['metric'] == 'state_roi') & (df['horizon'] == longest)]
+    print(f"\n{n_scenarios} scenarios ({cached} from cache), {len(df):,} rows in {time.time() - start:.1f}s")
+    print(f"{longest}-year state ROI: min {roi['value'].min():.3f}, "
+          f"median {roi['value'].median():.3f}, max {roi['value'].max():.3f}")
+    print(f"Saved: {output_path.name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+# Wealth Model Simulation Package (shared by the IDR and debt-forgiveness scripts)
@@ -0,0 +1,242 @@
+"""Batched, common-random-number version of the IDR net-worth kernel.
+
+``simulate_wealth_with_idr`` in IDR_Plans_Analysis_SaveLocal.py evaluates one
+(group, plan, macro scenario) cell per call with fresh random draws. Here one
+set of standard draws is shared by every group and every scenario (common
+random numbers), and each balance-sheet component is evolved only over the
+scenario axes it actually depends on:
+
+    liquid assets      -> (repayment schedule, mortgage rate)
+    home equity        -> (appreciation rate, mortgage rate)
+    mortgage balance   -> (mortgage rate)
+    student loan       -> (initial debt level, repayment schedule)
+    retirement, consumer debt -> no scenario axis
+
+Mean net worth for every point of the full grid is then the broadcast sum of
+the component means, which is exact (means are linear) while the expensive
+per-individual work stays proportional to the largest 2-D slice rather than
+the full Cartesian product. Individuals are processed in chunks so memory is
+bounded by ``chunk_size``.
+
+The stage updates themselves (repayment, mortgage, home appreciation,
+retirement, savings) are the ones ``core.simulate_net_worth`` uses, applied
+to arrays with the scenario axes in front of the individual axis.
+"""
+
+import numpy as np
+
+from .core import (IDRRepayment, appreciate_homes, mortgage_stage, retirement_stage,
+                   savings_stage)
+
+
+def repayment_schedule(settings, fpl_base):
+    """Turn an ``idr_plans`` entry into (repayment_rate, years, fpl_threshold)."""
+    return (settings['repayment_rate'], settings['years'],
+            fpl_base * settings['fpl_multiplier'])
+
+
+def draw_scalars(gen, n_stages):
+    """Per-run scalar shocks (home-purchase-rate MOE and per-stage employment SE)."""
+    return {
+        'z_home_rate': float(gen.standard_normal()),
+        'z_emp_rate': gen.standard_normal(n_stages),
+    }
+
+
+def draw_chunk(gen, n, n_stages, earners=1):
+    """Per-individual standard draws shared by every group and scenario.
+
+    Draws for a second earner are appended only when some group needs them,
+    so single-earner runs consume exactly the same stream as before.
+    """
+    draws = {
+        'z_income': gen.standard_normal(n),
+        'u_liquid': gen.random(n),
+        'u_home': gen.random(n),
+        'z_debt': gen.standard_normal(n),
+        'u_employed': gen.random((n_stages, n)),
+    }
+    if earners > 1:
+        draws['z_income_2'] = gen.standard_normal(n)
+        draws['u_employed_2'] = gen.random((n_stages, n))
+    return draws
+
+
+def group_draws(group, draws, scalars, model, factor=1.0):
+    """Map standard draws onto one demographic group.
+
+    ``group`` keys: income, income_se, home_rate, home_rate_moe, emp_rates,
+    and optionally earners (1 or 2). Home ownership and employment use the
+    shared uniforms against group-specific thresholds, so groups are
+    monotonically coupled. A second earner draws income and employment
+    independently from the same distribution; the household's income (and
+    so its home price, starting savings and IDR payment) is the sum.
+    """
+    mean_income = float(group['income'] * factor)
+
+    def earner_income(z):
+        if group.get('income_se', 0.0) > 0:
+            return np.maximum(mean_income + group['income_se'] * z, 0.0)
+        return np.full(z.shape, mean_income)
+
+    home_rate = group['home_rate']
+    if group.get('home_rate_moe', 0.0) > 0:
+        home_rate = float(np.clip(home_rate + group['home_rate_moe'] / 1.645 * scalars['z_home_rate'],
+                                  0.0, 1.0))
+    owns = draws['u_home'] < home_rate
+
+    emp = np.clip(np.asarray(group['emp_rates'], dtype=float)
+                  + model['employment_rates_se'] * scalars['z_emp_rate'], 0.0, 1.0)
+    growth = np.asarray(model['salary_growth_factors'], dtype=float)[:, None]
+
+    income = earner_income(draws['z_income'])
+    annual_income = (draws['u_employed'] < emp[:, None]) * (income[None, :] * growth)
+    if group.get('earners', 1) > 1:
+        income_2 = earner_income(draws['z_income_2'])
+        annual_income = annual_income + (draws['u_employed_2'] < emp[:, None]) * (income_2[None, :] * growth)
+        income = income + income_2
+
+    return {
+        'income': income,
+        'owns': owns,
+        'annual_income': annual_income,                      # (stages, n)
+        'liquid0': income * (0.1 + 0.2 * draws['u_liquid']),
+        'z_debt': draws['z_debt'],
+    }
+
+
+def component_sums(g, schedules, mortgage_rates, appreciation_rates, debt_levels, debt_se, model):
+    """Sum each balance-sheet component over the individuals in one chunk.
+
+    Returns a dict of arrays indexed by the axes each component depends on:
+        liquid (S, M), home_equity (A, M), mortgage (M,), student_loan (D, S),
+        retirement (), consumer_debt (), forgiven (D, S)
+    where S = repayment schedules, M = mortgage rates, A = appreciation rates,
+    D = debt levels. ``forgiven`` is the student-loan balance written off at
+    the end of the repayment period; it is not part of net worth and feeds
+    the federal-cost side of the plan optimizer.
+    """
+    years = np.asarray(model['stage_durations'])
+    starts = np.concatenate([[0], np.cumsum(years)[:-1]])
+    total_years = int(years.sum())
+    A = g['annual_income']
+    owns = g['owns']
+    n_stages, n = A.shape
+
+    # One IDR strategy for all schedules: parameters are (S, 1) columns
+    repayment = IDRRepayment(np.array([s[0] for s in schedules], dtype=float)[:, None],
+                             np.array([s[1] for s in schedules])[:, None],
+                             np.array([s[2] for s in schedules], dtype=float)[:, None],
+                             model['student_loan_interest_rate'])
+
+    m = np.asarray(mortgage_rates, dtype=float)[:, None]
+    a_real = np.asarray(appreciation_rates, dtype=float) - model['inflation_rate']
+    debt = np.asarray(debt_levels, dtype=float)[:, None]
+
+    # ── Mortgage (M, n) ──
+    price = g['income'] * model['average_home_price_multiplier']
+    mortgage = np.where(owns, price * (1 - model['mortgage_down_payment']), 0.0)[None, :].repeat(len(m), 0)
+
+    # ── Liquid assets (S, M, n), student loans (D, S, n), retirement (n) ──
+    liquid = np.broadcast_to(g['liquid0'], (len(schedules), len(m), n)).copy()
+    loan = np.maximum(debt + debt_se * g['z_debt'][None, :], 0.0) if debt_se > 0 else \
+        np.broadcast_to(debt, (len(debt), n)).copy()
+    loan = repayment.start(np.repeat(loan[:, None, :], len(schedules), axis=1))
+    retirement = np.zeros(n)
+    asset_growth = 1 + model['personal_asset_growth_rate_real']
+    ret_growth = 1 + model['retirement_real_return']
+
+    for k in range(n_stages):
+        y = years[k]
+        payment, loan = repayment.advance(loan, A[k][None, :], starts[k])         # (S, n), (D, S, n)
+        mortgage_payment, mortgage = mortgage_stage(k, mortgage, m, model['mortgage_term_years'])
+        retirement = retirement_stage(retirement, A[k], model['retirement_investment_rate'],
+                                      ret_growth ** y)
+        liquid = savings_stage(liquid, A[k], payment[:, None, :], mortgage_payment,
+                               y, asset_growth ** y)
+
+    # Forgiveness at the end of each schedule's repayment period
+    before = loan
+    loan = repayment.finish(loan, total_years)
+    forgiven = (before - loan).sum(axis=2)
+
+    # ── Home equity (A, M): owners' homes appreciate stage by stage ──
+    home_equity = np.empty((len(a_real), len(m)))
+    for j, a in enumerate(a_real):
+        value = price.copy()
+        for y in years:
+            appreciate_homes(value, owns, (1 + a) ** y)
+        home_equity[j] = np.maximum(value[None, :] - mortgage, 0.0).sum(axis=1)
+
+    consumer = np.where(owns, 0.0, A[-1] * 0.05)
+
+    return {
+        'liquid': liquid.sum(axis=2),
+        'home_equity': home_equity,
+        'mortgage': mortgage.sum(axis=1),
+        'student_loan': loan.sum(axis=2),
+        'retirement': retirement.sum(),
+        'consumer_debt': consumer.sum(),
+        'forgiven': forgiven,
+    }
+
+
+def mean_components_grid(groups, schedules, mortgage_rates, appreciation_rates, debt_levels,
+                         model, n_individuals, debt_se=0.0, factor=1.0, seed=42,
+                         chunk_size=50_000, wrap_random=None):
+    """Per-individual means of every ``component_sums`` entry, per group.
+
+    Same draws and arguments as ``mean_net_worth_grid``; returns
+    ``{group_name: {component: array}}`` with the component axes documented
+    in ``component_sums``. ``wrap_random`` (e.g. ``RunProfiler.timed_random``)
+    wraps the Generator so its draws are timed; the values are unchanged.
+    """
+    gen = np.random.default_rng(seed)
+    if wrap_random is not None:
+        gen = wrap_random(gen)
+    n_stages = len(model['stage_durations'])
+    scalars = draw_scalars(gen, n_stages)
+    earners = max(group.get('earners', 1) for group in groups.values())
+    totals = {name: None for name in groups}
+
+    remaining = int(n_individuals)
+    while remaining > 0:
+        n = min(chunk_size, remaining)
+        remaining -= n
+        draws = draw_chunk(gen, n, n_stages, earners)
+        for name, group in groups.items():
+            g = group_draws(group, draws, scalars, model, factor)
+            sums = component_sums(g, schedules, mortgage_rates, appreciation_rates,
+                                  debt_levels, debt_se, model)
+            if totals[name] is None:
+                totals[name] = sums
+            else:
+                for key in sums:
+                    totals[name][key] = totals[name][key] + sums[key]
+
+    return {name: {k: v / n_individuals for k, v in t.items()} for name, t in totals.items()}
+
+
+def net_worth_from_components(means):
+    """Assemble mean net worth (M, A, D, S) from one group's component means."""
+    return (means['liquid'].T[:, None, None, :]                     # (M, 1, 1, S)
+            + means['home_equity'].T[:, :, None, None]              # (M, A, 1, 1)
+            - means['mortgage'][:, None, None, None]                # (M, 1, 1, 1)
+            - means['student_loan'][None, None, :, :]               # (1, 1, D, S)
+            + means['retirement'] - means['consumer_debt'])
+
+
+def mean_net_worth_grid(groups, schedules, mortgage_rates, appreciation_rates, debt_levels,
+                        model, n_individuals, debt_se=0.0, factor=1.0, seed=42,
+                        chunk_size=50_000, wrap_random=None):
+    """Mean net worth for every group over the (mortgage, appreciation, debt, schedule) grid.
+
+    All groups see the same standard draws (common random numbers), so
+    differences between groups and between grid points are free of
+    independent-sampling noise. Returns ``{group_name: array (M, A, D, S)}``.
+    """
+    means = mean_components_grid(groups, schedules, mortgage_rates, appreciation_rates,
+                                 debt_levels, model, n_individuals, debt_se=debt_se,
+                                 factor=factor, seed=seed, chunk_size=chunk_size,
+                                 wrap_random=wrap_random)
+    return {name: net_worth_from_components(m) for name, m in means.items()}
@@ -0,0 +1,173 @@
+"""Batch-means confidence intervals for Monte Carlo net-worth cells.
+
+``summarize`` in the IDR script gives a normal-approximation CI for the mean
+only. Here every statistic reported from a cell (means, medians, other
+quantiles and ratios of means such as the racial gap) gets a CI from the
+same batch-means / sectioning scheme:
+
+    * the point estimate is computed on the full sample;
+    * the sample is split into ``n_batches`` contiguous batches (individuals
+      are i.i.d. within a cell, so batches are independent replicates);
+    * the statistic is recomputed on each batch, and its standard error is
+      the spread of the batch estimates / sqrt(n_batches);
+    * the CI uses Student-t with n_batches - 1 degrees of freedom.
+
+This costs one extra pass over each array (a reshape and one vectorized
+``np.quantile`` along the batch axis) instead of the thousands of resamples a
+naive bootstrap needs: medians and four quantiles for all 162 cells take
+about two seconds at 200k individuals per cell.
+
+Ratios of means pair batch b of the numerator with batch b of the
+denominator, which stays valid whether the two cells share random numbers
+(as in the batched kernel) or are independent (as in the per-cell kernel).
+
+``BatchAccumulator`` gives the same mean / ratio CIs from streamed chunks
+(e.g. the chunked batched kernel) without keeping the samples. Quantiles
+need stored samples.
+
+Means and batch means go through reductions.py (fixed blocks, fsum), so a
+CI does not change in the last bit when the sample is chunked or reduced by
+a different number of workers.
+
+Note: like ``summarize``, the CIs cover Monte Carlo noise across individuals
+given a cell's per-run shocks (home-rate MOE draw, employment SE draws).
+"""
+
+import numpy as np
+
+from .reductions import BlockReducer, mean, row_means
+
+DEFAULT_BATCHES = 40
+Z975 = 1.959963984540054
+
+
+def t_critical(df, z=Z975):
+    """Two-sided 95% Student-t critical value (Cornish-Fisher, exact to ~1e-4 for df >= 10)."""
+    df = float(df)
+    return (z + (z ** 3 + z) / (4 * df)
+            + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * df ** 2)
+            + (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / (384 * df ** 3))
+
+
+def _batches(arr, n_batches):
+    """View the first n_batches * (len // n_batches) samples as (n_batches, size)."""
+    arr = np.asarray(arr, dtype=float).ravel()
+    n_batches = int(min(n_batches, len(arr)))
+    if n_batches < 2:
+        raise ValueError(f"need at least 2 samples for a batch-means CI, got {len(arr)}")
+    size = len(arr) // n_batches
+    return arr[:n_batches * size].reshape(n_batches, size)
+
+
+def batch_interval(point, batch_values, axis=0):
+    """(point, ci95_low, ci95_high) from per-batch estimates along ``axis``."""
+    batch_values = np.asarray(batch_values, dtype=float)
+    k = batch_values.shape[axis]
+    half = t_critical(k - 1) * batch_values.std(axis=axis, ddof=1) / np.sqrt(k)
+    return point, point - half, point + half
+
+
+def mean_ci(arr, n_batches=DEFAULT_BATCHES):
+    """(mean, ci95_low, ci95_high) for the mean of ``arr``."""
+    b = _batches(arr, n_batches)
+    return batch_interval(mean(arr), row_means(b))
+
+
+def quantile_ci(arr, q, n_batches=DEFAULT_BATCHES):
+    """(value, ci95_low, ci95_high) for quantile(s) ``q`` of ``arr``.
+
+    ``q`` may be a scalar or a sequence; with a sequence each element of the
+    returned triple is an array with one entry per quantile.
+    """
+    point = np.quantile(arr, q)
+    b = _batches(arr, n_batches)
+    return batch_interval(point, np.quantile(b, q, axis=1), axis=-1 if np.ndim(q) == 0 else 1)
+
+
+def median_ci(arr, n_batches=DEFAULT_BATCHES):
+    """(median, ci95_low, ci95_high)."""
+    return quantile_ci(arr, 0.5, n_batches)
+
+
+def ratio_ci(num, den, n_batches=DEFAULT_BATCHES):
+    """(mean(num) / mean(den), ci95_low, ci95_high) with batches paired by index."""
+    bn = _batches(num, n_batches)
+    bd = _batches(den, n_batches)
+    k = min(len(bn), len(bd))
+    return batch_interval(mean(num) / mean(den), row_means(bn[:k]) / row_means(bd[:k]))
+
+
+def gap_pct_ci(group, reference, n_batches=DEFAULT_BATCHES):
+    """Wealth gap (mean(group) / mean(reference) - 1) * 100 with its CI."""
+    r, lo, hi = ratio_ci(group, reference, n_batches)
+    return (r - 1) * 100, (lo - 1) * 100, (hi - 1) * 100
+
+
+def cell_summary(arr, quantiles=(0.10, 0.25, 0.75, 0.90), n_batches=DEFAULT_BATCHES):
+    """Median and quantiles of one cell, each with a batch-means 95% CI, as plain floats."""
+    med, med_lo, med_hi = median_ci(arr, n_batches)
+    out = {
+        'median': float(med),
+        'median_ci95_low': float(med_lo),
+        'median_ci95_high': float(med_hi),
+        'quantiles': {},
+    }
+    if quantiles:
+        vals, lows, highs = quantile_ci(arr, list(quantiles), n_batches)
+        for q, v, lo, hi in zip(quantiles, vals, lows, highs):
+            out['quantiles'][f'p{int(round(q * 100))}'] = {
+                'value': float(v), 'ci95_low': float(lo), 'ci95_high': float(hi),
+            }
+    return out
+
+
+class BatchAccumulator:
+    """Streaming batch-means accumulator for means (and ratios of means).
+
+    Feed chunks with ``add``; samples are dealt to batches by their global
+    index, so the result matches ``mean_ci`` on the concatenated stream up
+    to the batch boundaries. Chunks may arrive in any order (pass ``start``)
+    and accumulators filled by different workers can be combined with
+    ``merge``; the result is the same bits for any chunking or worker count.
+    """
+
+    def __init__(self, total, n_batches=DEFAULT_BATCHES):
+        self.n_batches = int(n_batches)
+        self.batch_size = max(int(total) // self.n_batches, 1)
+        self.overall = BlockReducer()
+        self.batches = [BlockReducer() for _ in range(self.n_batches)]
+        self.n = 0
+
+    def add(self, chunk, start=None):
+        chunk = np.asarray(chunk, dtype=float).ravel()
+        start = self.overall.next_start if start is None else int(start)
+        self.overall.add(chunk, start)
+        pos, end = start, start + len(chunk)
+        while pos < end:
+            b = min(pos // self.batch_size, self.n_batches - 1)
+            stop = end if b == self.n_batches - 1 else min(end, (b + 1) * self.batch_size)
+            self.batches[b].add(chunk[pos - start:stop - start], pos - b * self.batch_size)
+            pos = stop
+        self.n += len(chunk)
+
+    def merge(self, other):
+        """Fold in an accumulator that saw other (disjoint) samples of the stream."""
+        self.overall.merge(other.overall)
+        for mine, theirs in zip(self.batches, other.batches):
+            mine.merge(theirs)
+        self.n += other.n
+        return self
+
+    def mean(self):
+        return self.overall.mean()
+
+    def batch_means(self):
+        return np.array([b.mean() if b.n else 0.0 for b in self.batches])
+
+    def mean_ci(self):
+        return batch_interval(self.mean(), self.batch_means())
+
+    def ratio_ci(self, other):
+        """CI for self.mean / other.mean, batches paired by index."""
+        return batch_interval(self.mean() / other.mean(),
+                              self.batch_means() / other.batch_means())
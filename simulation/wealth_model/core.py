@@ -0,0 +1,554 @@
+"""Shared wealth-simulation core for the IDR and debt-forgiveness scripts.
+
+Both root scripts model the same thing -- draw incomes, then evolve
+employment, housing, retirement and student debt over four career stages.
+The stage updates live here once (``mortgage_stage``, ``appreciate_homes``,
+``retirement_stage``, ``savings_stage`` and the repayment strategies for the
+balance sheet; ``simple_wealth_step`` for the single account) and every
+engine applies them:
+
+    simulate_net_worth      full balance sheet, one cell (IDR_Plans_Analysis_SaveLocal.py)
+    simulate_simple_wealth  single wealth account, one cell (reference kernel for
+                            forgiveness.py, which drives WealthSimulation_DebtForgive)
+    batched_kernel          balance sheet over scenario grids (Parts 4D, 5 and 6)
+    forgiveness             single account over policy x group x bracket grids
+
+How student debt is repaid is pluggable. A repayment strategy turns the
+initial debt into a balance (``start``), is advanced once per stage or
+sub-step (``advance`` -> payment, new balance) and settles the balance at the
+end (``finish``):
+
+    FixedRateRepayment    fixed share of the original debt per stage, flat
+                          (legacy DebtForgive model) or amortizing
+    IDRRepayment          share of income above an FPL threshold, forgiven
+                          after the plan's repayment period
+    ForgivenessRepayment  forgives part of the debt up front, then delegates
+                          to another strategy
+
+``LoanAccounting`` records the federal side of the same pass: payments,
+interest accrued and forgiven balance per individual.
+
+Strategies and stage updates work elementwise on arrays of any shape, so
+the batched engines can stack scenario axes in front of the individual axis.
+tests/test_wealth_core.py checks the batched engines against the per-cell
+kernels on the same draws.
+
+The per-cell kernels take a legacy-API random source (``np.random``, a
+``RandomState`` or the profiler's timing proxy) and draw in the same order
+as the original scripts, so their outputs are unchanged.
+"""
+
+import numpy as np
+
+
+def model_params_from(namespace):
+    """Collect the IDR model constants from the IDR script's module namespace.
+
+    Called at simulation time so the sensitivity helpers' temporary
+    overrides of module globals are picked up.
+    """
+    keys = [
+        'inflation_rate', 'stage_durations', 'salary_growth_factors',
+        'employment_rates_se', 'student_loan_interest_rate',
+        'average_home_price_multiplier', 'mortgage_down_payment',
+        'mortgage_term_years', 'mortgage_interest_rate',
+        'home_appreciation_rate_real', 'retirement_investment_rate',
+        'retirement_real_return', 'personal_asset_growth_rate_real',
+    ]
+    return {k: namespace[k] for k in keys}
+
+
+def forgiven_amount(debt, policy):
+    """Amount forgiven per borrower under one (kind, amount) policy.
+
+    'share' forgives a fraction of the balance, 'cap' forgives up to a
+    dollar amount per borrower.
+    """
+    kind, amount = policy
+    if kind == 'share':
+        return debt * amount
+    if kind == 'cap':
+        return np.clip(debt, 0.0, amount)
+    raise ValueError(f"unknown forgiveness policy kind {kind!r}")
+
+
+# =============================================================================
+# Repayment strategies
+# =============================================================================
+class RepaymentStrategy:
+    """Base class: no repayment, balance carried unchanged.
+
+    ``tracks_balance`` says whether the balance is a liability that payments
+    reduce. Net worth is then assets minus the outstanding balance, so a
+    payment only moves cash into debt reduction and only interest lowers net
+    worth. The legacy flat installment (``FixedRateRepayment(amortize=False)``)
+    never reduces its balance; its debt is charged against wealth up front and
+    the payments on top, as the original DebtForgive script did.
+    """
+
+    tracks_balance = True
+
+    def start(self, debt):
+        return debt
+
+    def advance(self, balance, annual_income, elapsed_years):
+        return 0.0, balance
+
+    def finish(self, balance, elapsed_years):
+        return balance
+
+    def accrued_interest(self, balance):
+        """Interest the next ``advance`` will add to ``balance`` (for cost accounting)."""
+        return 0.0
+
+
+class FixedRateRepayment(RepaymentStrategy):
+    """Pay ``rate`` x the original debt each stage.
+
+    amortize=False is the original WealthSimulation_DebtForgive rule: the
+    payment is made every stage and the balance never falls. With
+    amortize=True the balance accrues ``interest_rate`` per stage and the
+    installment is paid only while a balance is outstanding. ``steps``
+    splits each stage's installment and interest across sub-steps.
+    The amortizing path updates the balance array passed to ``start`` in place.
+    """
+
+    def __init__(self, rate, amortize=False, interest_rate=0.0, steps=1):
+        self.rate = rate
+        self.amortize = amortize
+        self.steps = int(steps)
+        self.growth = (1.0 + interest_rate) ** (1.0 / self.steps)
+
+    @property
+    def tracks_balance(self):
+        return self.amortize
+
+    def start(self, debt):
+        self.installment = np.multiply(debt, self.rate)
+        if not self.amortize:
+            return debt
+        np.maximum(self.installment, 0.0, out=self.installment)
+        self.installment /= self.steps
+        self.payment = np.empty_like(self.installment)
+        return debt
+
+    def advance(self, balance, annual_income=None, elapsed_years=0):
+        if not self.amortize:
+            return self.installment, balance
+        balance *= self.growth
+        # Pay the installment, or what is left of the balance (nothing if negative)
+        np.clip(balance, 0.0, self.installment, out=self.payment)
+        balance -= self.payment
+        return self.payment, balance
+
+    def accrued_interest(self, balance):
+        return balance * (self.growth - 1.0) if self.amortize else 0.0
+
+
+class IDRRepayment(RepaymentStrategy):
+    """Income-driven repayment: ``repayment_rate`` x income above the threshold.
+
+    Payments stop after ``years``; the balance grows at ``interest_rate`` per
+    stage and whatever remains is forgiven once ``years`` have elapsed.
+    ``repayment_rate``, ``years`` and ``fpl_threshold`` may be arrays that
+    broadcast against the income and balance, e.g. one row per plan in the
+    batched kernel.
+    """
+
+    def __init__(self, repayment_rate, years, fpl_threshold, interest_rate):
+        self.repayment_rate = repayment_rate
+        self.years = years
+        self.fpl_threshold = fpl_threshold
+        self.interest_rate = interest_rate
+
+    @classmethod
+    def from_plan(cls, idr_settings, fpl_base, interest_rate):
+        """Build from an ``idr_plans`` entry and a base poverty line."""
+        return cls(idr_settings['repayment_rate'], idr_settings['years'],
+                   fpl_base * idr_settings['fpl_multiplier'], interest_rate)
+
+    def start(self, debt):
+        return debt.copy()
+
+    def advance(self, balance, annual_income, elapsed_years):
+        discretionary_income = np.maximum(annual_income - self.fpl_threshold, 0.0)
+        payment = np.where(np.less(elapsed_years, self.years),
+                           discretionary_income * self.repayment_rate, 0.0)
+        interest = balance * self.interest_rate
+        balance = np.maximum(balance + interest - payment, 0.0)
+        return payment, balance
+
+    def finish(self, balance, elapsed_years):
+        return np.where(np.greater_equal(elapsed_years, self.years), 0.0, balance)
+
+    def accrued_interest(self, balance):
+        return balance * self.interest_rate
+
+
+class ForgivenessRepayment(RepaymentStrategy):
+    """Forgive part of the debt up front (see ``forgiven_amount``), then repay with ``inner``."""
+
+    def __init__(self, policy, inner):
+        self.policy = policy
+        self.inner = inner
+
+    def start(self, debt):
+        self.forgiven = forgiven_amount(debt, self.policy)
+        return self.inner.start(debt - self.forgiven)
+
+    def advance(self, balance, annual_income, elapsed_years):
+        return self.inner.advance(balance, annual_income, elapsed_years)
+
+    def finish(self, balance, elapsed_years):
+        return self.inner.finish(balance, elapsed_years)
+
+    @property
+    def tracks_balance(self):
+        return self.inner.tracks_balance
+
+    def accrued_interest(self, balance):
+        return self.inner.accrued_interest(balance)
+
+
+class LoanAccounting:
+    """Per-individual federal student-loan flows, filled in by ``simulate_net_worth``.
+
+    Arrays (one entry per individual, real dollars):
+        disbursed     initial balance lent
+        interest      interest accrued on the balance (once per stage, as the
+                      balance model accrues it)
+        payments      payments applied to the balance (federal receipts)
+        pv_payments   ``payments`` discounted to year 0 at ``discount_rate``,
+                      each stage's payment dated at the stage start
+        forgiven      balance written off, up front or at the end of the term
+        outstanding   balance still owed at the end of the career
+        outlays       what the borrower pays: the annual payment for every
+                      year of its stage, as the savings equation charges it
+                      (continues after payoff while the plan term runs)
+        net_cost      disbursed - pv_payments - outstanding discounted from the
+                      end of the career (federal cost in present value)
+
+    disbursed + interest = payments + forgiven + outstanding, per individual.
+    Accounting draws no random numbers, so passing a ledger leaves the
+    simulated net worth unchanged.
+    """
+
+    FIELDS = ('disbursed', 'interest', 'payments', 'pv_payments', 'forgiven', 'outstanding',
+              'outlays', 'net_cost')
+
+    def __init__(self, discount_rate=0.0):
+        self.discount_rate = discount_rate
+
+    def begin(self, debt, forgiven_up_front=0.0):
+        self.disbursed = np.array(debt, dtype=float)
+        self.interest = np.zeros_like(self.disbursed)
+        self.payments = np.zeros_like(self.disbursed)
+        self.pv_payments = np.zeros_like(self.disbursed)
+        self.forgiven = np.zeros_like(self.disbursed) + forgiven_up_front
+        self.outstanding = np.zeros_like(self.disbursed)
+        self.outlays = np.zeros_like(self.disbursed)
+
+    def record_stage(self, before, interest, after, payment, start_year, years):
+        applied = before + interest - after
+        self.interest += interest
+        self.payments += applied
+        self.pv_payments += applied * (1.0 + self.discount_rate) ** -start_year
+        self.outlays += payment * years
+
+    def record_end(self, before_finish, balance, elapsed_years):
+        self.forgiven += before_finish - balance
+        self.outstanding += balance
+        self.end_discount = (1.0 + self.discount_rate) ** -elapsed_years
+
+    @property
+    def net_cost(self):
+        return self.disbursed - self.pv_payments - self.outstanding * self.end_discount
+
+    def summary(self, quantiles=(10, 50, 90)):
+        """Per-borrower means, cell totals and quantiles of every field."""
+        out = {'n': int(self.disbursed.size), 'discount_rate': self.discount_rate,
+               'share_forgiven': float(np.mean(self.forgiven > 0))}
+        for field in self.FIELDS:
+            values = getattr(self, field)
+            out[f'{field}_mean'] = float(values.mean())
+            out[f'{field}_total'] = float(values.sum())
+            for q, v in zip(quantiles, np.percentile(values, quantiles)):
+                out[f'{field}_p{q}'] = float(v)
+        return out
+
+
+# =============================================================================
+# Stage updates (shared by the per-cell kernels and the batched engines)
+# =============================================================================
+def mortgage_stage(stage_idx, balance, rate, term_years):
+    """Annual mortgage payment and the balance after one stage.
+
+    The first stage pays the ``term_years`` annuity, later stages 8% of the
+    balance. Arrays broadcast (e.g. one row per mortgage rate); a zero
+    balance (no home) pays nothing.
+    """
+    if stage_idx == 0:
+        monthly_rate = rate / 12
+        n_payments   = term_years * 12
+        payment = (balance * monthly_rate * (1 + monthly_rate) ** n_payments /
+                   ((1 + monthly_rate) ** n_payments - 1)) * 12
+    else:
+        payment = np.where(balance > 0, balance * 0.08, 0.0)
+    interest  = balance * rate
+    principal = np.maximum(payment - interest, 0.0)
+    return payment, np.maximum(balance - principal, 0.0)
+
+
+def appreciate_homes(home_value, owns_home, growth):
+    """Owners' home values after one stage of ``growth`` (in place)."""
+    home_value[owns_home] = home_value[owns_home] * growth
+    return home_value
+
+
+def retirement_stage(balance, annual_income, investment_rate, growth):
+    """Retirement balance after one stage: contributions, then ``growth``."""
+    return (balance + annual_income * investment_rate) * growth
+
+
+def savings_stage(liquid_assets, annual_income, loan_payment, mortgage_payment, years, growth):
+    """Liquid assets after one stage.
+
+    Half of what is left of income after living expenses (60%), the student
+    loan and the mortgage is saved each year, then the stage's ``growth``
+    applies.
+    """
+    living_expenses = annual_income * 0.60
+    available       = annual_income - living_expenses - loan_payment - mortgage_payment
+    annual_savings  = np.maximum(available * 0.5, 0.0)
+    return (liquid_assets + annual_savings * years) * growth
+
+
+def simple_income_multiplier(model):
+    """Wealth added per dollar of stage income in the single-account model.
+
+    The income itself plus home wealth (home_purchase_rate x
+    home_appreciation_rate) and retirement savings (retirement_investment_rate).
+    """
+    return (1.0 + model['home_purchase_rate'] * model['home_appreciation_rate']
+            + model['retirement_investment_rate'])
+
+
+def simple_opening_wealth(initial, balance, repayment, out=None):
+    """Wealth before the first stage of the single-account model.
+
+    The initial assets, or the assets minus ``balance`` for a strategy that
+    does not track its balance (``RepaymentStrategy.tracks_balance``).
+    """
+    if out is None:
+        out = np.empty(np.broadcast_shapes(np.shape(initial), np.shape(balance)))
+    if repayment.tracks_balance:
+        np.copyto(out, initial)
+    else:
+        np.subtract(initial, balance, out=out)
+    return out
+
+
+def simple_wealth_step(wealth, balance, income, stage_idx, repayment, growth):
+    """One (sub-)step of the single-account model, in place on ``wealth``.
+
+    ``income`` is the step's wealth-adding income (earnings x
+    ``simple_income_multiplier``). The repayment strategy is advanced first,
+    then wealth grows by ``growth``, gains the income and pays the
+    installment. Returns the new student-loan balance.
+    """
+    payment, balance = repayment.advance(balance, income, stage_idx)
+    wealth *= growth
+    wealth += income
+    wealth -= payment
+    return balance
+
+
+def simple_net_worth(wealth, balance, repayment, elapsed):
+    """Final wealth: assets minus the balance left after ``repayment.finish`` (in place)."""
+    if repayment.tracks_balance:
+        wealth -= repayment.finish(balance, elapsed)
+    return wealth
+
+
+# =============================================================================
+# Per-cell kernels
+# =============================================================================
+def _sample_home_rate(rng, home_rate, home_rate_moe):
+    """Home-purchase rate with MOE uncertainty (MOE is a 90% CI → SE = MOE / 1.645)."""
+    if home_rate_moe > 0:
+        return float(np.clip(rng.normal(home_rate, home_rate_moe / 1.645), 0.0, 1.0))
+    return home_rate
+
+
+def simulate_net_worth(rng, num_individuals, avg_income, factor, home_rate, emp_rates,
+                       repayment, model, income_se=0.0, home_rate_moe=0.0,
+                       debt_mean=0.0, debt_se=0.0, income_dist=None, joint=None, macro=None,
+                       accounting=None):
+    """Net worth at the end of the career for one cell (the IDR balance-sheet model).
+
+    ``model`` comes from ``model_params_from``. ``income_dist`` (a unit-median
+    ``population.AliasTable``) replaces the N(avg_income x factor, income_se)
+    income draw with avg_income x factor x an empirical draw. ``joint`` (a
+    ``copula.JointSampler``) draws income, debt and home ownership together
+    with correlated ranks instead of independently. ``macro`` (a
+    ``macro.MacroPaths``) replaces the constant mortgage rate, home
+    appreciation, retirement return and savings growth with per-path values;
+    individuals are spread over the paths in path-major blocks.
+    ``accounting`` (a ``LoanAccounting``) is filled with each individual's
+    payments, interest and forgiven balance in the same pass. Returns an
+    array of length ``num_individuals`` in real dollars:
+
+        net worth = liquid savings + home equity + retirement
+                    - student loan - mortgage - consumer debt
+    """
+    n = num_individuals
+    adjusted_income = float(avg_income * factor)
+
+    owns_home = None
+    if joint is not None:
+        # ── Home-purchase rate with MOE uncertainty, then one joint draw per individual ──
+        sampled_home_rate = _sample_home_rate(rng, home_rate, home_rate_moe)
+        individual_incomes, individual_debt, owns_home = joint.draw_cell(
+            rng, n, adjusted_income, income_se, debt_mean, debt_se, sampled_home_rate,
+            income_dist=income_dist)
+    else:
+        # ── Draw income: empirical distribution, or normal with SE uncertainty ──
+        if income_dist is not None:
+            individual_incomes = adjusted_income * income_dist.sample(rng, n)
+        elif income_se > 0:
+            individual_incomes = np.maximum(rng.normal(adjusted_income, income_se, n), 0.0)
+        else:
+            individual_incomes = np.full(n, adjusted_income, dtype=float)
+
+        sampled_home_rate = _sample_home_rate(rng, home_rate, home_rate_moe)
+
+        # ── Draw student-loan debt with SE uncertainty ──
+        if debt_se > 0:
+            individual_debt = np.maximum(rng.normal(debt_mean, debt_se, n), 0.0)
+        else:
+            individual_debt = np.full(n, float(debt_mean), dtype=float)
+
+    # ── Assets and liabilities ──
+    liquid_assets        = individual_incomes * rng.uniform(0.1, 0.3, n)
+    retirement_balance   = np.zeros(n, dtype=float)
+    home_equity          = np.zeros(n, dtype=float)
+    student_loan_balance = repayment.start(individual_debt)
+    if accounting is not None:
+        accounting.begin(individual_debt, getattr(repayment, 'forgiven', 0.0))
+    mortgage_balance     = np.zeros(n, dtype=float)
+    consumer_debt        = np.zeros(n, dtype=float)
+
+    # ── Housing ──
+    if owns_home is None:
+        owns_home       = rng.rand(n) < sampled_home_rate
+    home_purchase_price = individual_incomes * model['average_home_price_multiplier']
+    mortgage_balance[owns_home] = home_purchase_price[owns_home] * (1 - model['mortgage_down_payment'])
+    home_value          = home_purchase_price.copy()
+
+    # ── Macro: constant rates, or per-individual stage factors from shared paths ──
+    if macro is None:
+        mortgage_rate     = model['mortgage_interest_rate']
+        home_growth       = [(1 + model['home_appreciation_rate_real']) ** y for y in model['stage_durations']]
+        retirement_growth = [(1 + model['retirement_real_return']) ** y for y in model['stage_durations']]
+        savings_growth    = [(1 + model['personal_asset_growth_rate_real']) ** y for y in model['stage_durations']]
+    else:
+        paths             = macro.assign(n, model['stage_durations'])
+        mortgage_rate     = paths['mortgage_rate']
+        home_growth       = [g[owns_home] for g in paths['home']]
+        retirement_growth = paths['retirement']
+        savings_growth    = paths['savings']
+
+    salary_by_stage  = [individual_incomes * x for x in model['salary_growth_factors']]
+    cumulative_years = 0
+
+    for stage_idx, (emp_rate, salary, years_in_stage) in enumerate(
+            zip(emp_rates, salary_by_stage, model['stage_durations'])):
+
+        # Employment with SE uncertainty on the stage rate
+        sampled_emp_rate = float(np.clip(rng.normal(emp_rate, model['employment_rates_se']), 0.0, 1.0))
+        employed      = rng.rand(n) < sampled_emp_rate
+        annual_income = employed * salary
+
+        # Student loan payment and balance
+        if accounting is not None:
+            balance_before = np.array(student_loan_balance, dtype=float)   # advance may work in place
+            accrued = repayment.accrued_interest(balance_before)
+        annual_loan_payment, student_loan_balance = repayment.advance(
+            student_loan_balance, annual_income, cumulative_years)
+        if accounting is not None:
+            accounting.record_stage(balance_before, accrued, student_loan_balance,
+                                    annual_loan_payment, cumulative_years, years_in_stage)
+
+        # Mortgage payment: annuity in the first stage, 8% of balance afterwards
+        annual_mortgage_payment, mortgage_balance = mortgage_stage(
+            stage_idx, mortgage_balance, mortgage_rate, model['mortgage_term_years'])
+
+        # Home appreciation (real)
+        appreciate_homes(home_value, owns_home, home_growth[stage_idx])
+        home_equity = np.maximum(home_value - mortgage_balance, 0.0)
+
+        # Consumer debt (non-homeowners)
+        consumer_debt[~owns_home] = annual_income[~owns_home] * 0.05
+
+        # Retirement contributions, growing at the real equity return
+        retirement_balance = retirement_stage(
+            retirement_balance, annual_income, model['retirement_investment_rate'],
+            retirement_growth[stage_idx])
+
+        # Personal savings
+        liquid_assets = savings_stage(
+            liquid_assets, annual_income, annual_loan_payment, annual_mortgage_payment,
+            years_in_stage, savings_growth[stage_idx])
+
+        cumulative_years += years_in_stage
+
+    if accounting is not None:
+        before_finish = student_loan_balance
+    student_loan_balance = repayment.finish(student_loan_balance, cumulative_years)
+    if accounting is not None:
+        accounting.record_end(before_finish, student_loan_balance, cumulative_years)
+
+    total_assets      = liquid_assets + retirement_balance + home_equity
+    total_liabilities = student_loan_balance + mortgage_balance + consumer_debt
+    return total_assets - total_liabilities
+
+
+def simulate_simple_wealth(rng, num_individuals, avg_income, factor, model, repayment=None,
+                           income_dist=None):
+    """Net worth after four stages for one cell (the WealthSimulation_DebtForgive model).
+
+    ``model`` keys: employment_rates, salary_growth_multipliers,
+    home_purchase_rate, home_appreciation_rate, retirement_investment_rate,
+    personal_asset_growth_rate, debt_mean, debt_sd, initial_wealth_low,
+    initial_wealth_high. ``repayment=None`` simulates a population without
+    student debt (no debt draw is taken). ``income_dist`` (a unit-mean
+    ``population.AliasTable``) gives each individual their own income
+    instead of the group average.
+
+    Wealth is assets minus the outstanding student-loan balance (see
+    ``RepaymentStrategy.tracks_balance``).
+    """
+    n = num_individuals
+    adjusted_income = avg_income * factor
+    if income_dist is not None:
+        adjusted_income = adjusted_income * income_dist.sample(rng, n)
+    initial_wealth = adjusted_income * rng.uniform(model['initial_wealth_low'],
+                                                   model['initial_wealth_high'], n)
+
+    if repayment is None:
+        repayment = RepaymentStrategy()
+        balance = 0
+    else:
+        balance = repayment.start(rng.normal(model['debt_mean'], model['debt_sd'], n))
+
+    salary_growth = [adjusted_income * x for x in model['salary_growth_multipliers']]
+    income_mult = simple_income_multiplier(model)
+    growth = 1.0 + model['personal_asset_growth_rate']
+
+    wealth = simple_opening_wealth(initial_wealth, balance, repayment)
+    for stage_idx, (rate, salary) in enumerate(zip(model['employment_rates'], salary_growth)):
+        employed = rng.rand(n) < rate
+        income = employed * salary * income_mult
+        balance = simple_wealth_step(wealth, balance, income, stage_idx, repayment, growth)
+
+    return simple_net_worth(wealth, balance, repayment, len(model['employment_rates']))
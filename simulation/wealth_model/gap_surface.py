@@ -0,0 +1,149 @@
+"""Racial wealth-gap surface over a dense macro/policy grid.
+
+Generalises Figure 10 (``run_race_scenario``: three hand-picked macro
+scenarios, one kernel call per race) to the full Cartesian grid
+
+    mortgage rate x home appreciation x initial debt x IDR plan
+
+evaluated with ``batched_kernel.mean_net_worth_grid``. All races share the
+same random draws, so the gap at every grid point is a paired comparison.
+
+Outputs:
+    GapSurface.query(...)     -- nearest-grid-point lookup / slices
+    GapSurface.to_csv(path)   -- long-format table, one row per race x grid point
+    plot_gap_heatmaps(...)    -- mortgage x appreciation heatmap per plan
+"""
+
+import csv
+
+import numpy as np
+
+from .batched_kernel import mean_net_worth_grid, repayment_schedule
+
+# Default dense grid (20 x 20 x 10 x all plans)
+DEFAULT_MORTGAGE_RATES = np.linspace(0.040, 0.090, 20)
+DEFAULT_APPRECIATION_RATES = np.linspace(0.000, 0.060, 20)   # nominal
+DEFAULT_DEBT_LEVELS = np.linspace(10_000, 60_000, 10)
+
+AXES = ('mortgage_rate', 'appreciation_rate', 'debt', 'plan')
+
+
+class GapSurface:
+    """Mean net worth per race on the grid, plus gap-vs-reference helpers."""
+
+    def __init__(self, axes, means, reference_race):
+        self.axes = axes                  # {'mortgage_rate': arr, ..., 'plan': [names]}
+        self.means = means                # {race: array (M, A, D, P)}
+        self.reference_race = reference_race
+
+    @property
+    def minority_races(self):
+        return [r for r in self.means if r != self.reference_race]
+
+    def gap_pct(self, race):
+        """(race / reference - 1) * 100 over the whole grid, as in Figure 7/10."""
+        return (self.means[race] / self.means[self.reference_race] - 1) * 100
+
+    def _index(self, axis, value):
+        if value is None:
+            return slice(None)
+        if axis == 'plan':
+            return self.axes['plan'].index(value)
+        return int(np.abs(np.asarray(self.axes[axis]) - value).argmin())
+
+    def query(self, race, mortgage_rate=None, appreciation_rate=None, debt=None, plan=None):
+        """Gap (%) at the nearest grid point; axes left as None are returned whole."""
+        idx = tuple(self._index(axis, value) for axis, value in
+                    zip(AXES, (mortgage_rate, appreciation_rate, debt, plan)))
+        return self.gap_pct(race)[idx]
+
+    def records(self):
+        """Yield one dict per (race, grid point)."""
+        ref = self.means[self.reference_race]
+        for race in self.minority_races:
+            gap = self.gap_pct(race)
+            for idx in np.ndindex(gap.shape):
+                i, j, k, p = idx
+                yield {
+                    'race': race,
+                    'plan': self.axes['plan'][p],
+                    'mortgage_rate': float(self.axes['mortgage_rate'][i]),
+                    'appreciation_rate': float(self.axes['appreciation_rate'][j]),
+                    'debt': float(self.axes['debt'][k]),
+                    f'{self.reference_race.lower()}_mean_net_worth': float(ref[idx]),
+                    'race_mean_net_worth': float(self.means[race][idx]),
+                    'gap_pct': float(gap[idx]),
+                }
+
+    def to_csv(self, path):
+        rows = self.records()
+        first = next(rows, None)
+        with open(path, 'w', newline='') as f:
+            if first is None:
+                return path
+            writer = csv.DictWriter(f, fieldnames=list(first))
+            writer.writeheader()
+            writer.writerow(first)
+            writer.writerows(rows)
+        return path
+
+
+def wealth_gap_surface(races, idr_plans, fpl_base, model, n_individuals,
+                       mortgage_rates=DEFAULT_MORTGAGE_RATES,
+                       appreciation_rates=DEFAULT_APPRECIATION_RATES,
+                       debt_levels=DEFAULT_DEBT_LEVELS,
+                       reference_race='White', debt_se=0.0, factor=1.0,
+                       seed=42, chunk_size=50_000, wrap_random=None):
+    """Evaluate every race over the full grid in one batched pass.
+
+    ``races`` maps race -> {income, income_se, home_rate, home_rate_moe, emp_rates}.
+    ``wrap_random`` is passed to ``mean_net_worth_grid`` (to time the draws).
+    """
+    plan_names = list(idr_plans)
+    schedules = [repayment_schedule(idr_plans[p], fpl_base) for p in plan_names]
+    means = mean_net_worth_grid(races, schedules, mortgage_rates, appreciation_rates, debt_levels,
+                                model, n_individuals, debt_se=debt_se, factor=factor,
+                                seed=seed, chunk_size=chunk_size, wrap_random=wrap_random)
+    axes = {
+        'mortgage_rate': np.asarray(mortgage_rates, dtype=float),
+        'appreciation_rate': np.asarray(appreciation_rates, dtype=float),
+        'debt': np.asarray(debt_levels, dtype=float),
+        'plan': plan_names,
+    }
+    return GapSurface(axes, means, reference_race)
+
+
+def plot_gap_heatmaps(surface, race, plt, debt=None, save_path=None, dpi=150):
+    """Mortgage x appreciation heatmap of the gap for each plan at one debt level."""
+    plans = surface.axes['plan']
+    if debt is None:
+        debt = float(np.median(surface.axes['debt']))
+    k = surface._index('debt', debt)
+    gap = surface.gap_pct(race)[:, :, k, :]            # (M, A, P)
+    lim = float(np.abs(gap).max())                      # centre the colour scale on zero gap
+    m = surface.axes['mortgage_rate'] * 100
+    a = surface.axes['appreciation_rate'] * 100
+
+    n_cols = 3
+    n_rows = int(np.ceil(len(plans) / n_cols))
+    fig, axes = plt.subplots(n_rows, n_cols, figsize=(15, 4.5 * n_rows), squeeze=False)
+    image = None
+    for p, ax in enumerate(axes.flat):
+        if p >= len(plans):
+            ax.axis('off')
+            continue
+        image = ax.pcolormesh(m, a, gap[:, :, p].T, shading='nearest',
+                              cmap='RdYlGn', vmin=-lim, vmax=lim)
+        ax.set_title(plans[p].replace('_', ' '), fontsize=10, fontweight='bold')
+        ax.set_xlabel('Mortgage Rate (%)', fontsize=9)
+        ax.set_ylabel('Home Appreciation, nominal (%)', fontsize=9)
+    fig.colorbar(image, ax=axes.ravel().tolist(), shrink=0.85,
+                 label=f'Wealth Gap vs {surface.reference_race} (%)')
+    fig.suptitle(
+        f'{race} vs {surface.reference_race} — Wealth Gap Surface by IDR Plan\n'
+        f'Family of 4, Median Income Tier | Initial debt ${surface.axes["debt"][k]:,.0f} '
+        f'| Common random numbers across races',
+        fontsize=12, fontweight='bold')
+    if save_path is not None:
+        plt.savefig(save_path, dpi=dpi, bbox_inches='tight')
+    return fig
@@ -0,0 +1,170 @@
+"""Household-type axis for the IDR wealth simulation.
+
+The IDR script models two fixed households: a single earner against the
+1-person poverty line (Part 1) and a family of 4 against the 4-person line
+(Part 2). Here household type is one more axis of the batched kernel:
+
+    size        1-8 people; sets the FPL via the HHS guideline formula
+    earners     1 or 2 (dual-earner flag); a second earner adds an
+                independently drawn income with the same distribution
+    dependents  size - earners, i.e. members with no earnings
+
+Household size only moves the FPL threshold, so it rides on the kernel's
+repayment-schedule axis (plans x sizes); earner count changes income and is
+carried as a group attribute. Every group x household type x plan cell comes
+out of one ``mean_net_worth_grid`` call with common random numbers.
+"""
+
+import csv
+
+import numpy as np
+
+from .batched_kernel import mean_net_worth_grid
+
+# 2025 HHS Poverty Guidelines, 48 contiguous states and DC:
+# $15,650 for the first person + $5,500 for each additional person
+HHS_FPL_BASE = 15_650.0
+HHS_FPL_PER_PERSON = 5_500.0
+MAX_HOUSEHOLD_SIZE = 8
+
+
+def poverty_guideline(size, base=HHS_FPL_BASE, per_person=HHS_FPL_PER_PERSON):
+    """HHS poverty guideline for a household of ``size`` people."""
+    if size < 1:
+        raise ValueError(f"household size must be >= 1, got {size}")
+    return base + per_person * (size - 1)
+
+
+def household_types(sizes=range(1, MAX_HOUSEHOLD_SIZE + 1), earner_counts=(1, 2)):
+    """All valid (size, earners) combinations as dicts, in size-major order."""
+    types = []
+    for size in sizes:
+        for earners in earner_counts:
+            if earners > size:
+                continue
+            types.append({
+                'name': f"{size}p {'dual' if earners == 2 else 'single'} earner",
+                'size': int(size),
+                'earners': int(earners),
+                'dual_earner': earners == 2,
+                'dependents': int(size - earners),
+                'fpl': poverty_guideline(size),
+            })
+    return types
+
+
+class HouseholdResults:
+    """Mean net worth per group x household type x plan."""
+
+    def __init__(self, groups, types, plans, means):
+        self.groups = groups              # [group names]
+        self.types = types                # [household type dicts]
+        self.plans = plans                # [plan names]
+        self.means = means                # {group: array (types, plans)}
+
+    def mean(self, group, size, dual_earner=False, plan=None):
+        """Mean net worth for one household type (all plans if ``plan`` is None)."""
+        t = next((i for i, h in enumerate(self.types)
+                  if h['size'] == size and h['dual_earner'] == dual_earner), None)
+        if t is None:
+            raise KeyError(f"no household type with size={size}, dual_earner={dual_earner}")
+        row = self.means[group][t]
+        return row if plan is None else float(row[self.plans.index(plan)])
+
+    def records(self):
+        for group in self.groups:
+            for t, h in enumerate(self.types):
+                for p, plan in enumerate(self.plans):
+                    yield {
+                        'group': group,
+                        'household': h['name'],
+                        'size': h['size'],
+                        'earners': h['earners'],
+                        'dependents': h['dependents'],
+                        'fpl': h['fpl'],
+                        'plan': plan,
+                        'mean_net_worth': float(self.means[group][t, p]),
+                    }
+
+    def to_csv(self, path):
+        fields = ['group', 'household', 'size', 'earners', 'dependents', 'fpl', 'plan',
+                  'mean_net_worth']
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(self.records())
+        return path
+
+
+def household_net_worth(groups, idr_plans, model, n_individuals, mortgage_rate,
+                        appreciation_rate, debt, types=None, debt_se=0.0, factor=1.0,
+                        seed=42, chunk_size=50_000, wrap_random=None):
+    """Evaluate every group x household type x plan in one batched pass.
+
+    ``groups`` maps name -> {income, income_se, home_rate, home_rate_moe,
+    emp_rates}, where income is per-earner. ``mortgage_rate`` and
+    ``appreciation_rate`` (nominal) and ``debt`` are single values; the
+    household carries one borrower's student debt regardless of earners.
+    ``wrap_random`` is passed to ``mean_net_worth_grid`` (to time the draws).
+    """
+    if types is None:
+        types = household_types()
+    plan_names = list(idr_plans)
+    sizes = sorted({h['size'] for h in types})
+    earner_counts = sorted({h['earners'] for h in types})
+
+    # Schedule axis = plans x sizes (size only changes the FPL threshold)
+    schedules = [(idr_plans[p]['repayment_rate'], idr_plans[p]['years'],
+                  poverty_guideline(size) * idr_plans[p]['fpl_multiplier'])
+                 for p in plan_names for size in sizes]
+
+    # Group axis = groups x earner counts
+    batched_groups = {(name, e): dict(group, earners=e)
+                      for name, group in groups.items() for e in earner_counts}
+    grid = mean_net_worth_grid(batched_groups, schedules, [mortgage_rate], [appreciation_rate],
+                               [debt], model, n_individuals, debt_se=debt_se, factor=factor,
+                               seed=seed, chunk_size=chunk_size, wrap_random=wrap_random)
+
+    means = {}
+    for name in groups:
+        out = np.empty((len(types), len(plan_names)))
+        for t, h in enumerate(types):
+            by_schedule = grid[(name, h['earners'])][0, 0, 0].reshape(len(plan_names), len(sizes))
+            out[t] = by_schedule[:, sizes.index(h['size'])]
+        means[name] = out
+    return HouseholdResults(list(groups), types, plan_names, means)
+
+
+def plot_household_types(results, plt, colors=None, save_path=None, dpi=150):
+    """Mean net worth vs household size per plan; solid = single, dashed = dual earner."""
+    plans = results.plans
+    n_cols = 3
+    n_rows = int(np.ceil(len(plans) / n_cols))
+    fig, axes = plt.subplots(n_rows, n_cols, figsize=(15, 4.5 * n_rows), squeeze=False,
+                             sharey=True)
+    for p, ax in enumerate(axes.flat):
+        if p >= len(plans):
+            ax.axis('off')
+            continue
+        for group in results.groups:
+            color = (colors or {}).get(group)
+            for dual, style in ((False, '-'), (True, '--')):
+                pts = [(h['size'], results.means[group][t, p])
+                       for t, h in enumerate(results.types) if h['dual_earner'] == dual]
+                if not pts:
+                    continue
+                x, y = zip(*pts)
+                ax.plot(x, np.asarray(y) / 1000, style, marker='o', markersize=3, color=color,
+                        label=f"{group} ({'dual' if dual else 'single'})")
+        ax.set_title(plans[p].replace('_', ' '), fontsize=10, fontweight='bold')
+        ax.set_xlabel('Household Size (HHS FPL scaling)', fontsize=9)
+        ax.set_ylabel('Mean Net Worth ($K, Real 2025)', fontsize=9)
+        ax.grid(alpha=0.3)
+    axes.flat[0].legend(fontsize=7, loc='best')
+    fig.suptitle('Net Worth at Retirement by Household Type and IDR Plan\n'
+                 'Solid = single earner, dashed = dual earner | Common random numbers across types',
+                 fontsize=12, fontweight='bold')
+    plt.tight_layout()
+    if save_path is not None:
+        plt.savefig(save_path, dpi=dpi, bbox_inches='tight')
+    return fig
@@ -0,0 +1,179 @@
+"""Stochastic macro paths for the IDR balance-sheet model.
+
+The IDR script holds inflation, the equity return, the mortgage rate and
+house-price growth constant for 40 years, and its scenario analysis is three
+fixed tuples. Here those four series are simulated year by year as a
+two-regime (normal / stress) Markov-switching VAR(1):
+
+    x_t - mu[s_t] = A (x_{t-1} - mu[s_{t-1}]) + chol[s_t] e_t
+    x = (inflation, mortgage_rate, home_appreciation, equity_real_return)
+
+with s_t a Markov chain. Regime means are set so the long-run (stationary)
+mean of every series equals the script's constants, so averages across
+paths stay comparable with the deterministic model while individual paths
+carry booms, busts and persistent inflation.
+
+Paths are shared across plans, and individuals are laid out path-major
+(paths x individuals, ``assign``), so every plan faces the same macro
+history. The kernel works in career stages, so each stage compounds its
+years of the path; the order of good and bad stages therefore changes net
+worth (sequence-of-returns risk), although the order of years within a stage
+does not.
+
+The default calibration is illustrative. It is loosely based on post-1970
+US annual data (CPI, Freddie Mac PMMS, FHFA HPI and S&P 500 real total
+return) and has not been estimated.
+"""
+
+import numpy as np
+
+MACRO_FIELDS = ('inflation', 'mortgage_rate', 'home_appreciation', 'equity_real_return')
+
+DEFAULT_MACRO = {
+    # Long-run means (match the IDR script's constants)
+    'long_run': {'inflation': 0.020, 'mortgage_rate': 0.063,
+                 'home_appreciation': 0.035, 'equity_real_return': 0.07},
+    # Stress-regime mean minus normal-regime mean
+    'stress_shift': {'inflation': 0.020, 'mortgage_rate': 0.010,
+                     'home_appreciation': -0.060, 'equity_real_return': -0.200},
+    # P(normal -> stress), P(stress -> stress) per year
+    'p_enter_stress': 0.10,
+    'p_stay_stress': 0.50,
+    # VAR(1) persistence, rows/cols in MACRO_FIELDS order; mortgage rates
+    # follow last year's inflation surprise
+    'persistence': [[0.75, 0.00, 0.00, 0.00],
+                    [0.30, 0.90, 0.00, 0.00],
+                    [0.00, 0.00, 0.60, 0.00],
+                    [0.00, 0.00, 0.00, 0.00]],
+    # Annual shock s.d. per regime, and one shock correlation matrix
+    'shock_sd': {'normal': [0.010, 0.006, 0.035, 0.16],
+                 'stress': [0.015, 0.008, 0.050, 0.22]},
+    'shock_corr': [[1.00, 0.50, 0.10, -0.20],
+                   [0.50, 1.00, -0.10, -0.10],
+                   [0.10, -0.10, 1.00, 0.20],
+                   [-0.20, -0.10, 0.20, 1.00]],
+    # Nominal CD rate for liquid savings (the script's 2%); real = rate - inflation
+    'deposit_rate': 0.020,
+}
+
+
+class MacroPaths:
+    """Simulated yearly macro series, each an array (paths, years)."""
+
+    def __init__(self, inflation, mortgage_rate, home_appreciation, equity_real_return,
+                 regime=None, deposit_rate=DEFAULT_MACRO['deposit_rate']):
+        self.inflation = inflation
+        self.mortgage_rate = mortgage_rate
+        self.home_appreciation = home_appreciation          # nominal
+        self.equity_real_return = equity_real_return
+        self.regime = regime                                # 1 = stress year
+        self.deposit_rate = deposit_rate
+
+    @property
+    def n_paths(self):
+        return self.inflation.shape[0]
+
+    @property
+    def years(self):
+        return self.inflation.shape[1]
+
+    @classmethod
+    def constant(cls, model, years=40, deposit_rate=DEFAULT_MACRO['deposit_rate']):
+        """One path holding ``model_params_from`` constants fixed (the deterministic model)."""
+        def flat(value):
+            return np.full((1, years), float(value))
+        inflation = model['inflation_rate']
+        return cls(flat(inflation), flat(model['mortgage_interest_rate']),
+                   flat(model['home_appreciation_rate_real'] + inflation),
+                   flat(model['retirement_real_return']),
+                   deposit_rate=model['personal_asset_growth_rate_real'] + inflation)
+
+    def stage_growth(self, stage_durations):
+        """Per-path gross real growth per career stage, each (paths, stages).
+
+        'retirement' compounds the equity return, 'home' house prices net of
+        inflation, 'savings' the deposit rate net of inflation. 'mortgage_rate'
+        (paths,) is the rate locked in at purchase (year 0).
+        """
+        edges = np.concatenate([[0], np.cumsum(stage_durations)])
+        if edges[-1] > self.years:
+            raise ValueError(f"paths cover {self.years} years, stages need {edges[-1]}")
+        yearly = {
+            'retirement': 1.0 + self.equity_real_return,
+            'home': 1.0 + self.home_appreciation - self.inflation,
+            'savings': 1.0 + self.deposit_rate - self.inflation,
+        }
+        growth = {key: np.stack([g[:, a:b].prod(axis=1) for a, b in zip(edges[:-1], edges[1:])],
+                                axis=1)
+                  for key, g in yearly.items()}
+        growth['mortgage_rate'] = self.mortgage_rate[:, 0]
+        return growth
+
+    def path_index(self, n):
+        """Path of each of ``n`` individuals: contiguous, near-equal blocks per path."""
+        return np.repeat(np.arange(self.n_paths), np.diff(np.linspace(0, n, self.n_paths + 1).astype(int)))
+
+    def assign(self, n, stage_durations):
+        """``stage_growth`` expanded to ``n`` individuals (paths x individuals, path-major).
+
+        Stage factors become (stages, n) arrays and 'mortgage_rate' an (n,) array.
+        """
+        index = self.path_index(n)
+        growth = self.stage_growth(stage_durations)
+        out = {key: g[index].T for key, g in growth.items() if key != 'mortgage_rate'}
+        out['mortgage_rate'] = growth['mortgage_rate'][index]
+        return out
+
+    def summary(self):
+        """Mean and 5th/95th percentile of every series over paths x years."""
+        out = {}
+        for field in MACRO_FIELDS:
+            values = getattr(self, field)
+            out[field] = {'mean': float(values.mean()),
+                          'p05': float(np.percentile(values, 5)),
+                          'p95': float(np.percentile(values, 95))}
+        if self.regime is not None:
+            out['stress_year_share'] = float(self.regime.mean())
+        return out
+
+
+def simulate_macro_paths(n_paths=2_000, years=40, params=None, seed=None, wrap_random=None):
+    """Simulate ``n_paths`` yearly macro paths from the regime-switching VAR(1).
+
+    ``params`` overrides keys of DEFAULT_MACRO. Vectorized over paths; the
+    only loop is over years. ``wrap_random`` (e.g. ``RunProfiler.timed_random``)
+    wraps the Generator so its draws are timed; the values are unchanged.
+    """
+    p = dict(DEFAULT_MACRO, **(params or {}))
+    gen = np.random.default_rng(seed)
+    if wrap_random is not None:
+        gen = wrap_random(gen)
+    k = len(MACRO_FIELDS)
+    long_run = np.array([p['long_run'][f] for f in MACRO_FIELDS])
+    shift = np.array([p['stress_shift'][f] for f in MACRO_FIELDS])
+    p_enter, p_stay = p['p_enter_stress'], p['p_stay_stress']
+    stress_share = p_enter / (p_enter + 1.0 - p_stay)             # stationary P(stress)
+    mu = np.stack([long_run - stress_share * shift,                # normal
+                   long_run + (1.0 - stress_share) * shift])       # stress
+    A = np.asarray(p['persistence'], dtype=float)
+    corr = np.asarray(p['shock_corr'], dtype=float)
+    chol = np.stack([np.linalg.cholesky(corr * np.outer(sd, sd))
+                     for sd in (np.asarray(p['shock_sd']['normal']),
+                                np.asarray(p['shock_sd']['stress']))])
+
+    regime = np.empty((n_paths, years), dtype=np.int8)
+    x = np.empty((years, k, n_paths))
+    state = (gen.random(n_paths) < stress_share).astype(np.int8)
+    dev = np.zeros((k, n_paths))                                   # x_{t-1} - mu[s_{t-1}]
+    for t in range(years):
+        if t > 0:
+            u = gen.random(n_paths)
+            state = np.where(state == 1, u < p_stay, u < p_enter).astype(np.int8)
+        shocks = np.einsum('pij,jp->ip', chol[state], gen.standard_normal((k, n_paths)))
+        dev = A @ dev + shocks
+        x[t] = mu[state].T + dev
+        regime[:, t] = state
+
+    series = {f: np.ascontiguousarray(x[:, i, :].T) for i, f in enumerate(MACRO_FIELDS)}
+    series['mortgage_rate'] = np.maximum(series['mortgage_rate'], 0.0)
+    return MacroPaths(regime=regime, deposit_rate=p['deposit_rate'], **series)
@@ -0,0 +1,301 @@
+"""IDR plan optimizer: search repayment rate x FPL multiplier x term.
+
+Answers "which plan parameters close the racial wealth gap at a given
+federal cost?" without hand-editing ``idr_plans``. A candidate plan is a
+point in
+
+    repayment_rate    share of discretionary income paid
+    fpl_multiplier    protected income, in multiples of the poverty line
+    years             repayment period before the balance is forgiven
+
+Every candidate in a batch becomes one repayment schedule of
+``batched_kernel.mean_components_grid``, and every batch uses the same seed.
+All candidates and all races therefore see the same draws (common random
+numbers), so differences between candidates are not sampling noise and a
+search step cannot be fooled by a lucky draw.
+
+For each candidate the evaluator reports:
+    mean net worth per race
+    wealth gap (%) of every other race vs the reference race
+    forgiven balance per borrower (the federal-cost proxy; the unweighted
+    mean over races)
+
+Search strategies: ``grid_search`` (one batch) and ``cma_es`` (one batch per
+generation, in the unit cube). Every evaluation is cached in memory and,
+with ``cache_path``, in a JSON file keyed by a fingerprint of the
+evaluator's inputs, so repeated or overlapping searches are free.
+``pareto_front`` returns the candidates not dominated on (|gap|, cost).
+
+The kernel works in career stages (8/10/10/12 years), so ``years`` only
+matters through the number of stages in which payments are due and whether
+the balance is forgiven by year 40.
+"""
+
+import csv
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from .batched_kernel import mean_components_grid, net_worth_from_components
+
+PARAMETERS = ('repayment_rate', 'fpl_multiplier', 'years')
+
+DEFAULT_SPACE = {
+    'repayment_rate': (0.05, 0.20),
+    'fpl_multiplier': (1.00, 4.00),
+    'years':          (10, 30),
+}
+INTEGER_PARAMETERS = ('years',)
+
+
+class PlanEvaluator:
+    """Cached, batched evaluation of candidate plans for a set of race groups.
+
+    ``groups`` maps race -> {income, income_se, home_rate, home_rate_moe,
+    emp_rates} as in ``mean_net_worth_grid``; one mortgage rate,
+    appreciation rate and debt level are held fixed. ``wrap_random`` is
+    passed to the kernel (to time its draws) and is not part of the cache key.
+    """
+
+    def __init__(self, groups, fpl_base, model, n_individuals, mortgage_rate,
+                 appreciation_rate, debt, debt_se=0.0, reference='White', seed=42,
+                 chunk_size=50_000, cache_path=None, wrap_random=None):
+        self.groups = groups
+        self.fpl_base = fpl_base
+        self.model = model
+        self.n_individuals = int(n_individuals)
+        self.mortgage_rate = mortgage_rate
+        self.appreciation_rate = appreciation_rate
+        self.debt = debt
+        self.debt_se = debt_se
+        self.reference = reference
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.cache_path = cache_path
+        self.wrap_random = wrap_random
+        self.cache = {}
+        self.n_simulated = 0
+        self.fingerprint = self._fingerprint()
+        self._load_cache()
+
+    def _fingerprint(self):
+        key = json.dumps([self.groups, self.fpl_base, self.model, self.n_individuals,
+                          self.mortgage_rate, self.appreciation_rate, self.debt, self.debt_se,
+                          self.reference, self.seed], sort_keys=True, default=float)
+        return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+    def _load_cache(self):
+        if self.cache_path is None or not os.path.exists(self.cache_path):
+            return
+        with open(self.cache_path) as f:
+            stored = json.load(f)
+        if stored.get('fingerprint') == self.fingerprint:
+            self.cache = {tuple(e['key']): e['result'] for e in stored['evaluations']}
+
+    def _save_cache(self):
+        if self.cache_path is None:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+        tmp = self.cache_path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump({'fingerprint': self.fingerprint,
+                       'evaluations': [{'key': list(k), 'result': r} for k, r in self.cache.items()]},
+                      f)
+        os.replace(tmp, self.cache_path)
+
+    @staticmethod
+    def key(plan):
+        return (round(float(plan['repayment_rate']), 6), round(float(plan['fpl_multiplier']), 6),
+                int(plan['years']))
+
+    def evaluate(self, plans):
+        """Evaluate a list of plan dicts; uncached ones in one batched kernel call.
+
+        Returns one result dict per plan: the plan parameters plus
+        net_worth {race: $}, gap_pct {race: %}, mean_abs_gap_pct and
+        forgiven_per_borrower.
+        """
+        keys = [self.key(p) for p in plans]
+        todo = sorted({k for k in keys if k not in self.cache})
+        if todo:
+            schedules = [(rate, years, self.fpl_base * mult) for rate, mult, years in todo]
+            means = mean_components_grid(self.groups, schedules, [self.mortgage_rate],
+                                         [self.appreciation_rate], [self.debt], self.model,
+                                         self.n_individuals, debt_se=self.debt_se, seed=self.seed,
+                                         chunk_size=self.chunk_size, wrap_random=self.wrap_random)
+            self.n_simulated += len(todo)
+            net_worth = {race: net_worth_from_components(m)[0, 0, 0] for race, m in means.items()}
+            forgiven = np.mean([m['forgiven'][0] for m in means.values()], axis=0)
+            ref = net_worth[self.reference]
+            for s, k in enumerate(todo):
+                gaps = {race: float((nw[s] / ref[s] - 1) * 100)
+                        for race, nw in net_worth.items() if race != self.reference}
+                self.cache[k] = {
+                    'net_worth': {race: float(nw[s]) for race, nw in net_worth.items()},
+                    'gap_pct': gaps,
+                    'mean_abs_gap_pct': float(np.mean(np.abs(list(gaps.values())))),
+                    'forgiven_per_borrower': float(forgiven[s]),
+                }
+            self._save_cache()
+        return [dict(zip(PARAMETERS, k), **self.cache[k]) for k in keys]
+
+    def evaluations(self):
+        """Every cached evaluation, as result dicts."""
+        return [dict(zip(PARAMETERS, k), **r) for k, r in sorted(self.cache.items())]
+
+
+# =============================================================================
+# Objectives and search space
+# =============================================================================
+def constrained_gap(result, budget=None, penalty=1_000.0):
+    """Mean |gap| (%), plus ``penalty`` x relative overspend when cost exceeds ``budget``.
+
+    A budget of zero or less has no relative overspend, so there the penalty
+    is charged per $1,000 of absolute overspend instead.
+    """
+    value = result['mean_abs_gap_pct']
+    cost = result['forgiven_per_borrower']
+    if budget is not None and cost > budget:
+        if budget > 0:
+            value += penalty * (cost / budget - 1.0)
+        else:
+            value += penalty * (cost - budget) / 1_000.0
+    return value
+
+
+def from_unit(u, space=DEFAULT_SPACE):
+    """Map a point of the unit cube onto a plan dict (integer parameters rounded)."""
+    plan = {}
+    for x, name in zip(np.clip(u, 0.0, 1.0), PARAMETERS):
+        low, high = space[name]
+        value = low + x * (high - low)
+        plan[name] = int(round(value)) if name in INTEGER_PARAMETERS else float(value)
+    return plan
+
+
+def grid_search(evaluator, space=DEFAULT_SPACE, points=(7, 7, 5)):
+    """Evaluate the full Cartesian grid (``points`` per parameter) in one batch."""
+    axes = [np.linspace(space[name][0], space[name][1], k) for name, k in zip(PARAMETERS, points)]
+    mesh = np.stack(np.meshgrid(*axes, indexing='ij'), axis=-1).reshape(-1, len(PARAMETERS))
+    plans = [{name: (int(round(v)) if name in INTEGER_PARAMETERS else float(v))
+              for name, v in zip(PARAMETERS, row)} for row in mesh]
+    return evaluator.evaluate(plans)
+
+
+def cma_es(evaluator, objective=constrained_gap, space=DEFAULT_SPACE, generations=20,
+           popsize=12, sigma0=0.3, x0=None, seed=0):
+    """Minimise ``objective(result)`` with CMA-ES in the unit cube.
+
+    Standard (mu/mu_w, lambda) CMA-ES with cumulative step-size adaptation
+    and rank-1 + rank-mu covariance updates (Hansen, "The CMA Evolution
+    Strategy: A Tutorial"). Samples outside the cube are clipped before
+    evaluation. Each generation is one ``evaluate`` batch. Returns
+    (best result, every result in evaluation order).
+    """
+    gen = np.random.default_rng(seed)
+    dim = len(PARAMETERS)
+    mean = np.full(dim, 0.5) if x0 is None else np.asarray(x0, dtype=float)
+    sigma = sigma0
+    mu = popsize // 2
+    weights = np.log(mu + 0.5) - np.log(np.arange(1, mu + 1))
+    weights /= weights.sum()
+    mu_eff = 1.0 / (weights ** 2).sum()
+    c_sigma = (mu_eff + 2) / (dim + mu_eff + 5)
+    d_sigma = 1 + 2 * max(0.0, np.sqrt((mu_eff - 1) / (dim + 1)) - 1) + c_sigma
+    c_c = (4 + mu_eff / dim) / (dim + 4 + 2 * mu_eff / dim)
+    c_1 = 2 / ((dim + 1.3) ** 2 + mu_eff)
+    c_mu = min(1 - c_1, 2 * (mu_eff - 2 + 1 / mu_eff) / ((dim + 2) ** 2 + mu_eff))
+    chi_n = np.sqrt(dim) * (1 - 1 / (4 * dim) + 1 / (21 * dim ** 2))
+    p_sigma, p_c, C = np.zeros(dim), np.zeros(dim), np.eye(dim)
+
+    history, best = [], None
+    for g in range(generations):
+        eigval, B = np.linalg.eigh(C)
+        D = np.sqrt(np.maximum(eigval, 1e-20))
+        z = gen.standard_normal((popsize, dim))
+        y = z @ (B * D).T
+        x = mean + sigma * y
+        results = evaluator.evaluate([from_unit(xi, space) for xi in x])
+        scores = np.array([objective(r) for r in results])
+        history.extend(results)
+        order = np.argsort(scores, kind='stable')
+        if best is None or scores[order[0]] < objective(best):
+            best = results[order[0]]
+
+        y_w = weights @ y[order[:mu]]
+        mean = mean + sigma * y_w
+        C_inv_sqrt = B @ np.diag(1 / D) @ B.T
+        p_sigma = (1 - c_sigma) * p_sigma + np.sqrt(c_sigma * (2 - c_sigma) * mu_eff) * C_inv_sqrt @ y_w
+        h_sigma = (np.linalg.norm(p_sigma) / np.sqrt(1 - (1 - c_sigma) ** (2 * (g + 1)))
+                   < (1.4 + 2 / (dim + 1)) * chi_n)
+        p_c = (1 - c_c) * p_c + h_sigma * np.sqrt(c_c * (2 - c_c) * mu_eff) * y_w
+        rank_mu = (weights[:, None] * y[order[:mu]]).T @ y[order[:mu]]
+        C = ((1 - c_1 - c_mu) * C + c_1 * (np.outer(p_c, p_c)
+                                           + (1 - h_sigma) * c_c * (2 - c_c) * C) + c_mu * rank_mu)
+        sigma *= np.exp((c_sigma / d_sigma) * (np.linalg.norm(p_sigma) / chi_n - 1))
+    return best, history
+
+
+# =============================================================================
+# Pareto front and export
+# =============================================================================
+def pareto_front(results, objectives=('mean_abs_gap_pct', 'forgiven_per_borrower')):
+    """Results not dominated on ``objectives`` (all minimised), sorted by the first.
+
+    Plans with identical objective values (e.g. terms ending in the same
+    career stage) are represented by the first one.
+    """
+    values = np.array([[r[o] for o in objectives] for r in results])
+    keep = []
+    for i, v in enumerate(values):
+        dominated = np.any(np.all(values <= v, axis=1) & np.any(values < v, axis=1))
+        duplicate = np.any(np.all(values[:i] == v, axis=1))
+        if not (dominated or duplicate):
+            keep.append(i)
+    return sorted((results[i] for i in keep), key=lambda r: [r[o] for o in objectives])
+
+
+def results_to_csv(results, path):
+    """One row per evaluated plan: parameters, net worth and gap per race, cost."""
+    races = list(results[0]['net_worth']) if results else []
+    gap_races = list(results[0]['gap_pct']) if results else []
+    fields = (list(PARAMETERS) + [f'net_worth_{r}' for r in races]
+              + [f'gap_pct_{r}' for r in gap_races] + ['mean_abs_gap_pct', 'forgiven_per_borrower'])
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        for r in results:
+            row = {name: r[name] for name in PARAMETERS}
+            row.update({f'net_worth_{race}': v for race, v in r['net_worth'].items()})
+            row.update({f'gap_pct_{race}': v for race, v in r['gap_pct'].items()})
+            row.update(mean_abs_gap_pct=r['mean_abs_gap_pct'],
+                       forgiven_per_borrower=r['forgiven_per_borrower'])
+            writer.writerow(row)
+    return path
+
+
+def plot_pareto(results, front, plt, baseline=None, budget=None, save_path=None, dpi=150):
+    """All evaluations (grey) and the Pareto front on cost vs mean |gap| axes."""
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.scatter([r['forgiven_per_borrower'] / 1000 for r in results],
+               [r['mean_abs_gap_pct'] for r in results], s=10, color='#BBBBBB', label='Evaluated plans')
+    ax.plot([r['forgiven_per_borrower'] / 1000 for r in front],
+            [r['mean_abs_gap_pct'] for r in front], 'o-', color='#C92A2A', label='Pareto front')
+    for name, r in (baseline or {}).items():
+        ax.scatter(r['forgiven_per_borrower'] / 1000, r['mean_abs_gap_pct'], marker='*', s=140,
+                   zorder=3, label=name.replace('_', ' '))
+    if budget is not None:
+        ax.axvline(budget / 1000, color='#333333', linestyle='--', linewidth=1, label='Cost budget')
+    ax.set_xlabel('Forgiven Balance per Borrower ($K, federal cost proxy)', fontsize=10)
+    ax.set_ylabel('Mean |Wealth Gap| vs White Family (%)', fontsize=10)
+    ax.set_title('IDR Plan Optimizer: Wealth Gap vs Federal Cost\n'
+                 'Repayment rate × FPL multiplier × term | Common random numbers across plans',
+                 fontsize=11, fontweight='bold')
+    ax.grid(alpha=0.3)
+    ax.legend(fontsize=8)
+    plt.tight_layout()
+    if save_path is not None:
+        plt.savefig(save_path, dpi=dpi, bbox_inches='tight')
+    return fig
@@ -0,0 +1,273 @@
+"""Population synthesis from CPS ASEC / IPUMS microdata.
+
+The simulators draw individual income as N(avg_income x factor, income_se),
+but income_se is the sampling error of the group median, not the spread of
+incomes, so every simulated individual earns almost the same amount. Here
+each group gets a weighted empirical income distribution built from
+microdata, and the kernels draw from it in O(1) per individual with Walker's
+alias method.
+
+Data source, in order of preference:
+    1. a local IPUMS-CPS ASEC extract (CSV or CSV.gz) named by
+       ``WEALTH_POPULATION_EXTRACT``; the following variables are used:
+       ASECWT, SEX, RACE, HISPAN, INCWAGE, and for families RELATE and
+       FTOTVAL; WKSWORK1 / UHRSWORKLY restrict persons to full-time,
+       year-round workers when present;
+    2. the bundled synthetic stand-in ``data/synthetic_cps_asec_extract.csv``
+       (same layout; log-normal incomes around the medians used in the IDR
+       script -- see ``write_synthetic_extract``).
+
+Distributions are normalised to a unit median (or mean) so the scripts keep
+their documented group levels and take only the *shape* from the data:
+    income = avg_income x factor x draw
+
+Built alias tables are cached as compact .npz arrays keyed by a fingerprint of
+the extract (path, size, mtime) under ``WEALTH_POPULATION_CACHE`` (default
+``sim_outputs/.cache`` at the repository root).
+"""
+
+import hashlib
+import os
+
+import numpy as np
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(os.path.dirname(PACKAGE_DIR))
+SYNTHETIC_EXTRACT = os.path.join(PACKAGE_DIR, 'data', 'synthetic_cps_asec_extract.csv')
+CACHE_VERSION = 1
+
+# IPUMS-CPS codes: SEX 1 = male, 2 = female; RACE 100 = White, 200 = Black;
+# HISPAN 0 = not Hispanic, 100-612 = Hispanic origin; RELATE 101 = householder.
+# INCWAGE / FTOTVAL codes >= 99999998 are NIU / missing.
+PERSON_GROUPS = {
+    'Black Men':    {'sex': 1, 'race': 200, 'hispanic': False},
+    'Black Women':  {'sex': 2, 'race': 200, 'hispanic': False},
+    'White Men':    {'sex': 1, 'race': 100, 'hispanic': False},
+    'White Women':  {'sex': 2, 'race': 100, 'hispanic': False},
+    'Latinx Men':   {'sex': 1, 'race': None, 'hispanic': True},
+    'Latinx Women': {'sex': 2, 'race': None, 'hispanic': True},
+}
+FAMILY_GROUPS = {
+    'Black':    {'race': 200, 'hispanic': False},
+    'White':    {'race': 100, 'hispanic': False},
+    'Hispanic': {'race': None, 'hispanic': True},
+}
+NIU_CODE = 99_999_998
+
+
+class AliasTable:
+    """Weighted discrete distribution sampled in O(1) per draw (Walker / Vose)."""
+
+    def __init__(self, values, prob, alias):
+        self.values = values                  # float64 (K,)
+        self.prob = prob                      # float64 (K,)  keep-probability per slot
+        self.alias = alias                    # int32   (K,)
+
+    @classmethod
+    def from_weights(cls, values, weights):
+        """Build the table from sample values and (survey) weights."""
+        values = np.asarray(values, dtype=float)
+        weights = np.asarray(weights, dtype=float)
+        keep = weights > 0
+        values, inverse = np.unique(values[keep], return_inverse=True)
+        weights = np.bincount(inverse, weights=weights[keep])
+        k = len(values)
+        if k == 0:
+            raise ValueError("cannot build an income distribution from zero records")
+
+        scaled = weights * k / weights.sum()
+        prob = np.ones(k)
+        alias = np.arange(k, dtype=np.int32)
+        small = [i for i in range(k) if scaled[i] < 1.0]
+        large = [i for i in range(k) if scaled[i] >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        return cls(values, prob, alias)
+
+    def sample(self, rng, n):
+        """Draw ``n`` values; ``rng`` is np.random, a RandomState or a Generator."""
+        return self.sample_quantile(rng.random(n))
+
+    def sample_quantile(self, u):
+        """Map uniforms ``u`` to draws with one uniform per draw (slot = integer part,
+        coin = fractional part). Sharing ``u`` across groups gives common random numbers.
+        """
+        u = np.asarray(u) * len(self.values)
+        slot = np.minimum(u.astype(np.int64), len(self.values) - 1)
+        idx = np.where(u - slot < self.prob[slot], slot, self.alias[slot])
+        return self.values[idx]
+
+    def moments(self):
+        """(weighted mean, weighted median) implied by the table."""
+        k = len(self.values)
+        mass = self.prob / k
+        np.add.at(mass, self.alias, (1.0 - self.prob) / k)
+        order = np.argsort(self.values)
+        cdf = np.cumsum(mass[order])
+        median = self.values[order][np.searchsorted(cdf, 0.5)]
+        return float(mass @ self.values), float(median)
+
+    def normalized(self, to='median'):
+        """Copy with values divided by the distribution's median (or mean)."""
+        mean, median = self.moments()
+        scale = median if to == 'median' else mean
+        return AliasTable(self.values / scale, self.prob, self.alias)
+
+
+# =============================================================================
+# Loading
+# =============================================================================
+def _read_extract(path):
+    """Read the IPUMS columns we need into a dict of float arrays."""
+    opener = open
+    if path.endswith('.gz'):
+        import gzip
+        opener = gzip.open
+    with opener(path, 'rt') as f:
+        header = [h.strip().strip('"').upper() for h in f.readline().split(',')]
+    wanted = ['ASECWT', 'SEX', 'RACE', 'HISPAN', 'INCWAGE', 'RELATE', 'FTOTVAL',
+              'WKSWORK1', 'UHRSWORKLY']
+    missing = [c for c in wanted[:5] if c not in header]
+    if missing:
+        raise ValueError(f"{path}: extract is missing required IPUMS variables {missing}")
+    cols = [c for c in wanted if c in header]
+    table = np.loadtxt(path, delimiter=',', skiprows=1, usecols=[header.index(c) for c in cols],
+                       dtype=float, ndmin=2)
+    return {c: table[:, i] for i, c in enumerate(cols)}
+
+
+def _group_mask(rec, spec):
+    hispanic = (rec['HISPAN'] > 0) & (rec['HISPAN'] < 900)
+    if spec['hispanic']:
+        mask = hispanic
+    else:
+        mask = ~hispanic & (rec['RACE'] == spec['race'])
+    if 'sex' in spec:
+        mask &= rec['SEX'] == spec['sex']
+    return mask
+
+
+def build_distributions(path):
+    """Build {'person': {group: AliasTable}, 'family': {...}} from an extract."""
+    rec = _read_extract(path)
+    weight = rec['ASECWT']
+
+    earner = (rec['INCWAGE'] > 0) & (rec['INCWAGE'] < NIU_CODE)
+    if 'WKSWORK1' in rec and 'UHRSWORKLY' in rec:
+        earner &= (rec['WKSWORK1'] >= 50) & (rec['UHRSWORKLY'] >= 35)    # full-time, year-round
+    person = {g: AliasTable.from_weights(rec['INCWAGE'][earner & _group_mask(rec, spec)],
+                                         weight[earner & _group_mask(rec, spec)])
+              for g, spec in PERSON_GROUPS.items()}
+
+    family = {}
+    if 'FTOTVAL' in rec and 'RELATE' in rec:
+        householder = (rec['RELATE'] == 101) & (rec['FTOTVAL'] > 0) & (rec['FTOTVAL'] < NIU_CODE)
+        family = {g: AliasTable.from_weights(rec['FTOTVAL'][householder & _group_mask(rec, spec)],
+                                             weight[householder & _group_mask(rec, spec)])
+                  for g, spec in FAMILY_GROUPS.items()}
+    return {'person': person, 'family': family}
+
+
+def _fingerprint(path):
+    st = os.stat(path)
+    key = f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}|v{CACHE_VERSION}"
+    return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+
+def _save_cache(path, dists):
+    arrays = {}
+    for kind, groups in dists.items():
+        for g, table in groups.items():
+            for field in ('values', 'prob', 'alias'):
+                arrays[f'{kind}|{g}|{field}'] = getattr(table, field)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + '.tmp.npz'
+    np.savez_compressed(tmp, **arrays)
+    os.replace(tmp, path)
+
+
+def _load_cache(path):
+    dists = {'person': {}, 'family': {}}
+    with np.load(path) as z:
+        fields = {}
+        for key in z.files:
+            kind, g, field = key.split('|')
+            fields.setdefault((kind, g), {})[field] = z[key]
+    for (kind, g), f in fields.items():
+        dists[kind][g] = AliasTable(f['values'], f['prob'], f['alias'])
+    return dists
+
+
+_loaded = {}
+
+
+def load_population(path=None, cache_dir=None):
+    """Per-group income distributions from ``path`` (or the env / bundled extract), cached.
+
+    Returns {'person': {group: AliasTable}, 'family': {race: AliasTable},
+    'source': path}. Tables hold raw dollars; use ``.normalized()`` for shapes.
+    """
+    if path is None:
+        path = os.environ.get('WEALTH_POPULATION_EXTRACT') or SYNTHETIC_EXTRACT
+    if cache_dir is None:
+        cache_dir = os.environ.get('WEALTH_POPULATION_CACHE',
+                                   os.path.join(REPO_ROOT, 'sim_outputs', '.cache'))
+    key = _fingerprint(path)
+    if key in _loaded:
+        return _loaded[key]
+
+    cache_path = os.path.join(cache_dir, f'population_{key}.npz')
+    if os.path.exists(cache_path):
+        dists = _load_cache(cache_path)
+    else:
+        dists = build_distributions(path)
+        _save_cache(cache_path, dists)
+    dists['source'] = path
+    _loaded[key] = dists
+    return dists
+
+
+# =============================================================================
+# Synthetic stand-in
+# =============================================================================
+def write_synthetic_extract(path=SYNTHETIC_EXTRACT, n_per_group=600, seed=2024):
+    """Regenerate the bundled synthetic extract (IPUMS layout, no real records).
+
+    Person wages are log-normal around the CPS ASEC 2024 medians used in the
+    IDR script (sigma 0.55); family income FTOTVAL is log-normal around the
+    ACS 2024 family medians (sigma 0.75). About 60% of rows are householders.
+    Survey weights are uniform on [500, 3000].
+    """
+    person_medians = {
+        'Black Men': 60_000, 'Black Women': 56_000, 'White Men': 75_000,
+        'White Women': 60_000, 'Latinx Men': 65_000, 'Latinx Women': 50_000,
+    }
+    family_medians = {200: 72_136, 100: 111_253, 'hispanic': 78_918}
+    gen = np.random.default_rng(seed)
+    rows = []
+    serial = 0
+    for group, spec in PERSON_GROUPS.items():
+        for _ in range(n_per_group):
+            serial += 1
+            hispan = int(gen.choice([100, 200, 300, 400, 500])) if spec['hispanic'] else 0
+            race = int(gen.choice([100, 200], p=[0.9, 0.1])) if spec['hispanic'] else spec['race']
+            fam_median = family_medians['hispanic' if spec['hispanic'] else spec['race']]
+            rows.append((
+                2024, serial, 1,
+                round(float(gen.uniform(500, 3000)), 2),
+                int(gen.integers(25, 65)), spec['sex'], race, hispan,
+                101 if gen.random() < 0.6 else 201,
+                int(round(person_medians[group] * np.exp(0.55 * gen.standard_normal()), -2)),
+                int(round(fam_median * np.exp(0.75 * gen.standard_normal()), -2)),
+                52, 40,
+            ))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write('YEAR,SERIAL,PERNUM,ASECWT,AGE,SEX,RACE,HISPAN,RELATE,INCWAGE,FTOTVAL,WKSWORK1,UHRSWORKLY\n')
+        for r in rows:
+            f.write(','.join(str(v) for v in r) + '\n')
+    return path
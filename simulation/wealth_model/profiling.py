@@ -0,0 +1,241 @@
+"""Run instrumentation for the IDR wealth simulation.
+
+Tracks wall time per part and per simulated cell, individuals simulated per
+second, the split between random-number generation, array arithmetic and
+plotting/IO, and peak resident memory. Progress is rendered as a single-line
+bar on the terminal and the full profile is written to ``run_profile.json``.
+
+Usage (inside IDR_Plans_Analysis_SaveLocal.py):
+    profiler = RunProfiler(num_individuals)
+    rng = profiler.timed_random(np.random)      # drop-in for np.random in the kernel
+    wealth_gap_surface(..., wrap_random=profiler.timed_random)   # batched kernels' Generators
+    profiler.start_part('Part 1: Individual scenarios', total_cells=108)
+    with profiler.cell('IBR_2014/Black Men/Lower 25%'):
+        simulate_wealth_with_idr(...)
+    profiler.finish()
+    profiler.save(os.path.join(output_dir, 'run_profile.json'))
+"""
+
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (None if unavailable)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    if sys.platform == 'darwin':
+        return peak / 1024 ** 2
+    return peak / 1024
+
+
+class _TimedRandom:
+    """Delegate to a numpy random namespace, charging each call to the profiler.
+
+    Calls pass straight through to the wrapped object, so the global random
+    stream (and therefore every simulated value) is unchanged.
+    """
+
+    def __init__(self, profiler, source):
+        self._profiler = profiler
+        self._source = source
+        self._wrapped = {}
+
+    def __getattr__(self, name):
+        if name in self._wrapped:
+            return self._wrapped[name]
+        attr = getattr(self._source, name)
+        if not callable(attr):
+            return attr
+        profiler = self._profiler
+
+        def timed(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return attr(*args, **kwargs)
+            finally:
+                profiler._charge_rng(time.perf_counter() - t0)
+
+        self._wrapped[name] = timed
+        return timed
+
+
+class RunProfiler:
+    """Collect per-part / per-cell timings and render a terminal progress bar."""
+
+    BAR_WIDTH = 30
+
+    def __init__(self, num_individuals, show_progress=None, stream=None):
+        self.num_individuals = int(num_individuals)
+        self.stream = stream if stream is not None else sys.stderr
+        if show_progress is None:
+            show_progress = (os.environ.get('IDR_PROGRESS', '1') != '0'
+                             and hasattr(self.stream, 'isatty') and self.stream.isatty())
+        self.show_progress = show_progress
+
+        self.parts = []
+        self.cells = []
+        self._part = None
+        self._cell = None
+        self._bar_open = False
+        self._started = time.perf_counter()
+        self._finished = None
+
+    # ------------------------------------------------------------------
+    # Hooks
+    # ------------------------------------------------------------------
+    def timed_random(self, source):
+        """Return a proxy for ``source`` (e.g. ``np.random``) that times every call."""
+        return _TimedRandom(self, source)
+
+    def _charge_rng(self, seconds):
+        if self._cell is not None:
+            self._cell['rng_s'] += seconds
+        elif self._part is not None:
+            self._part['rng_s'] += seconds
+
+    def start_part(self, name, total_cells=0):
+        """Close the current part (if any) and start timing a new one."""
+        self._close_part()
+        self._part = {
+            'name': name,
+            'total_cells': int(total_cells),
+            'cells': 0,
+            'individuals': 0,
+            'cell_s': 0.0,
+            'rng_s': 0.0,
+            '_t0': time.perf_counter(),
+        }
+
+    @contextmanager
+    def cell(self, label, individuals=None):
+        """Time one simulation cell (one call into the Monte Carlo kernel)."""
+        if individuals is None:
+            individuals = self.num_individuals
+        self._cell = {'label': label, 'individuals': int(individuals), 'rng_s': 0.0}
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - t0
+            cell, self._cell = self._cell, None
+            cell['wall_s'] = wall
+            cell['arithmetic_s'] = max(wall - cell['rng_s'], 0.0)
+            cell['individuals_per_s'] = cell['individuals'] / wall if wall > 0 else None
+            part = self._part
+            if part is not None:
+                cell['part'] = part['name']
+                part['cells'] += 1
+                part['individuals'] += cell['individuals']
+                part['cell_s'] += wall
+                part['rng_s'] += cell['rng_s']
+            self.cells.append(cell)
+            self._render()
+
+    def finish(self):
+        """Close the last part and stop the run clock."""
+        self._close_part()
+        self._finished = time.perf_counter()
+
+    # ------------------------------------------------------------------
+    # Progress bar
+    # ------------------------------------------------------------------
+    def _render(self):
+        part = self._part
+        if not self.show_progress or part is None:
+            return
+        done, total = part['cells'], part['total_cells']
+        elapsed = time.perf_counter() - part['_t0']
+        rate = part['individuals'] / part['cell_s'] if part['cell_s'] > 0 else 0.0
+        if total > 0:
+            frac = min(done / total, 1.0)
+            filled = int(round(frac * self.BAR_WIDTH))
+            bar = '#' * filled + '-' * (self.BAR_WIDTH - filled)
+            eta = elapsed / done * (total - done) if done else 0.0
+            counter = f'{done}/{total} cells  ETA {eta:5.1f}s'
+        else:
+            bar = '#' * self.BAR_WIDTH
+            counter = f'{done} cells'
+        line = (f"\r  {part['name'][:32]:<32} [{bar}] {counter}  "
+                f"{rate / 1e6:6.2f}M ind/s  {elapsed:6.1f}s")
+        self.stream.write(line)
+        self._bar_open = True
+        if total > 0 and done >= total:
+            # Part finished simulating: release the line for plotting output
+            self._end_bar()
+        self.stream.flush()
+
+    def _end_bar(self):
+        if self._bar_open:
+            self.stream.write('\n')
+            self.stream.flush()
+            self._bar_open = False
+
+    def _close_part(self):
+        part = self._part
+        if part is None:
+            return
+        self._end_bar()
+        wall = time.perf_counter() - part.pop('_t0')
+        part['wall_s'] = wall
+        part['arithmetic_s'] = max(part['cell_s'] - part['rng_s'], 0.0)
+        part['plotting_and_io_s'] = max(wall - part['cell_s'], 0.0)
+        part['individuals_per_s'] = (part['individuals'] / part['cell_s']
+                                     if part['cell_s'] > 0 else None)
+        part['peak_rss_mb'] = peak_rss_mb()
+        self.parts.append(part)
+        self._part = None
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+    def to_dict(self):
+        end = self._finished if self._finished is not None else time.perf_counter()
+        total_wall = end - self._started
+        individuals = sum(p['individuals'] for p in self.parts)
+        cell_s = sum(p['cell_s'] for p in self.parts)
+        return {
+            'num_individuals_per_cell': self.num_individuals,
+            'total_wall_s': total_wall,
+            'total_cells': sum(p['cells'] for p in self.parts),
+            'total_individuals_simulated': individuals,
+            'individuals_per_s': individuals / cell_s if cell_s > 0 else None,
+            'peak_rss_mb': peak_rss_mb(),
+            'breakdown_s': {
+                'rng': sum(p['rng_s'] for p in self.parts),
+                'arithmetic': sum(p['arithmetic_s'] for p in self.parts),
+                'plotting_and_io': sum(p['plotting_and_io_s'] for p in self.parts),
+                'unattributed': max(total_wall - sum(p['wall_s'] for p in self.parts), 0.0),
+            },
+            'parts': self.parts,
+            'cells': self.cells,
+        }
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return path
+
+    def print_summary(self):
+        """Print a per-part timing table."""
+        prof = self.to_dict()
+        print(f"\n{'Part':<44} {'Wall':>8} {'Cells':>6} {'RNG':>7} {'Arith':>7} {'Plot/IO':>8} {'M ind/s':>8}")
+        print("-" * 94)
+        for p in prof['parts']:
+            rate = p['individuals_per_s']
+            print(f"{p['name'][:44]:<44} {p['wall_s']:>7.1f}s {p['cells']:>6} "
+                  f"{p['rng_s']:>6.1f}s {p['arithmetic_s']:>6.1f}s {p['plotting_and_io_s']:>7.1f}s "
+                  f"{(rate / 1e6 if rate else 0.0):>8.2f}")
+        peak = prof['peak_rss_mb']
+        print(f"\nTotal: {prof['total_wall_s']:.1f}s, {prof['total_individuals_simulated']:,} individuals simulated"
+              + (f", peak RSS {peak:.0f} MB" if peak is not None else ""))
@@ -0,0 +1,191 @@
+"""Deterministic reductions for Monte Carlo summaries.
+
+``np.mean`` and ``np.std`` give results that depend on how an array is split:
+summing 200k values in one call, in two chunks, or in worker-sized pieces
+that are added up in whatever order the workers finish gives different last
+bits. Regression diffs of ``simulation_summary.json`` then show spurious
+changes as soon as a run is chunked or parallelized differently.
+
+Here every sum is taken over fixed blocks of the *global* sample index:
+
+    block b = samples [b * BLOCK_SIZE, (b + 1) * BLOCK_SIZE)
+    block partials  np.add.reduce over one contiguous block (same length and
+                    contents -> same bits, whichever worker computes it)
+    total           math.fsum of the block partials (correctly rounded, so
+                    the order in which partials arrive does not matter)
+
+Variance uses per-block (count, sum, sum of squared deviations from the block
+mean), combined with Chan's update around the global mean, again through
+fsum. ``BlockReducer`` accepts chunks of any size with their global offset and
+can be merged with reducers filled by other workers; its results are
+bit-identical to ``mean`` / ``var`` on the concatenated array for any
+chunking and any number of workers.
+
+Quantiles are order statistics and already independent of chunking; they are
+computed on the gathered sample. Batch-means CIs (confidence.py) use
+``row_means`` so their batch estimates are reproducible in the same way.
+"""
+
+import math
+
+import numpy as np
+
+BLOCK_SIZE = 4096
+
+
+def _block_stats(x):
+    """(counts, sums, m2) per block of a 1-D array that starts on a block boundary."""
+    x = np.asarray(x, dtype=float)
+    full = len(x) // BLOCK_SIZE
+    rows = [x[:full * BLOCK_SIZE].reshape(full, BLOCK_SIZE)] if full else []
+    if len(x) > full * BLOCK_SIZE:
+        rows.append(x[full * BLOCK_SIZE:][None, :])
+    counts, sums, m2 = [], [], []
+    for r in rows:
+        s = np.add.reduce(r, axis=1)
+        d = r - (s / r.shape[1])[:, None]
+        counts.extend([r.shape[1]] * r.shape[0])
+        sums.extend(s.tolist())
+        m2.extend(np.add.reduce(d * d, axis=1).tolist())
+    return counts, sums, m2
+
+
+def _combine(counts, sums, m2, ddof=0):
+    """(n, mean, variance) from block stats, independent of their order."""
+    n = int(sum(counts))
+    if n == 0:
+        raise ValueError("cannot reduce an empty sample")
+    mean = math.fsum(sums) / n
+    shift = [c * (s / c - mean) ** 2 for c, s in zip(counts, sums)]
+    var = (math.fsum(m2) + math.fsum(shift)) / max(n - ddof, 1)
+    return n, mean, var
+
+
+def exact_sum(x):
+    """Sum of ``x`` over fixed blocks (see module docstring)."""
+    return math.fsum(_block_stats(np.ravel(x))[1])
+
+
+def mean(x):
+    """Mean of ``x``, independent of how the sample was chunked."""
+    return _combine(*_block_stats(np.ravel(x)))[1]
+
+
+def mean_std(x, ddof=0):
+    """(mean, standard deviation) in one pass over the blocks."""
+    _, m, v = _combine(*_block_stats(np.ravel(x)), ddof=ddof)
+    return m, math.sqrt(v)
+
+
+def var(x, ddof=0):
+    return _combine(*_block_stats(np.ravel(x)), ddof=ddof)[2]
+
+
+def std(x, ddof=0):
+    return math.sqrt(var(x, ddof))
+
+
+def row_means(a):
+    """Deterministic mean of every row of a 2-D array (e.g. batch means)."""
+    return np.array([mean(row) for row in np.asarray(a, dtype=float)])
+
+
+def quantile(x, q):
+    """``np.quantile``; order statistics do not depend on chunking."""
+    return np.quantile(np.ravel(x), q)
+
+
+class BlockReducer:
+    """Streaming, mergeable mean / variance over a sample with a global index.
+
+    ``add(chunk, start)`` takes a chunk whose first element is sample
+    ``start`` (default: right after the previous chunk). Complete blocks are
+    reduced at once; block fragments are held until the rest arrives, from
+    this reducer or from one merged in with ``merge``.
+    """
+
+    def __init__(self):
+        self.blocks = {}         # block index -> (count, sum, m2)
+        self.fragments = {}      # block index -> {offset within block: array}
+        self.next_start = 0
+
+    def add(self, chunk, start=None):
+        chunk = np.asarray(chunk, dtype=float).ravel()
+        start = self.next_start if start is None else int(start)
+        self.next_start = start + len(chunk)
+        pos, end = start, start + len(chunk)
+        while pos < end:
+            b, offset = divmod(pos, BLOCK_SIZE)
+            take = min(BLOCK_SIZE - offset, end - pos)
+            piece = chunk[pos - start:pos - start + take]
+            if offset == 0 and take == BLOCK_SIZE:
+                # whole blocks in one go
+                k = (end - pos) // BLOCK_SIZE
+                self._store(b, chunk[pos - start:pos - start + k * BLOCK_SIZE])
+                pos += k * BLOCK_SIZE
+                continue
+            self.fragments.setdefault(b, {})[offset] = piece.copy()
+            self._try_complete(b)
+            pos += take
+        return self
+
+    def _store(self, first_block, x):
+        for i, stats in enumerate(zip(*_block_stats(x))):
+            if first_block + i in self.blocks:
+                raise ValueError(f"block {first_block + i} was added twice")
+            self.blocks[first_block + i] = stats
+
+    def _assemble(self, b):
+        pieces = sorted(self.fragments[b].items())
+        pos = 0
+        for offset, piece in pieces:
+            if offset != pos:
+                return None
+            pos += len(piece)
+        return np.concatenate([p for _, p in pieces])
+
+    def _try_complete(self, b):
+        x = self._assemble(b)
+        if x is not None and len(x) == BLOCK_SIZE:
+            del self.fragments[b]
+            self._store(b, x)
+
+    def merge(self, other):
+        """Fold in a reducer that saw other (disjoint) parts of the sample."""
+        for b, stats in other.blocks.items():
+            if b in self.blocks:
+                raise ValueError(f"block {b} was added twice")
+            self.blocks[b] = stats
+        for b, pieces in other.fragments.items():
+            self.fragments.setdefault(b, {}).update(pieces)
+            self._try_complete(b)
+        self.next_start = max(self.next_start, other.next_start)
+        return self
+
+    def _stats(self):
+        blocks = dict(self.blocks)
+        if self.fragments:
+            last = max(self.fragments)
+            if len(self.fragments) > 1 or (blocks and max(blocks) > last):
+                raise ValueError("sample has gaps: some blocks are incomplete")
+            x = self._assemble(last)
+            if x is None:
+                raise ValueError(f"block {last} has gaps")
+            blocks[last] = tuple(s[0] for s in _block_stats(x))
+        if sorted(blocks) != list(range(len(blocks))):
+            raise ValueError("sample has gaps: some blocks are missing")
+        order = sorted(blocks)
+        return [[blocks[b][i] for b in order] for i in range(3)]
+
+    @property
+    def n(self):
+        return _combine(*self._stats())[0] if (self.blocks or self.fragments) else 0
+
+    def mean(self):
+        return _combine(*self._stats())[1]
+
+    def var(self, ddof=0):
+        return _combine(*self._stats(), ddof=ddof)[2]
+
+    def std(self, ddof=0):
+        return math.sqrt(self.var(ddof))
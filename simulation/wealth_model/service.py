@@ -0,0 +1,547 @@
+"""Local HTTP service that evaluates single IDR scenario cells on demand.
+
+Getting one number out of the IDR script (say, mean net worth of Black women
+in the median bracket under PAYE at a 7% mortgage rate) means a full run of
+every part. The service keeps the script's inputs in memory and simulates
+only the requested cell:
+
+    GET  /health                 status, pool size, in-flight count, counters
+    GET  /scenarios              groups, tiers, plans and overridable model keys
+    GET  /evaluate?group=...     one cell as JSON (query parameters)
+    POST /evaluate               one cell, or {"scenarios": [...]}, as JSON
+    GET  /evaluate.png?...       net-worth histogram of one cell
+
+A scenario names a ``group`` (an individual group such as 'Black Women', or
+a family race such as 'Black'), a ``plan`` and either a ``tier`` name or an
+income ``factor``. Optional overrides are the plan parameters
+(repayment_rate, years, fpl_multiplier), ``debt_mean``, any numeric key of
+the model constants (e.g. mortgage_interest_rate), ``n`` and ``seed``.
+
+Requests are resolved to their full inputs and hashed, so equal requests get
+the same key however they are spelled. Each key is:
+    served from the in-memory or on-disk cache if it has been evaluated;
+    attached to the running evaluation if one is in flight (deduplication);
+    otherwise queued on a bounded thread pool. When ``max_pending``
+    evaluations are queued or running, new keys get 503.
+
+Every cell draws from its own RandomState(seed), so a result is a pure
+function of its key and can be cached on disk. It matches the script's cell
+up to Monte Carlo noise (the script draws all cells from one global stream),
+which is why every mean carries a 95% CI. Cells use the script's
+IDR_INCOME_MODEL and IDR_JOINT_MODEL settings (empirical income shapes and
+copula samplers are taken from the script's namespace), and each resolved
+scenario records them, so results cached under one setting are never served
+under another. The heavy array work in numpy releases the GIL, so worker
+threads overlap.
+
+Malformed requests (wrong types, unknown names, numbers outside
+``PARAMETER_BOUNDS``, listed by /scenarios) get 400; anything unexpected gets 500 with the error message rather than a
+dropped connection.
+"""
+
+import hashlib
+import io
+import json
+import math
+import os
+import threading
+import time
+import traceback
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from .confidence import cell_summary, mean_ci
+from .core import IDRRepayment, LoanAccounting, model_params_from, simulate_net_worth
+
+PLAN_PARAMETERS = ('repayment_rate', 'years', 'fpl_multiplier')
+# Accepted range of every overridable number: (low, high, low excluded). Model
+# constants without an entry cannot be overridden.
+PARAMETER_BOUNDS = {
+    'factor':                          (0.0, 10.0, True),
+    'repayment_rate':                  (0.0, 1.0, True),
+    'years':                           (1, 60, False),
+    'fpl_multiplier':                  (0.0, 10.0, False),
+    'debt_mean':                       (0.0, 1_000_000.0, False),
+    'inflation_rate':                  (0.0, 1.0, False),
+    'employment_rates_se':             (0.0, 1.0, False),
+    'student_loan_interest_rate':      (0.0, 1.0, False),
+    'average_home_price_multiplier':   (0.0, 50.0, True),
+    'mortgage_down_payment':           (0.0, 1.0, False),
+    'mortgage_term_years':             (1, 50, False),
+    'mortgage_interest_rate':          (0.0, 1.0, True),
+    'home_appreciation_rate_real':     (-1.0, 1.0, True),
+    'retirement_investment_rate':      (0.0, 1.0, False),
+    'retirement_real_return':          (-1.0, 1.0, True),
+    'personal_asset_growth_rate_real': (-1.0, 1.0, True),
+}
+INTEGER_PARAMETERS = ('years', 'mortgage_term_years', 'n', 'seed')
+HISTOGRAM_BINS = 60
+SCHEMA_VERSION = 2   # bump when the result layout or the kernel changes
+
+
+class ServiceBusy(Exception):
+    """Raised when the pool already holds ``max_pending`` evaluations."""
+
+
+def baseline_from(namespace):
+    """Collect the scenario inputs from the IDR script's module namespace.
+
+    Individual groups use the single-person FPL and the pooled debt, family
+    races the family-of-4 FPL and the race-specific debt, as in Parts 1 and 2.
+    The script's per-group income shapes (IDR_INCOME_MODEL=empirical) and
+    copula samplers (IDR_JOINT_MODEL) are carried over as well.
+    """
+    ns = namespace
+    income_dists = dict(ns.get('income_shapes') or {})
+    joint_samplers = dict(ns.get('joint_samplers') or {})
+    groups = {}
+    for name, d in ns['data'].items():
+        groups[name] = {
+            'kind': 'individual', 'avg_income': d['avg_income'], 'income_se': d['income_se'],
+            'home_rate': ns['home_purchase_rates'][name],
+            'home_rate_moe': ns['home_purchase_rates_moe'][name],
+            'emp_rates': list(ns['employment_rates'][name]), 'fpl_base': ns['fpl_single'],
+            'debt_mean': ns['initial_student_loan_debt'],
+            'debt_se': ns['initial_student_loan_debt_se'],
+            'tiers': dict(zip(ns['income_brackets'], ns['income_factors'])),
+        }
+    for race, income in ns['family_income_by_race'].items():
+        debt = ns['initial_student_loan_debt_by_race'][race]
+        groups[race] = {
+            'kind': 'family', 'avg_income': income, 'income_se': ns['family_income_moe'][race],
+            'home_rate': ns['home_purchase_rates_by_race'][race],
+            'home_rate_moe': ns['home_purchase_rates_moe_by_race'][race],
+            'emp_rates': list(ns['employment_rates_by_race'][race]),
+            'fpl_base': ns['fpl_family_of_4'], 'debt_mean': debt['mean'], 'debt_se': debt['se'],
+            'tiers': dict(ns['family_income_tiers']),
+        }
+    for name, group in groups.items():
+        group['income_model'] = _income_model(income_dists.get(name))
+        group['joint_model'] = _joint_model(joint_samplers.get(name))
+    return {
+        'groups': groups,
+        'income_dists': income_dists,
+        'joint_samplers': joint_samplers,
+        'plans': {name: dict(p) for name, p in ns['idr_plans'].items()},
+        'model': model_params_from(ns),
+        'n_individuals': int(ns['num_individuals']),
+        'discount_rate': ns['federal_discount_rate_real'],
+    }
+
+
+def _income_model(table):
+    """Scenario-key description of a group's income model (the table's content hash)."""
+    if table is None:
+        return 'normal'
+    blob = b''.join(np.ascontiguousarray(a).tobytes() for a in (table.values, table.prob, table.alias))
+    return f"empirical:{hashlib.sha1(blob).hexdigest()[:12]}"
+
+
+def _joint_model(sampler):
+    """Scenario-key description of a group's joint draw model."""
+    if sampler is None:
+        return 'independent'
+    return {'family': sampler.family, 'df': sampler.df, 'corr': np.round(sampler.corr, 12).tolist()}
+
+
+# =============================================================================
+# Scenario resolution and evaluation
+# =============================================================================
+def _number(value, name):
+    # Query strings arrive as text, JSON bodies as numbers; nothing else is a number
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError(f"{name} must be a number, got {value!r}")
+    try:
+        number = float(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a number, got {value!r}")
+    if not math.isfinite(number):
+        raise ValueError(f"{name} must be finite, got {value!r}")
+    return number
+
+
+def _bounded(value, name):
+    number = _number(value, name)
+    low, high, low_excluded = PARAMETER_BOUNDS[name]
+    if number > high or number < low or (low_excluded and number == low):
+        raise ValueError(f"{name} must be {'>' if low_excluded else '>='} {low} and <= {high}, "
+                         f"got {value!r}")
+    if name in INTEGER_PARAMETERS and not number.is_integer():
+        raise ValueError(f"{name} must be a whole number, got {value!r}")
+    return number
+
+
+def _whole(value, name):
+    number = _number(value, name)
+    if not number.is_integer():
+        raise ValueError(f"{name} must be a whole number, got {value!r}")
+    return int(number)
+
+
+def _name(value, name):
+    if not isinstance(value, str):
+        raise ValueError(f"{name} must be a string, got {value!r}")
+    return value
+
+
+def resolve_scenario(baseline, request, max_n=None):
+    """Full, canonical inputs of one request (a dict of strings or JSON values).
+
+    Raises ValueError for a request that is not an object, for values of the
+    wrong type, for unknown groups, plans, tiers or parameters, and for
+    numbers outside ``PARAMETER_BOUNDS`` (checked before anything is
+    simulated or cached).
+    """
+    if not isinstance(request, dict):
+        raise ValueError(f"a scenario must be a JSON object, got {request!r}")
+    request = dict(request)
+    group_name = _name(request.pop('group', None), 'group')
+    if group_name not in baseline['groups']:
+        raise ValueError(f"group must be one of {sorted(baseline['groups'])}, got {group_name!r}")
+    group = baseline['groups'][group_name]
+    plan_name = _name(request.pop('plan', None), 'plan')
+    if plan_name not in baseline['plans']:
+        raise ValueError(f"plan must be one of {sorted(baseline['plans'])}, got {plan_name!r}")
+    plan = dict(baseline['plans'][plan_name])
+
+    tier = request.pop('tier', None)
+    if tier is not None:
+        if _name(tier, 'tier') not in group['tiers']:
+            raise ValueError(f"tier for {group_name} must be one of {list(group['tiers'])}, got {tier!r}")
+        factor = group['tiers'][tier]
+        request.pop('factor', None)
+    else:
+        factor = _bounded(request.pop('factor', 1.0), 'factor')
+
+    for key in PLAN_PARAMETERS:
+        if key in request:
+            plan[key] = _bounded(request.pop(key), key)
+    plan['years'] = int(plan['years'])
+
+    model = dict(baseline['model'])
+    debt_mean = _bounded(request.pop('debt_mean', group['debt_mean']), 'debt_mean')
+    n = _whole(request.pop('n', baseline['n_individuals']), 'n')
+    if n < 100 or (max_n is not None and n > max_n):
+        raise ValueError(f"n must be between 100 and {max_n}, got {n}")
+    seed = _whole(request.pop('seed', 42), 'seed')
+    if not 0 <= seed < 2 ** 32:
+        raise ValueError(f"seed must be between 0 and 2**32 - 1, got {seed}")
+    for key in list(request):
+        if key not in model or key not in PARAMETER_BOUNDS:
+            raise ValueError(f"unknown scenario parameter {key!r}")
+        model[key] = type(model[key])(_bounded(request.pop(key), key))
+
+    return {
+        'group': group_name, 'kind': group['kind'], 'plan': plan_name, 'plan_settings': plan,
+        'factor': factor, 'avg_income': group['avg_income'], 'income_se': group['income_se'],
+        'home_rate': group['home_rate'], 'home_rate_moe': group['home_rate_moe'],
+        'emp_rates': group['emp_rates'], 'fpl_base': group['fpl_base'],
+        'debt_mean': debt_mean, 'debt_se': group['debt_se'], 'model': model,
+        'discount_rate': baseline['discount_rate'], 'n': n, 'seed': seed,
+        'income_model': group['income_model'], 'joint_model': group['joint_model'],
+    }
+
+
+def scenario_key(scenario):
+    """Stable hash of a resolved scenario (and of SCHEMA_VERSION)."""
+    blob = json.dumps([SCHEMA_VERSION, scenario], sort_keys=True, default=float)
+    return hashlib.sha1(blob.encode()).hexdigest()[:20]
+
+
+def evaluate_scenario(scenario, income_dist=None, joint=None):
+    """Simulate one resolved scenario; returns a JSON-ready result dict.
+
+    ``income_dist`` and ``joint`` are the group's unit-median income shape
+    and copula sampler when the scenario's income / joint model uses them.
+    """
+    t0 = time.perf_counter()
+    s = scenario
+    model = s['model']
+    repayment = IDRRepayment.from_plan(s['plan_settings'], s['fpl_base'],
+                                       model['student_loan_interest_rate'])
+    ledger = LoanAccounting(s['discount_rate'])
+    net_worth = simulate_net_worth(
+        np.random.RandomState(s['seed']), s['n'], s['avg_income'], s['factor'], s['home_rate'],
+        s['emp_rates'], repayment, model, income_se=s['income_se'],
+        home_rate_moe=s['home_rate_moe'], debt_mean=s['debt_mean'], debt_se=s['debt_se'],
+        income_dist=income_dist, joint=joint, accounting=ledger)
+    mean, low, high = mean_ci(net_worth)
+    lo_edge, hi_edge = np.percentile(net_worth, [1, 99])
+    counts, edges = np.histogram(net_worth, bins=HISTOGRAM_BINS, range=(lo_edge, hi_edge))
+    return {
+        'scenario': s,
+        'net_worth': dict({'mean': float(mean), 'ci95_low': float(low), 'ci95_high': float(high)},
+                          **cell_summary(net_worth)),
+        'federal_cost': ledger.summary(),
+        'histogram': {'edges': edges.tolist(), 'counts': counts.tolist(), 'range': 'p1-p99'},
+        'elapsed_s': round(time.perf_counter() - t0, 4),
+    }
+
+
+_plot_lock = threading.Lock()
+
+
+def render_histogram(result, dpi=110):
+    """PNG bytes of a result's net-worth histogram (matplotlib Agg, no pyplot)."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    s, nw, hist = result['scenario'], result['net_worth'], result['histogram']
+    edges = np.asarray(hist['edges'])
+    with _plot_lock:
+        fig = Figure(figsize=(8, 4.5))
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot(1, 1, 1)
+        ax.bar(edges[:-1] / 1000, hist['counts'], width=np.diff(edges) / 1000, align='edge',
+               color='#3498DB', edgecolor='white', linewidth=0.3)
+        ax.axvline(nw['mean'] / 1000, color='#C0392B', linewidth=1.5,
+                   label=f"mean ${nw['mean'] / 1000:,.0f}K "
+                         f"(95% CI {nw['ci95_low'] / 1000:,.0f}–{nw['ci95_high'] / 1000:,.0f})")
+        ax.axvline(nw['median'] / 1000, color='#333333', linestyle='--', linewidth=1.2,
+                   label=f"median ${nw['median'] / 1000:,.0f}K")
+        ax.set_title(f"{s['group']} · {s['plan'].replace('_', ' ')} · income × {s['factor']:g} "
+                     f"(n = {s['n']:,}, seed {s['seed']})", fontsize=10, fontweight='bold')
+        ax.set_xlabel('Net worth at retirement (K, real 2025 $; P1–P99)')
+        ax.set_ylabel('Individuals')
+        ax.legend(fontsize=8)
+        ax.grid(axis='y', alpha=0.3)
+        fig.tight_layout()
+        buf = io.BytesIO()
+        fig.savefig(buf, format='png', dpi=dpi)
+    return buf.getvalue()
+
+
+# =============================================================================
+# Cache, deduplication and worker pool
+# =============================================================================
+class ResultCache:
+    """Results by key in memory, backed by ``<key>.json`` / ``<key>.png`` files."""
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir
+        self.memory = {}
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key, ext):
+        return os.path.join(self.cache_dir, f'{key}.{ext}')
+
+    def _write(self, path, data, mode):
+        tmp = f'{path}.{threading.get_ident()}.tmp'
+        with open(tmp, mode) as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def get(self, key):
+        if key in self.memory:
+            return self.memory[key]
+        if self.cache_dir is not None and os.path.exists(self._path(key, 'json')):
+            with open(self._path(key, 'json')) as f:
+                self.memory[key] = json.load(f)
+            return self.memory[key]
+        return None
+
+    def put(self, key, result):
+        self.memory[key] = result
+        if self.cache_dir is not None:
+            self._write(self._path(key, 'json'), json.dumps(result), 'w')
+
+    def get_png(self, key):
+        if self.cache_dir is not None and os.path.exists(self._path(key, 'png')):
+            with open(self._path(key, 'png'), 'rb') as f:
+                return f.read()
+        return None
+
+    def put_png(self, key, png):
+        if self.cache_dir is not None:
+            self._write(self._path(key, 'png'), png, 'wb')
+
+
+class ScenarioService:
+    """Cached, deduplicated evaluation of scenarios on a bounded thread pool."""
+
+    def __init__(self, baseline, workers=2, max_pending=32, cache_dir=None, max_n=1_000_000):
+        self.baseline = baseline
+        self.workers = int(workers)
+        self.max_pending = int(max_pending)
+        self.max_n = int(max_n)
+        self.cache = ResultCache(cache_dir)
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='scenario')
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self.stats = {'requests': 0, 'cache_hits': 0, 'deduplicated': 0, 'evaluated': 0,
+                      'rejected': 0}
+
+    def resolve(self, request):
+        scenario = resolve_scenario(self.baseline, request, self.max_n)
+        return scenario_key(scenario), scenario
+
+    def _run(self, key, scenario):
+        group = scenario['group']
+        result = dict(evaluate_scenario(scenario, self.baseline['income_dists'].get(group),
+                                        self.baseline['joint_samplers'].get(group)), key=key)
+        self.cache.put(key, result)
+        return result
+
+    def _done(self, key):
+        with self._lock:
+            self._inflight.pop(key, None)
+
+    def submit(self, request):
+        """(key, future) for one request; the future may already be resolved."""
+        key, scenario = self.resolve(request)
+        with self._lock:
+            self.stats['requests'] += 1
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.stats['cache_hits'] += 1
+                return key, _resolved(cached)
+            future = self._inflight.get(key)
+            if future is not None:
+                self.stats['deduplicated'] += 1
+                return key, future
+            if len(self._inflight) >= self.max_pending:
+                self.stats['rejected'] += 1
+                raise ServiceBusy(f"{len(self._inflight)} evaluations pending; retry later")
+            future = self._pool.submit(self._run, key, scenario)
+            self._inflight[key] = future
+            self.stats['evaluated'] += 1
+        future.add_done_callback(lambda f: self._done(key))
+        return key, future
+
+    def evaluate(self, request, timeout=None):
+        """Result dict for one request, waiting up to ``timeout`` seconds."""
+        return self.submit(request)[1].result(timeout)
+
+    def evaluate_many(self, requests, timeout=None):
+        """Results for a list of requests, submitted together so they run in parallel."""
+        if not isinstance(requests, list):
+            raise ValueError(f"scenarios must be a list of scenario objects, got {requests!r}")
+        futures = [self.submit(r)[1] for r in requests]
+        return [f.result(timeout) for f in futures]
+
+    def png(self, request, timeout=None):
+        key, future = self.submit(request)
+        png = self.cache.get_png(key)
+        if png is None:
+            png = render_histogram(future.result(timeout))
+            self.cache.put_png(key, png)
+        return png
+
+    def describe(self):
+        b = self.baseline
+        return {
+            'groups': {name: {'kind': g['kind'], 'tiers': g['tiers'], 'income_model': g['income_model'],
+                              'joint_model': g['joint_model']}
+                       for name, g in b['groups'].items()},
+            'plans': b['plans'],
+            'plan_parameters': list(PLAN_PARAMETERS),
+            'model': {k: v for k, v in b['model'].items() if k in PARAMETER_BOUNDS},
+            'bounds': {k: {'low': low, 'high': high, 'low_excluded': excluded}
+                       for k, (low, high, excluded) in PARAMETER_BOUNDS.items()},
+            'defaults': {'factor': 1.0, 'n': b['n_individuals'], 'seed': 42, 'max_n': self.max_n},
+        }
+
+    def health(self):
+        with self._lock:
+            return {'status': 'ok', 'workers': self.workers, 'max_pending': self.max_pending,
+                    'in_flight': len(self._inflight), 'cached_in_memory': len(self.cache.memory),
+                    'cache_dir': self.cache.cache_dir, **self.stats}
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True)
+
+
+def _resolved(value):
+    future = Future()
+    future.set_result(value)
+    return future
+
+
+# =============================================================================
+# HTTP front end
+# =============================================================================
+def _flatten_query(query):
+    return {k: v[-1] for k, v in parse_qs(query).items()}
+
+
+def make_handler(service, timeout=300.0):
+    """BaseHTTPRequestHandler subclass bound to ``service``."""
+
+    class ScenarioHandler(BaseHTTPRequestHandler):
+        server_version = 'IDRScenarioService/1'
+
+        def _send(self, status, body, content_type='application/json'):
+            if content_type == 'application/json':
+                body = json.dumps(body, indent=1).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            if status == 503:
+                self.send_header('Retry-After', '5')
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _dispatch(self, path, payload):
+            try:
+                if path == '/health':
+                    return self._send(200, service.health())
+                if path == '/scenarios':
+                    return self._send(200, service.describe())
+                if path == '/evaluate':
+                    if isinstance(payload, dict) and 'scenarios' in payload:
+                        return self._send(200, service.evaluate_many(payload['scenarios'], timeout))
+                    return self._send(200, service.evaluate(payload, timeout))
+                if path == '/evaluate.png':
+                    return self._send(200, service.png(payload, timeout), 'image/png')
+                return self._send(404, {'error': f'unknown path {path}'})
+            except ValueError as exc:
+                return self._send(400, {'error': str(exc)})
+            except ServiceBusy as exc:
+                return self._send(503, {'error': str(exc)})
+            except FutureTimeout:
+                return self._send(504, {'error': f'evaluation still running after {timeout:g}s; '
+                                                 'retry to pick up the cached result'})
+            except Exception as exc:
+                traceback.print_exc()
+                return self._send(500, {'error': f'internal error: {type(exc).__name__}: {exc}'})
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            self._dispatch(url.path, _flatten_query(url.query))
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            try:
+                length = int(self.headers.get('Content-Length') or 0)
+                payload = json.loads(self.rfile.read(length) or b'{}')
+            except ValueError as exc:   # bad Content-Length, JSON or UTF-8
+                return self._send(400, {'error': f'invalid JSON body: {exc}'})
+            self._dispatch(url.path, payload)
+
+        def log_message(self, fmt, *args):
+            print(f"[service] {self.address_string()} {fmt % args}", flush=True)
+
+    return ScenarioHandler
+
+
+def serve(baseline, host='127.0.0.1', port=8765, workers=2, max_pending=32, cache_dir=None,
+          max_n=1_000_000, timeout=300.0):
+    """Run the service until interrupted (Ctrl-C)."""
+    service = ScenarioService(baseline, workers=workers, max_pending=max_pending,
+                              cache_dir=cache_dir, max_n=max_n)
+    httpd = ThreadingHTTPServer((host, port), make_handler(service, timeout))
+    httpd.daemon_threads = True
+    print(f"Scenario service on http://{host}:{httpd.server_address[1]}/ "
+          f"({workers} workers, cache: {cache_dir or 'memory only'})", flush=True)
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+        service.shutdown()
+    return service
@@ -0,0 +1,278 @@
+"""The PA economic impact engines against config.py's point estimates and the
+original phase loops, plus the config, scenario-key and build-cache plumbing
+run_all.py and scenarios.py rely on."""
+
+import os
+import pickle
+import sys
+import types
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                'simulation', 'pa_economic_impact'))
+from build_cache import BuildCache
+from model_config import FrozenDict, default_config
+from montecarlo import joint_monte_carlo, propagate_impacts
+from projection import free_college_results
+from scenarios import scenario_key
+
+POINT_ESTIMATES = {
+    'payroll_impact': lambda cfg: cfg.economic_impact_components['payroll_impact'],
+    'student_spending_impact': lambda cfg: cfg.economic_impact_components['student_spending_impact'],
+    'research_impact': lambda cfg: cfg.economic_impact_components['research_impact'],
+    'construction_impact': lambda cfg: cfg.economic_impact_components['construction_impact'],
+    'total_economic_impact': lambda cfg: cfg.total_economic_impact,
+    'jobs_supported': lambda cfg: cfg.total_jobs_supported,
+    'tax_revenue': lambda cfg: cfg.tax_revenue_generated,
+    'roi_ratio': lambda cfg: cfg.roi_ratio,
+    'direct_impact': lambda cfg: cfg.base_direct_spending * cfg.rims_ii_multipliers['output_multiplier'],
+    'enrollment': lambda cfg: cfg.total_enrollment_all,
+}
+
+
+def test_propagate_impacts_at_the_means_reproduces_point_estimates():
+    # With no baseline tuition change the elasticity has nothing to act on
+    cfg = default_config().replace(**{'policy_scenarios.Baseline.tuition_change': 0.0})
+    at_means = {param: (mean, 0.0) for param, (mean, _) in cfg.param_distributions.items()}
+    draws, outputs = joint_monte_carlo(5, seed=0, batch_size=2, distributions=at_means, cfg=cfg)
+    for param, (mean, _) in at_means.items():
+        np.testing.assert_array_equal(draws[param], mean)
+    for name, expected in POINT_ESTIMATES.items():
+        np.testing.assert_allclose(outputs[name], expected(cfg), rtol=1e-12, err_msg=name)
+
+
+def test_propagate_impacts_elasticity_moves_only_enrollment_terms():
+    cfg = default_config()
+    draws = {param: np.array([mean]) for param, (mean, _) in cfg.param_distributions.items()}
+    outputs = propagate_impacts(draws, cfg)
+    factor = 1 + draws['enrollment_elasticity'][0] * cfg.policy_scenarios['Baseline']['tuition_change']
+    assert outputs['enrollment'][0] == pytest.approx(cfg.total_enrollment_all * factor, rel=1e-12)
+    assert outputs['student_spending_impact'][0] == pytest.approx(
+        cfg.economic_impact_components['student_spending_impact'] * factor, rel=1e-12)
+    assert outputs['payroll_impact'][0] == pytest.approx(
+        cfg.economic_impact_components['payroll_impact'], rel=1e-12)
+
+
+def original_free_college_results(cfg):
+    """The Phase 6 horizon loop as it was before projection.py, reading ``cfg``."""
+    enrollment = cfg.pa_resident_enrollment
+    total_pa_residents = sum(int(d['total'] * d['in_state_pct']) for d in enrollment.values())
+    results = {}
+    for horizon in cfg.simulation_horizons:
+        years = list(range(cfg.start_year, cfg.start_year + horizon))
+        cumulative_state_cost = cumulative_new_graduates = cumulative_earnings_gain = 0
+        cumulative_tax_revenue_gain = cumulative_gdp_impact = cumulative_brain_drain_savings = 0
+        cumulative_state_tax_only = 0
+        annual_data = []
+        for i, year in enumerate(years):
+            cpi_factor = (1 + cfg.inflation_rate) ** (year - cfg.INFLATION_BASE_YEAR)
+            tuition_factor = (1 + cfg.tuition_growth_rate) ** (year - cfg.start_year)
+            wage_factor = (1 + cfg.wage_growth_real) ** (year - cfg.start_year)
+
+            annual_state_cost_nominal = 0
+            annual_new_enrollment = 0
+            for inst, data in enrollment.items():
+                pa_students = int(data['total'] * data['in_state_pct'])
+                ramp = min(1.0, 0.5 + 0.25 * i) if i < 2 else 1.0
+                new_students = int(pa_students * cfg.enrollment_boost.get(inst, 0.10) * ramp)
+                annual_state_cost_nominal += (pa_students + new_students) * data['tuition'] * tuition_factor
+                annual_new_enrollment += new_students
+            annual_state_cost_real = annual_state_cost_nominal / cpi_factor
+            cumulative_state_cost += annual_state_cost_real
+
+            new_cc_grads = new_4yr_grads = 0
+            if i >= 2:
+                cc = enrollment['Community Colleges']
+                cc_boost_students = int(cc['total'] * cc['in_state_pct'] * cfg.enrollment_boost['Community Colleges'])
+                new_cc_grads = int(cc_boost_students * cfg.completion_rates['community_college_free'])
+            if i >= 4:
+                four_yr_boost = sum(
+                    int(enrollment[inst]['total'] * enrollment[inst]['in_state_pct']
+                        * cfg.enrollment_boost.get(inst, 0.10))
+                    for inst in ['PASSHE', 'Penn State', 'Pitt', 'Temple', 'Lincoln'])
+                new_4yr_grads = int(four_yr_boost * cfg.completion_rates['four_year_free'])
+            cumulative_new_graduates += new_cc_grads + new_4yr_grads
+
+            annual_earnings_gain = (new_cc_grads * (cfg.lifetime_earnings_premium['associate'] / 40) * wage_factor
+                                    + new_4yr_grads * (cfg.lifetime_earnings_premium['bachelor'] / 40) * wage_factor)
+            cumulative_earnings_gain += annual_earnings_gain
+            state_tax_gain = annual_earnings_gain * cfg.pa_state_income_tax
+            annual_tax_gain = (state_tax_gain + annual_earnings_gain * cfg.pa_local_tax_avg
+                               + annual_earnings_gain * 0.70 * cfg.sales_tax_rate)
+            cumulative_tax_revenue_gain += annual_tax_gain
+            cumulative_state_tax_only += state_tax_gain / cpi_factor
+
+            grads_retained = int(int(total_pa_residents * 0.25)
+                                 * (cfg.brain_drain_baseline - cfg.brain_drain_free_college))
+            retained_tax = grads_retained * cfg.grad_earnings_premium * wage_factor * cfg.pa_state_income_tax
+            cumulative_brain_drain_savings += retained_tax
+
+            gdp_contribution = (annual_new_enrollment * cfg.avg_student_spending * 0.65 * cfg.spending_multipliers['student']
+                                + annual_state_cost_nominal * 0.60 * cfg.spending_multipliers['institutional']
+                                + annual_earnings_gain * cfg.spending_multipliers['payroll'])
+            cumulative_gdp_impact += gdp_contribution / cpi_factor
+            annual_data.append({
+                'year': year, 'state_cost_real': annual_state_cost_real,
+                'new_enrollment': annual_new_enrollment, 'new_graduates': new_cc_grads + new_4yr_grads,
+                'earnings_gain': annual_earnings_gain, 'tax_gain': annual_tax_gain,
+                'brain_drain_savings': retained_tax, 'gdp_impact': gdp_contribution / cpi_factor,
+            })
+
+        avg_tuition_saved_4yr = sum(d['tuition'] for inst, d in enrollment.items()
+                                    if inst != 'Community Colleges') * 4 / 5
+        avg_tuition_saved_cc = enrollment['Community Colleges']['tuition'] * 2
+        total_benefits = cumulative_tax_revenue_gain + cumulative_brain_drain_savings + cumulative_gdp_impact * 0.04
+        results[horizon] = {
+            'cumulative_state_cost': cumulative_state_cost,
+            'cumulative_new_graduates': cumulative_new_graduates,
+            'cumulative_earnings_gain': cumulative_earnings_gain,
+            'cumulative_tax_revenue': cumulative_tax_revenue_gain,
+            'cumulative_brain_drain_savings': cumulative_brain_drain_savings,
+            'cumulative_gdp_impact': cumulative_gdp_impact,
+            'state_roi': total_benefits / cumulative_state_cost if cumulative_state_cost > 0 else 0,
+            'individual_roi_bachelor': cfg.lifetime_earnings_premium['bachelor'] / avg_tuition_saved_4yr,
+            'individual_roi_associate': cfg.lifetime_earnings_premium['associate'] / avg_tuition_saved_cc,
+            'annual_data': annual_data,
+            'cumulative_state_tax_only': cumulative_state_tax_only,
+        }
+    return results
+
+
+@pytest.mark.parametrize('overrides', [
+    {},
+    {'inflation_rate': 0.03, 'enrollment_boost.PASSHE': 0.20, 'wage_growth_real': 0.0},
+])
+def test_free_college_results_match_the_original_phase6_loop(overrides):
+    cfg = default_config().replace(**overrides)
+    expected = original_free_college_results(cfg)
+    results = free_college_results(cfg=cfg)
+    assert list(results) == list(expected)
+    for horizon, row in expected.items():
+        got = results[horizon]
+        assert set(got) == set(row)
+        assert got['cumulative_new_graduates'] == row['cumulative_new_graduates']
+        for key, value in row.items():
+            if key == 'annual_data':
+                assert len(got[key]) == horizon
+                for got_year, year in zip(got[key], value):
+                    assert got_year == pytest.approx(year, rel=1e-12)
+            else:
+                assert got[key] == pytest.approx(value, rel=1e-12), (horizon, key)
+
+
+def test_replace_returns_a_new_config_and_leaves_the_original_alone():
+    cfg = default_config()
+    high = cfg.replace(inflation_rate=0.03, **{'enrollment_boost.PASSHE': 0.20})
+    assert (cfg.inflation_rate, cfg.enrollment_boost['PASSHE']) != (0.03, 0.20)
+    assert (high.inflation_rate, high.enrollment_boost['PASSHE']) == (0.03, 0.20)
+    assert high.enrollment_boost['Pitt'] == cfg.enrollment_boost['Pitt']
+    assert high.overrides == {'enrollment_boost.PASSHE': 0.20, 'inflation_rate': 0.03}
+    # Derived totals follow the config's own data
+    research = cfg.replace(**{'spending_multipliers.research': cfg.spending_multipliers['research'] + 1})
+    assert research.total_economic_impact == pytest.approx(cfg.total_economic_impact + cfg.total_research)
+
+
+def test_digest_depends_only_on_effective_values():
+    cfg = default_config()
+    assert cfg.replace(inflation_rate=cfg.inflation_rate).digest == cfg.digest
+    high = cfg.replace(inflation_rate=0.03)
+    assert high.digest != cfg.digest
+    assert high.replace(inflation_rate=cfg.inflation_rate) == cfg
+    # Override order does not matter, and the digest survives pickling
+    a = cfg.replace(inflation_rate=0.03).replace(**{'enrollment_boost.PASSHE': 0.20})
+    b = cfg.replace(**{'enrollment_boost.PASSHE': 0.20}).replace(inflation_rate=0.03)
+    assert a.digest == b.digest
+    assert pickle.loads(pickle.dumps(a)).digest == a.digest
+
+
+def test_config_is_immutable():
+    cfg = default_config()
+    with pytest.raises(AttributeError):
+        cfg.inflation_rate = 0.05
+    with pytest.raises(AttributeError):
+        del cfg.inflation_rate
+    assert isinstance(cfg.enrollment_boost, FrozenDict)
+    with pytest.raises(TypeError):
+        cfg.enrollment_boost['PASSHE'] = 0.5
+    with pytest.raises(TypeError):
+        cfg.pa_resident_enrollment['PASSHE']['tuition'] = 0
+    assert isinstance(cfg.simulation_horizons, tuple)
+    with pytest.raises(ValueError):
+        cfg.replace(total_economic_impact=1.0)     # derived
+    with pytest.raises(ValueError):
+        cfg.replace(no_such_value=1.0)
+    with pytest.raises(ValueError):
+        cfg.replace(**{'enrollment_boost.Nowhere': 0.1})
+
+
+def test_scenario_key_follows_the_config_digest():
+    sources = {'projection': 'abc'}
+    horizons = [5, 10]
+    base = scenario_key({}, horizons, sources)
+    assert scenario_key({'inflation_rate': default_config().inflation_rate}, horizons, sources) == base
+    assert scenario_key({'inflation_rate': 0.03}, horizons, sources) != base
+    assert scenario_key({}, [5, 20], sources) != base
+    assert scenario_key({}, horizons, {'projection': 'abd'}) != base
+
+
+PHASE_SOURCE = """from config import *
+import os
+legacy = os.environ.get('PA_ECON_LEGACY_LOOP')
+with open(os.path.join(OUTPUT_DIR, 'out.csv'), 'w') as f:
+    f.write(str(alpha))
+"""
+
+
+@pytest.fixture
+def phase_dirs(tmp_path, monkeypatch):
+    monkeypatch.delenv('PA_ECON_LEGACY_LOOP', raising=False)
+    script_dir, output_dir = tmp_path / 'src', tmp_path / 'out'
+    script_dir.mkdir()
+    output_dir.mkdir()
+    (script_dir / 'phase_x.py').write_text(PHASE_SOURCE)
+    (output_dir / 'in.csv').write_text('input')
+    return script_dir, output_dir
+
+
+def build(script_dir, output_dir, **config):
+    """Check phase_x.py against the manifest, "run" it if needed, record it; return the reasons."""
+    namespace = types.SimpleNamespace(**{'alpha': 1, 'beta': 2, **config})
+    cache = BuildCache(output_dir, str(script_dir), namespace)
+    fingerprint = cache.fingerprint('phase_x.py', ['in.csv', 'shared_intermediate'])
+    reasons = cache.explain(1, fingerprint, ['out.csv'])
+    if reasons:
+        (output_dir / 'out.csv').write_text(str(namespace.alpha))
+        cache.record(1, fingerprint, ['out.csv'])
+        cache.save()
+    return reasons
+
+
+def test_build_cache_skips_an_unchanged_phase(phase_dirs):
+    assert build(*phase_dirs) == ['never built (no record in the build manifest)']
+    assert build(*phase_dirs) == []
+    assert build(*phase_dirs, beta=3) == []           # a value the phase does not mention
+
+
+def test_build_cache_reruns_on_source_config_input_output_and_env_changes(phase_dirs, monkeypatch):
+    script_dir, output_dir = phase_dirs
+    build(*phase_dirs)
+
+    (script_dir / 'phase_x.py').write_text(PHASE_SOURCE + "print('more')\n")
+    assert build(*phase_dirs) == ['source changed: phase_x.py']
+
+    assert build(*phase_dirs, alpha=5) == ['config changed: alpha']
+    assert build(*phase_dirs, alpha=5) == []
+
+    (output_dir / 'in.csv').write_text('new input')
+    assert build(*phase_dirs, alpha=5) == ['input changed: in.csv']
+
+    (output_dir / 'out.csv').write_text('edited by hand')
+    assert build(*phase_dirs, alpha=5) == ['output modified since last build: out.csv']
+    (output_dir / 'out.csv').unlink()
+    assert build(*phase_dirs, alpha=5) == ['output missing: out.csv']
+
+    monkeypatch.setenv('PA_ECON_LEGACY_LOOP', '1')
+    assert build(*phase_dirs, alpha=5) == ['environment changed: PA_ECON_LEGACY_LOOP']
+    assert build(*phase_dirs, alpha=5) == []
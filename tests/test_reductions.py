@@ -0,0 +1,76 @@
+"""Monte Carlo summaries must not depend on how the sample was chunked or
+how many workers reduced it (wealth_model.reductions, BatchAccumulator)."""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'simulation'))
+from wealth_model import reductions
+from wealth_model.confidence import BatchAccumulator
+from wealth_model.reductions import BLOCK_SIZE, BlockReducer
+
+N = 5 * BLOCK_SIZE + 1234
+
+
+@pytest.fixture(scope='module')
+def sample():
+    # Wide dynamic range, so a different summation order would show in the last bits
+    rng = np.random.default_rng(7)
+    return rng.lognormal(11, 2, N) * rng.choice([-1, 1], N)
+
+
+def split(n, chunk_size):
+    return [(start, min(start + chunk_size, n)) for start in range(0, n, chunk_size)]
+
+
+@pytest.mark.parametrize('chunk_size', [97, 977, BLOCK_SIZE, BLOCK_SIZE + 1, 3 * BLOCK_SIZE - 5, N])
+def test_block_reducer_matches_whole_array_for_any_chunk_size(sample, chunk_size):
+    reducer = BlockReducer()
+    for start, stop in split(N, chunk_size):
+        reducer.add(sample[start:stop])
+    assert reducer.n == N
+    assert reducer.mean() == reductions.mean(sample)
+    assert reducer.var(ddof=1) == reductions.var(sample, ddof=1)
+    assert reducer.std() == reductions.std(sample)
+
+
+@pytest.mark.parametrize('workers', [1, 2, 3, 8])
+def test_block_reducer_merge_is_independent_of_worker_count_and_order(sample, workers):
+    rng = np.random.default_rng(workers)
+    chunks = split(N, 1500)
+    rng.shuffle(chunks)
+    reducers = [BlockReducer() for _ in range(workers)]
+    for i, (start, stop) in enumerate(chunks):
+        reducers[i % workers].add(sample[start:stop], start)
+    order = rng.permutation(workers)
+    total = reducers[order[0]]
+    for i in order[1:]:
+        total.merge(reducers[i])
+    assert total.mean() == reductions.mean(sample)
+    assert total.var() == reductions.var(sample)
+
+
+def test_reductions_are_independent_of_array_layout(sample):
+    assert reductions.mean(sample.reshape(-1, 1)) == reductions.mean(sample)
+    assert reductions.mean_std(sample) == (reductions.mean(sample), reductions.std(sample))
+    np.testing.assert_array_equal(reductions.row_means(sample[:4 * 1000].reshape(4, 1000)),
+                                  [reductions.mean(sample[i * 1000:(i + 1) * 1000]) for i in range(4)])
+
+
+def test_batch_accumulator_is_independent_of_chunking_and_workers(sample):
+    whole = BatchAccumulator(N)
+    whole.add(sample)
+    expected = whole.mean_ci()
+    assert expected[0] == reductions.mean(sample)
+
+    for chunk_size, workers in [(1000, 1), (BLOCK_SIZE, 3), (2345, 4)]:
+        parts = [BatchAccumulator(N) for _ in range(workers)]
+        for i, (start, stop) in enumerate(split(N, chunk_size)[::-1]):
+            parts[i % workers].add(sample[start:stop], start)
+        total = parts[-1]
+        for part in parts[:-1]:
+            total.merge(part)
+        assert total.mean_ci() == expected
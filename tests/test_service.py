@@ -0,0 +1,92 @@
+"""Scenario resolution in wealth_model.service: canonical inputs for good
+requests, ValueError (HTTP 400) for bad ones before anything is simulated."""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'simulation'))
+from wealth_model.service import PARAMETER_BOUNDS, resolve_scenario, scenario_key
+
+MODEL = {
+    'inflation_rate': 0.02,
+    'stage_durations': [8, 10, 10, 12],
+    'salary_growth_factors': [1.00, 1.19, 1.18, 1.10],
+    'employment_rates_se': 0.015,
+    'student_loan_interest_rate': 0.0639,
+    'average_home_price_multiplier': 3.5,
+    'mortgage_down_payment': 0.10,
+    'mortgage_term_years': 30,
+    'mortgage_interest_rate': 0.065,
+    'home_appreciation_rate_real': 0.02,
+    'retirement_investment_rate': 0.08,
+    'retirement_real_return': 0.05,
+    'personal_asset_growth_rate_real': 0.01,
+}
+GROUP = {
+    'kind': 'individual', 'avg_income': 60000.0, 'income_se': 1500.0, 'home_rate': 0.5,
+    'home_rate_moe': 0.003, 'emp_rates': [0.78, 0.82, 0.77, 0.62], 'fpl_base': 15060,
+    'debt_mean': 38000.0, 'debt_se': 6000.0, 'tiers': {'Median': 1.0, 'High': 1.5},
+    'income_model': 'normal', 'joint_model': 'independent',
+}
+BASELINE = {
+    'groups': {'Women': GROUP},
+    'income_dists': {},
+    'joint_samplers': {},
+    'plans': {'PAYE': {'repayment_rate': 0.10, 'years': 20, 'fpl_multiplier': 1.5}},
+    'model': MODEL,
+    'n_individuals': 1000,
+    'discount_rate': 0.02,
+}
+REQUEST = {'group': 'Women', 'plan': 'PAYE'}
+
+
+def test_equal_requests_resolve_to_the_same_key():
+    query = resolve_scenario(BASELINE, dict(REQUEST, tier='Median', mortgage_term_years='15', years='25'))
+    body = resolve_scenario(BASELINE, dict(REQUEST, factor=1.0, mortgage_term_years=15, years=25))
+    assert query['model']['mortgage_term_years'] == 15
+    assert query['plan_settings']['years'] == 25
+    assert scenario_key(query) == scenario_key(body)
+    assert scenario_key(body) != scenario_key(resolve_scenario(BASELINE, REQUEST))
+
+
+@pytest.mark.parametrize('request_', [
+    ['not', 'an', 'object'],
+    {'plan': 'PAYE'},
+    dict(REQUEST, group='Nobody'),
+    dict(REQUEST, plan='IBR'),
+    dict(REQUEST, group=['Women']),
+    dict(REQUEST, tier='Top'),
+    dict(REQUEST, factor=0),
+    dict(REQUEST, factor='nan'),
+    dict(REQUEST, factor=True),
+    dict(REQUEST, repayment_rate=-0.1),
+    dict(REQUEST, repayment_rate=1.5),
+    dict(REQUEST, years=1e30),
+    dict(REQUEST, years=2.5),
+    dict(REQUEST, debt_mean=-5),
+    dict(REQUEST, mortgage_term_years=0),
+    dict(REQUEST, mortgage_interest_rate=0),
+    dict(REQUEST, stage_durations=3),
+    dict(REQUEST, no_such_key=1),
+    dict(REQUEST, n=150.5),
+    dict(REQUEST, n=10),
+    dict(REQUEST, n=2_000_000),
+    dict(REQUEST, seed=-1),
+])
+def test_bad_requests_are_rejected(request_):
+    with pytest.raises(ValueError):
+        resolve_scenario(BASELINE, request_, max_n=1_000_000)
+
+
+def test_every_bound_is_enforced_at_its_edges():
+    for key, (low, high, low_excluded) in PARAMETER_BOUNDS.items():
+        resolve_scenario(BASELINE, dict(REQUEST, **{key: high}))
+        with pytest.raises(ValueError):
+            resolve_scenario(BASELINE, dict(REQUEST, **{key: high + 1}))
+        if low_excluded:
+            with pytest.raises(ValueError):
+                resolve_scenario(BASELINE, dict(REQUEST, **{key: low}))
+        else:
+            resolve_scenario(BASELINE, dict(REQUEST, **{key: low}))